@@ -0,0 +1,105 @@
+"""
+asv benchmarks of the Excel export path. Run with
+
+    asv run                      # every commit on main
+    asv continuous main HEAD     # compare the working branch against main
+    asv publish && asv preview   # browse the tracked numbers
+
+time_* report seconds, track_* report Excel traffic measured with the fake backend (fewer is better).
+"""
+import pandas as pd
+
+from pandaspro.io.cellpro.cellpro import cell_combine_by_column
+from pandaspro.io.excel.fake_backend import use_fake_excel
+from pandaspro.io.excel.putexcel import PutxlSet
+from pandaspro.io.excel.range_operator import parse_format_rule
+from pandaspro.io.excel.writer import FramexlWriter
+from pandaspro.user_config.cd_sheets import cd_sheets
+
+from .common import LAYOUTS, ROWS, make_frame
+
+
+class FramexlWriterSuite:
+    params = [ROWS, LAYOUTS]
+    param_names = ['rows', 'layout']
+    timeout = 1800
+
+    def setup(self, rows, layout):
+        self.frame = make_frame(rows, layout)
+        self.index = layout == 'multiindex'
+        self.writer = FramexlWriter(self.frame, 'B2', index=self.index, header=True)
+
+    def time_construct(self, rows, layout):
+        FramexlWriter(self.frame, 'B2', index=self.index, header=True)
+
+    def peakmem_construct(self, rows, layout):
+        FramexlWriter(self.frame, 'B2', index=self.index, header=True)
+
+    def time_range_cdformat(self, rows, layout):
+        self.writer.range_cdformat(**cd_sheets['grade'][0])
+
+    def time_range_index_merge_inputs(self, rows, layout):
+        if not self.index:
+            raise NotImplementedError  # asv: skipped, a flat frame has no index levels to merge
+        self.writer.range_index_merge_inputs(level='region', columns=['Total'])
+
+
+class CellCombineSuite:
+    params = [ROWS]
+    param_names = ['cells']
+
+    def setup(self, cells):
+        # every other row of two columns, like a cd_format mask over alternating rows
+        self.cells = [f'{column}{row}' for column in ['C', 'F'] for row in range(2, 2 + cells, 2)]
+
+    def time_cell_combine_by_column(self, cells):
+        cell_combine_by_column(self.cells)
+
+
+class ParseFormatRuleSuite:
+    rules = [
+        'border=inner_thin; align=center',
+        'fill=#8ABDFF; font_color=black; wrap; bold',
+        'blue80; font_color=white; wrap',
+        'border=outer_thick; fill=#EDEDED',
+        'font_size=14; bold; font_color=#0070C0',
+    ]
+
+    def time_parse_format_rule(self):
+        for rule in self.rules:
+            parse_format_rule(rule)
+
+
+class PutxlSuite:
+    """
+    Full putxl against the in-memory fake Excel: the Python side of an export plus the recorded Excel traffic.
+    """
+    params = [ROWS, LAYOUTS, ['auto_format', 'blue', 'grade']]
+    param_names = ['rows', 'layout', 'export']
+    timeout = 3600
+
+    exports = {
+        'auto_format': {},
+        'blue': {'style': 'blue', 'auto_format': False},
+        'grade': {'cd_style': 'grade', 'auto_format': False},
+    }
+
+    def setup(self, rows, layout, export):
+        self.frame = make_frame(rows, layout)
+        self.kwargs = dict(self.exports[export], index=layout == 'multiindex')
+
+    def _export(self):
+        with use_fake_excel() as fake:
+            ps = PutxlSet('benchmark.xlsx')
+            fake.log.reset()
+            ps.putxl(self.frame, sheet_name='Data', **self.kwargs)
+        return fake.log
+
+    def time_putxl(self, rows, layout, export):
+        self._export()
+
+    def track_excel_calls(self, rows, layout, export):
+        log = self._export()
+        return log.total_sets + log.total_calls + log.total_gets
+
+    track_excel_calls.unit = 'calls'
@@ -0,0 +1,40 @@
+"""
+asv benchmarks of pwread on Excel files, one run per reader engine (see pandaspro/io/excel/engines.py).
+The numbers behind the 'auto' choice in engines.py come from here; engines that are not installed are skipped.
+"""
+import os
+
+from pandaspro.io.excel.base import pwread
+from pandaspro.io.excel.engines import EXCEL_ENGINES, available_excel_engines
+
+from .common import make_frame
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cells_to_list.xlsx')
+FILES = ['cells_to_list', 'rows_1000', 'rows_20000', 'rows_100000']
+
+
+class ReadExcelSuite:
+    params = [FILES, list(EXCEL_ENGINES)]
+    param_names = ['file', 'engine']
+    timeout = 1800
+
+    def setup_cache(self):
+        # the synthetic workbooks are written once per benchmark run, in asv's cache directory
+        files = {'cells_to_list': SAMPLE}
+        for name in FILES[1:]:
+            files[name] = os.path.abspath(f'{name}.xlsx')
+            make_frame(int(name.split('_')[1])).to_excel(files[name], index=False)
+        return files
+
+    def setup(self, files, file, engine):
+        if engine not in available_excel_engines():
+            raise NotImplementedError  # asv: skipped, e.g. python-calamine not installed
+
+    def time_pwread(self, files, file, engine):
+        pwread(files[file], engine=engine)
+
+    def peakmem_pwread(self, files, file, engine):
+        pwread(files[file], engine=engine)
+
+    def track_bytes(self, files, file, engine):
+        return os.path.getsize(files[file])
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+ROWS = [1_000, 100_000, 1_000_000]
+LAYOUTS = ['flat', 'multiindex']
+
+GRADES = ['GA', 'GB', 'GC', 'GD', 'GE', 'GF', 'GG', 'GH', 'GI', 'UC']
+REGIONS = ['AFR', 'EAP', 'ECA', 'LCR', 'MNA', 'SAR']
+
+
+def make_frame(rows: int, layout: str = 'flat') -> pd.DataFrame:
+    """
+    Synthetic staff-like frame: sorted region/unit keys (so index merges have real runs), a Grade column
+    for the 'grade' cd style, numbers with some zeros (auto_format blanks them) and a Total column.
+    """
+    rng = np.random.default_rng(0)
+    region = np.sort(rng.choice(REGIONS, rows))
+    frame = pd.DataFrame({
+        'region': region,
+        'unit': [f'{r}-{i % 7}' for i, r in enumerate(region)],
+        'Grade': rng.choice(GRADES, rows),
+        'count': rng.integers(0, 20, rows),
+        'salary': rng.normal(100_000, 25_000, rows).round(2),
+    })
+    frame['Total'] = frame['count'] * 2
+    frame = frame.sort_values(['region', 'unit'], kind='stable').reset_index(drop=True)
+    if layout == 'multiindex':
+        return frame.set_index(['region', 'unit'])
+    return frame
@@ -26,13 +26,16 @@ from pandaspro.core.api import (
     replace_left_with_right,
     replace_left_with_target,
     compare,
+    version_diff,
     align_and_sort_by_order,
     ensure_columns
 )
 
 from pandaspro.cpdbase.api import (
     cpdBaseFrame,
-    FilesVersionParser
+    FilesVersionParser,
+    TableCache,
+    TableSchema
 )
 
 from pandaspro.date.api import (
@@ -47,9 +50,11 @@ from pandaspro.io.api import (
     offset,
     getrange,
     PutxlSet,
+    AsyncPutxlSet,
     pwread,
     WorkbookExportSimplifier,
-    fw
+    fw,
+    fanout
 )
 
 from pandaspro.sampledf.api import (
@@ -12,6 +12,7 @@ from pandaspro.core.tools.utils import (
 )
 from pandaspro.core.tools.replace_left_with_right import replace_left_with_right, replace_left_with_target
 from pandaspro.core.tools.compare import compare
+from pandaspro.core.tools.version_diff import version_diff
 from pandaspro.core.tools.align_sort import align_and_sort_by_order
 from pandaspro.core.tools.ensure_cols import ensure_columns
 
@@ -49,6 +50,7 @@ __all__ = [
     "replace_left_with_right",
     "replace_left_with_target",
     "compare",
+    "version_diff",
     "align_and_sort_by_order",
     "ensure_columns"
 ]
\ No newline at end of file
@@ -12,11 +12,14 @@ from pandaspro.core.tools.inrange import inrange
 from pandaspro.core.tools.lowervarlist import lowervarlist
 from pandaspro.core.tools.search2df import search2df
 from pandaspro.core.tools.strpos import strpos
+from pandaspro.core.tools.subtotals import mark_subtotals
 from pandaspro.core.tools.tab import tab
 from pandaspro.core.tools.varnames import varnames
+from pandaspro.core.tools.version_diff import version_diff
 from pandaspro.core.tools.inlist import inlist
 from pandaspro.core.tools.indate import indate
 from pandaspro.io.excel.wbexportsimple import WorkbookExportSimplifier
+from pandaspro.io.excel.fanout import fanout
 
 
 class cpdBaseFrameMapper:
@@ -183,6 +186,7 @@ class FramePro(pd.DataFrame):
             - Total 行始终在最下面，Total 列始终在最右边
             """
             result = pivot_df.copy()
+            subtotal_row_labels, subtotal_col_labels = [], []
             
             # 保存 Total 行（如果存在）
             total_row = None
@@ -224,6 +228,7 @@ class FramePro(pd.DataFrame):
                     
                     subtotal.name = subtotal_index
                     subtotal_rows.append(subtotal)
+                    subtotal_row_labels.append(subtotal_index)
                 
                 # 将 subtotal 行添加到 DataFrame
                 if subtotal_rows:
@@ -276,6 +281,7 @@ class FramePro(pd.DataFrame):
                         subtotal_col_name = tuple([value] + [f'{value} Subtotal'] + [''] * (len(result.columns.levels) - 2))
                     
                     result[subtotal_col_name] = subtotal_col
+                    subtotal_col_labels.append(subtotal_col_name)
                 
                 # 重新排序列，让 subtotal 列在每组的最后
                 if isinstance(result.columns, pd.MultiIndex):
@@ -290,7 +296,17 @@ class FramePro(pd.DataFrame):
             if total_row is not None:
                 result = pd.concat([result, total_row])
             
-            return result
+            # 记录生成的 subtotal / total 行列，导出时 FramexlWriter 直接读取，不再按字符串搜索
+            def _is_total(label):
+                return (label[0] if isinstance(label, tuple) else label) in ['Total', 'All']
+
+            return mark_subtotals(
+                FramePro(result),
+                subtotal_rows=subtotal_row_labels,
+                grand_total_rows=[idx for idx in result.index if _is_total(idx)],
+                subtotal_columns=subtotal_col_labels,
+                grand_total_columns=[col for col in result.columns if _is_total(col)],
+            )
 
         if item in self.columns:
             return super().__getattr__(item)
@@ -401,7 +417,7 @@ class FramePro(pd.DataFrame):
                 margins_name='Total'
             )
             
-            return FramePro(_add_subtotals(pivot_result))
+            return _add_subtotals(pivot_result)
 
         elif item.startswith('cpdtab2_'):
             # 检查是否包含 ___
@@ -538,7 +554,7 @@ class FramePro(pd.DataFrame):
                 margins_name='Total'
             )
             
-            return FramePro(_add_subtotals(pivot_result))
+            return _add_subtotals(pivot_result)
 
         elif item.startswith('cpdtab2'):
             aggfunc = _get_aggfunc(item)
@@ -643,6 +659,16 @@ class FramePro(pd.DataFrame):
     def dfilter(self, inputdict: dict = None, debug: bool = False):
         return self._constructor(dfilter(self, inputdict, debug))
 
+    def version_diff(self, other, uid: str | list = None, columns: list = None, chunksize: int = 100_000):
+        # self is the old version, other the new one; uid defaults to the frame's uid
+        uid = self.uid if uid is None else uid
+        if uid is None:
+            raise ValueError('version_diff needs a uid: pass uid= or set it with set_uid')
+        log = version_diff(self, other, uid, columns=columns, chunksize=chunksize)
+        result = FramePro(log)
+        result.attrs.update(log.attrs)
+        return result
+
     def csort(
             self,
             column,
@@ -857,6 +883,17 @@ class FramePro(pd.DataFrame):
         if override:
             return declaredwb
 
+    def fanout(
+            self,
+            by: str | list,
+            file,
+            render=None,
+            workers: int = None,
+            noisily: bool = True,
+            **render_kwargs
+    ):
+        return fanout(self, by, file, render=render, workers=workers, noisily=noisily, **render_kwargs)
+
     def expand_column(self, column_list):
         data = self.copy()
         data['expand_key'] = column_list[0]
@@ -1,5 +1,6 @@
 import pandas as pd
 from pandaspro.core.tools.corder import corder
+from pandaspro.core.tools.subtotals import mark_subtotals
 from pandaspro.sample_df import df
 
 
@@ -93,7 +94,13 @@ def gen_pivot_pro(
     multi_level_pivot = gen_multi_level_pivot(df, index, columns, values, aggfunc, subtotal)
     pivot_pro = all_level_index.merge(multi_level_pivot, on='id', how='left')
     pivot_pro = pivot_pro.dropna(subset=pivot_pro.columns.difference(['id']), how='all')
-    return pivot_pro
+    is_grand_total = pivot_pro['id'].str.startswith('Grand Total_')
+    is_level_total = pivot_pro['id'].str.endswith(('_top', '_bottom')) & ~is_grand_total
+    return mark_subtotals(
+        pivot_pro,
+        subtotal_rows=pivot_pro.index[is_level_total],
+        grand_total_rows=pivot_pro.index[is_grand_total],
+    )
 
 
 if __name__ == '__main__':
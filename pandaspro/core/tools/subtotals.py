@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+# Key in DataFrame.attrs, pandas carries attrs through copy / loc / rename ... via __finalize__
+SUBTOTAL_MARKS_ATTR = 'subtotal_marks'
+
+
+class SubtotalMarks:
+    """
+    Structural annotation of a frame with subtotal lines: which rows and columns are aggregates.
+
+    Generators that create the subtotals (FramePro cpdtabt_ / cpdtab2, gen_pivot_pro) know the positions already,
+    so they record them here instead of letting the writer search the labels for 'Subtotal' afterwards.
+
+    rows / columns hold boolean numpy masks aligned to index / columns:
+    - 'subtotal': the per-group subtotal lines
+    - 'grand_total': the margins line (Total / All)
+    - 'total': either of the two
+    """
+
+    def __init__(self, index: pd.Index, columns: pd.Index, rows: dict, columns_masks: dict):
+        self.index = index
+        self.columns = columns
+        self.rows = rows
+        self.columns_masks = columns_masks
+
+    def matches(self, frame: pd.DataFrame) -> bool:
+        """
+        True if the masks still describe frame, i.e. no row or column was added, dropped, reordered or renamed since.
+        """
+        return self.index.equals(frame.index) and self.columns.equals(frame.columns)
+
+    def row_positions(self, kind: str = 'subtotal') -> np.ndarray:
+        return np.flatnonzero(self.rows[kind])
+
+    def column_positions(self, kind: str = 'subtotal') -> np.ndarray:
+        return np.flatnonzero(self.columns_masks[kind])
+
+
+def _masks(labels: pd.Index, subtotal, grand_total) -> dict:
+    subtotal_mask = labels.isin(list(subtotal)) if len(subtotal) else np.zeros(len(labels), dtype=bool)
+    grand_total_mask = labels.isin(list(grand_total)) if len(grand_total) else np.zeros(len(labels), dtype=bool)
+    return {
+        'subtotal': np.asarray(subtotal_mask, dtype=bool),
+        'grand_total': np.asarray(grand_total_mask, dtype=bool),
+        'total': np.asarray(subtotal_mask | grand_total_mask, dtype=bool),
+    }
+
+
+def mark_subtotals(
+        frame: pd.DataFrame,
+        subtotal_rows=(),
+        grand_total_rows=(),
+        subtotal_columns=(),
+        grand_total_columns=(),
+) -> pd.DataFrame:
+    """
+    Attaches a SubtotalMarks to frame.attrs (in place) and returns frame.
+    The arguments are the index / column labels of the generated lines, not positions.
+    """
+    frame.attrs[SUBTOTAL_MARKS_ATTR] = SubtotalMarks(
+        index=frame.index.copy(),
+        columns=frame.columns.copy(),
+        rows=_masks(frame.index, subtotal_rows, grand_total_rows),
+        columns_masks=_masks(frame.columns, subtotal_columns, grand_total_columns),
+    )
+    return frame
+
+
+def get_subtotal_marks(frame: pd.DataFrame) -> SubtotalMarks | None:
+    """
+    Returns the SubtotalMarks of frame, or None if it has none or they went stale after reshaping the frame.
+    """
+    marks = getattr(frame, 'attrs', {}).get(SUBTOTAL_MARKS_ATTR)
+    if isinstance(marks, SubtotalMarks) and marks.matches(frame):
+        return marks
+    return None
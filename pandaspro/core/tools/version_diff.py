@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+
+def _row_hashes(frame: pd.DataFrame) -> np.ndarray:
+    # one uint64 per row over the compared columns, the key itself is left out
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def _key_frame(keys: pd.Index, uid: list) -> pd.DataFrame:
+    if isinstance(keys, pd.MultiIndex):
+        return pd.DataFrame({name: keys.get_level_values(name) for name in uid})
+    return pd.DataFrame({uid[0]: keys})
+
+
+def version_diff(
+        old: pd.DataFrame,
+        new: pd.DataFrame,
+        uid: str | list,
+        columns: list = None,
+        chunksize: int = 100_000
+) -> pd.DataFrame:
+    """
+    Change log between two versions of a dataset keyed by uid, built for large snapshots.
+
+    Every row is hashed over the compared columns (pd.util.hash_pandas_object), so added, removed and unchanged
+    keys are told apart without comparing a single cell; field values are compared only for the keys whose hash
+    changed, chunksize keys at a time.
+
+    Parameters
+    ----------
+    old, new : DataFrame
+        The two versions, uid must be unique in each.
+    uid : str or list
+        The key column(s).
+    columns : list, optional
+        Columns to compare, default the non-key columns both versions have (in the order of old).
+        With none, only added and removed keys are logged.
+    chunksize : int
+        Changed keys compared per step, bounds the memory of the field comparison.
+
+    Returns
+    -------
+    DataFrame
+        One line per added / removed key (field, old and new empty) and one line per changed field:
+        uid column(s), change ('added' / 'removed' / 'changed'), field, old, new.
+        attrs['diff_summary'] counts the keys per change and the unchanged ones.
+
+    Examples
+    --------
+    >>> log = version_diff(sob_jan, sob_feb, uid='upi', columns=['grade', 'unit', 'duty_station'])
+    >>> log[log['field'] == 'grade']
+    """
+    uid = [uid] if isinstance(uid, str) else list(uid)
+    for name, frame in (('old', old), ('new', new)):
+        missing = [key for key in uid if key not in frame.columns]
+        if missing:
+            raise ValueError(f'uid column(s) {missing} not found in the {name} version')
+        if frame.duplicated(subset=uid).any():
+            raise ValueError(f'uid {uid} is not unique in the {name} version')
+    if columns is None:
+        columns = [c for c in old.columns if c in new.columns and c not in uid]
+    else:
+        missing = [c for c in columns if c not in old.columns or c not in new.columns]
+        if missing:
+            raise ValueError(f'Columns {missing} are not in both versions')
+
+    old_rows = old.set_index(uid)[columns]
+    new_rows = new.set_index(uid)[columns]
+
+    removed = old_rows.index.difference(new_rows.index, sort=False)
+    added = new_rows.index.difference(old_rows.index, sort=False)
+    common = old_rows.index.intersection(new_rows.index, sort=False)
+
+    if columns:
+        old_hash = pd.Series(_row_hashes(old_rows), index=old_rows.index)
+        new_hash = pd.Series(_row_hashes(new_rows), index=new_rows.index)
+        changed = common[old_hash.reindex(common).to_numpy() != new_hash.reindex(common).to_numpy()]
+    else:
+        changed = common[:0]  # nothing to compare (only the key is shared): added / removed keys only
+
+    # Field level comparison of the changed keys only. A hash can also differ for equal values stored with other
+    # dtypes (1 vs 1.0), such keys find no differing field and drop out here
+    fields = np.asarray(columns, dtype=object)
+    parts, changed_keys = [], 0
+    for start in range(0, len(changed), chunksize):
+        keys = changed[start:start + chunksize]
+        old_values = old_rows.loc[keys].to_numpy(dtype=object)
+        new_values = new_rows.loc[keys].to_numpy(dtype=object)
+        old_na, new_na = pd.isna(old_values), pd.isna(new_values)
+        # missing values (NaN / None / NA / NaT) are equal to each other whatever their kind
+        differs = (np.where(old_na, None, old_values) != np.where(new_na, None, new_values)) & ~(old_na & new_na)
+        rows, cols = np.nonzero(differs)
+        changed_keys += len(np.unique(rows))
+        part = _key_frame(keys[rows], uid)
+        part['change'] = 'changed'
+        part['field'] = fields[cols]
+        part['old'] = old_values[rows, cols]
+        part['new'] = new_values[rows, cols]
+        parts.append(part)
+
+    for kind, keys in (('added', added), ('removed', removed)):
+        part = _key_frame(keys, uid)
+        part['change'] = kind
+        part[['field', 'old', 'new']] = None
+        parts.insert(0 if kind == 'added' else 1, part)
+
+    log = pd.concat(parts, ignore_index=True)
+    log[['field', 'old', 'new']] = log[['field', 'old', 'new']].astype(object)
+    log.attrs['diff_summary'] = {
+        'added': len(added),
+        'removed': len(removed),
+        'changed': changed_keys,
+        'unchanged': len(common) - changed_keys,
+    }
+    return log
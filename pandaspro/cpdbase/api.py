@@ -1,8 +1,12 @@
 from pandaspro.cpdbase.cpd_base_frame import cpdBaseFrame
 from pandaspro import cpdBaseFrameMapper, cpdBaseFrameList
 from pandaspro.cpdbase.files_version_parser import FilesVersionParser
+from pandaspro.cpdbase.table_cache import TableCache
+from pandaspro.cpdbase.table_schema import TableSchema
 
 __all__ = [
     'cpdBaseFrame',
-    'FilesVersionParser'
+    'FilesVersionParser',
+    'TableCache',
+    'TableSchema'
 ]
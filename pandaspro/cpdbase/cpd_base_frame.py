@@ -9,7 +9,15 @@ from pandaspro import FramePro, cpdBaseFrameMapper
 from pandaspro.io.excel.putexcel import PutxlSet
 from pandaspro.cpdbase.design import cpdBaseFrameDesign
 from pandaspro.cpdbase.files_version_parser import FilesVersionParser
+from pandaspro.cpdbase.dataset_meta import cpdBaseFrameMeta
+from pandaspro.cpdbase.table_cache import TableCache, default_table_cache, table_cache_key
+from pandaspro.cpdbase.table_schema import TableSchema
+from pandaspro.cpdbase.multi_version import VersionFrames, harmonize_frames, read_version_files
+from pandaspro.cpdbase.projection import ColumnProjection, required_columns
+import os
+import re
 import textwrap
+import time
 
 
 # from pandaspro.utils.cpd_logger import cpdLogger
@@ -28,6 +36,11 @@ def extract_params(func):
     return pos_params, kw_params_with_defaults
 
 
+class _PushdownRefused(Exception):
+    # load failed on the usecols read: the table has to be loaded in full (and cached under the full key)
+    pass
+
+
 def cpdBaseFrame(
         path: str = None,
         file_type: str = 'csv',
@@ -46,6 +59,11 @@ def cpdBaseFrame(
         export_file: str = None,
         export_status: bool = False,
         ps: pandaspro.io.excel.putexcel.PutxlSet = None,
+        cache: bool | TableCache = None,
+        usecols: list | str = None,
+        schema: bool | str = None,
+        string_storage: str = None,
+        engine: str = 'auto',
         **custom_attrs
 ):
     def decorator(myclass):
@@ -82,31 +100,102 @@ def cpdBaseFrame(
                             "Can't instantiate abstract class MyConcreteClass with abstract method get_path.")
 
             @classmethod
-            def read_table(cls, version):
-                this_fvp = cls.get_file_versions_parser()
-                filename = this_fvp.get_file(version)
+            def get_schema_path(cls):
+                # schema: None / False = let pandas infer, True = <prefix>.schema.json next to the data,
+                # a .json path, or a directory holding the schema files
+                if not schema:
+                    return None
+                this_prefix = myclass.__name__ if prefix is None else prefix
+                if isinstance(schema, str):
+                    return schema if schema.endswith('.json') else os.path.join(schema, f'{this_prefix}.schema.json')
+                return os.path.join(cls.get_path(), f'{this_prefix}.schema.json')
+
+            @classmethod
+            def get_schema(cls):
+                schema_path = cls.get_schema_path()
+                if schema_path is None or not os.path.exists(schema_path):
+                    return None
+                return TableSchema.load(schema_path)
+
+            @classmethod
+            def _read_with_schema(cls, read, columns: list = None):
+                # read(**kwargs) -> (frame, name_map); the pinned dtypes go to the csv parser up front,
+                # the first load (or a version the schema no longer fits) infers and saves them again.
+                # columns: the raw headers of a projected read, a schema is never inferred from a part of the table
+                table_schema = cls.get_schema()
+                if table_schema is not None and file_type == 'csv':
+                    try:
+                        return read(**table_schema.read_kwargs(columns))
+                    except (ValueError, TypeError, KeyError):
+                        table_schema = None
+                frame, name_map = read(low_memory=False) if file_type == 'csv' else read()
+                if table_schema is None:
+                    if columns is not None:
+                        return frame, name_map
+                    table_schema = TableSchema.infer(frame, name_map, string_storage=string_storage)
+                    table_schema.save(cls.get_schema_path())
+                return table_schema.apply(frame, name_map), name_map
+
+            @classmethod
+            def read_table(cls, version, filename: str = None, usecols: list = None):
+                # filename: the already resolved file of the version, skips the lookup
+                # usecols: raw headers to read (column pushdown), None for all
+                if filename is None:
+                    filename = cls.get_file_versions_parser().get_file(version)
                 file_fullpath = cls.get_path() + f'/{filename}'
+                column_kwarg = {} if usecols is None else {'usecols': list(usecols)}
 
                 if file_type == 'csv':
-                    return cpd.pwread(file_fullpath, cellrange=cellrange, low_memory=False)
+                    if schema:
+                        return cls._read_with_schema(
+                            lambda **kwargs: cpd.pwread(file_fullpath, cellrange=cellrange, **column_kwarg, **kwargs),
+                            columns=usecols
+                        )
+                    return cpd.pwread(file_fullpath, cellrange=cellrange, low_memory=False, **column_kwarg)
                 elif file_type == 'xlsx':
                     try:
-                        input_data = cpd.pwread(file_fullpath, sheet_name=sheet_name, cellrange=cellrange)
+                        input_data = cpd.pwread(file_fullpath, sheet_name=sheet_name, cellrange=cellrange, engine=engine, **column_kwarg)
                     except Exception as e:
                         ps = PutxlSet(file_fullpath)
                         ps.close()
-                        input_data = cpd.pwread(file_fullpath, sheet_name=sheet_name, cellrange=cellrange)
+                        input_data = cpd.pwread(file_fullpath, sheet_name=sheet_name, cellrange=cellrange, engine=engine, **column_kwarg)
                         PutxlSet(file_fullpath)
+                    if schema:
+                        return cls._read_with_schema(lambda: input_data, columns=usecols)
                     return input_data
                 elif file_type == 'parquet':
-                    return pd.read_parquet(file_fullpath), {}
+                    return pd.read_parquet(file_fullpath, columns=usecols), {}
                 else:
                     raise ValueError('Invalid file type, can only read .csv/.xlsx/.parquet format.')
 
+            @classmethod
+            def read_header(cls, filename: str, import_rename: dict = None) -> dict:
+                # {final column name (lowered, then imr): raw header} of a file, in file order, without reading rows
+                file_fullpath = cls.get_path() + f'/{filename}'
+                if file_type == 'parquet':
+                    import pyarrow.parquet as pq
+                    name_map = {name: name for name in pq.read_schema(file_fullpath).names}
+                else:
+                    _, name_map = cpd.pwread(file_fullpath, sheet_name=sheet_name, cellrange=cellrange, nrows=0)
+                import_rename = imr if import_rename is None else import_rename
+                return {(import_rename or {}).get(name, name): raw for name, raw in name_map.items()}
+
+            @classmethod
+            def supports_pushdown(cls):
+                # usecols by header name is only safe when the table starts in column A
+                return file_type == 'parquet' or cellrange is None or re.fullmatch(r'A\d+', cellrange) is not None
+
             @staticmethod
             def load(data, **kwargs):
                 return data
 
+            @classmethod
+            def get_table_cache(cls):
+                # cache: None / False = read every time, True = the shared default cache, or a TableCache
+                if cache is True:
+                    return default_table_cache
+                return cache or None
+
             @classmethod
             def get_process_method(cls):
                 if load and hasattr(myclass, 'load'):
@@ -119,10 +208,82 @@ def cpdBaseFrame(
                 else:
                     return CombinedClass.load
 
+            @classmethod
+            def load_versions(
+                    cls,
+                    versions: list = None,
+                    start: str = None,
+                    end: str = None,
+                    freq: str = None,
+                    processes: int = None,
+                    lazy: bool = False,
+                    version_column: str = 'version',
+                    **kwargs
+            ):
+                """
+                Loads many versions of the dataset for trend analysis, selected by a list of versions or by
+                start / end / freq (see FilesVersionParser.select_files), listing the folder once.
+
+                The files are parsed in a process pool (processes, default one per CPU), then renamed (imr) and
+                passed to load here with kwargs. Dtypes are harmonized and the versions stacked into one frame with
+                a version_column; attrs['load_seconds'] holds {version: {'read': s, 'process': s}}.
+                lazy=True returns a VersionFrames mapping instead, loading each version on first access.
+                """
+                load_params = extract_params(CombinedClass.get_process_method())[1]
+                unknown = [key for key in kwargs if key not in load_params]
+                if unknown:
+                    raise ValueError(f'{unknown} are not arguments of the load method, expecting {list(load_params)}')
+
+                fvp = cls.get_file_versions_parser()
+                files = [fvp.get_file(v) for v in versions] if versions else fvp.select_files(start, end, freq)
+                if not files:
+                    raise ValueError('No version matches the selection.')
+                version_strs = [f.split('.')[0].split('_')[1] for f in files]
+
+                if lazy:
+                    return VersionFrames(version_strs, lambda v: CombinedClass(version=v, fvp=fvp, **kwargs))
+
+                table_schema = cls.get_schema() if schema else None
+                results = read_version_files(
+                    [cls.get_path() + f'/{f}' for f in files],
+                    processes=processes,
+                    file_type=file_type,
+                    sheet_name=sheet_name,
+                    cellrange=cellrange,
+                    engine=engine,
+                    read_kwargs=table_schema.read_kwargs() if table_schema is not None and file_type == 'csv' else None
+                )
+
+                frames, seconds, export_map = [], {}, {}
+                process_method = CombinedClass.get_process_method()
+                for version_str, (raw_frame, raw_name_map, read_seconds) in zip(version_strs, results):
+                    start_process = time.perf_counter()
+                    if table_schema is not None:
+                        raw_frame = table_schema.apply(raw_frame, raw_name_map)
+                    if imr is not None:
+                        raw_frame = raw_frame.rename(columns=imr)
+                    frame = pd.DataFrame(process_method(raw_frame, **kwargs))
+                    if version_column in frame.columns:
+                        raise ValueError(f'Column {version_column} already exists, pass another version_column')
+                    frame.insert(0, version_column, version_str)
+                    frames.append(frame)
+                    export_map.update({(imr or {}).get(k, k): v for k, v in raw_name_map.items()})
+                    seconds[version_str] = {'read': read_seconds, 'process': time.perf_counter() - start_process}
+
+                combined = pd.concat(harmonize_frames(frames), ignore_index=True)
+                result = CombinedClass(combined, version=version_strs[-1], fvp=fvp, export_rename={**export_map, **(exr or {})})
+                result.attrs['load_seconds'] = seconds
+                return result
+
             def __init__(self, *args, **kwargs):
                 cpd_kwargs = extract_params(CombinedClass.get_process_method())[1]
                 uid_kwarg = {'uid': kwargs.pop('uid', uid)}
-                fvp_kwarg = {'fvp': kwargs.pop('fvp', CombinedClass.get_file_versions_parser())}
+                # Both are resolved lazily (or at load time), derived frames receive them by reference
+                fvp_kwarg = {'fvp': kwargs.pop('fvp', None)}
+                meta_kwarg = {'meta': kwargs.pop('meta', None)}
+                # Column pushdown: read only these columns (list, cvar pattern or 'dvl'), fetch the others on access
+                usecols_kwarg = {'usecols': kwargs.pop('usecols', usecols)}
+                projection_kwarg = {'projection': kwargs.pop('projection', None)}
                 version_kwarg = {'version': kwargs.pop('version', default_version)}
                 rename_status_kwarg = {'rename_status': kwargs.pop('rename_status', rename_status)}
                 import_rename_kwarg = {'import_rename': kwargs.pop('import_rename', imr)}
@@ -168,15 +329,91 @@ def cpdBaseFrame(
                         '''))
                 else:
                     # self.logger.info('Entered Below Part of init: no args or kwargs detected')
-                    raw_frame, name_map = CombinedClass.read_table(**version_kwarg)
-                    # 先应用 import_rename，再传给 load 方法处理
-                    if import_rename_kwarg['import_rename'] is not None:
-                        raw_frame = raw_frame.rename(columns=import_rename_kwarg['import_rename'])
-                    processed_frame = CombinedClass.get_process_method()(raw_frame, **other_kwargs)
+                    if fvp_kwarg['fvp'] is None:
+                        fvp_kwarg['fvp'] = CombinedClass.get_file_versions_parser()
+                    meta_kwarg['meta'] = cpdBaseFrameMeta.resolve(
+                        fvp_kwarg['fvp'],
+                        version_kwarg['version'],
+                        import_rename=import_rename_kwarg['import_rename'],
+                        export_rename=export_rename_kwarg['export_rename'],
+                        custom_attrs=custom_attrs_saver
+                    )
+                    def _read(columns=None):
+                        raw_frame, raw_name_map = CombinedClass.read_table(
+                            version_kwarg['version'], filename=meta_kwarg['meta'].filename, usecols=columns)
+                        # 先应用 import_rename，再传给 load 方法处理
+                        if import_rename_kwarg['import_rename'] is not None:
+                            raw_frame = raw_frame.rename(columns=import_rename_kwarg['import_rename'])
+                        return raw_frame, raw_name_map
+
+                    def _process(raw_frame):
+                        return CombinedClass.get_process_method()(raw_frame, **other_kwargs)
+
+                    def _fetch(raw):
+                        # deferred columns go through load like on a full load, all columns if load needs others
+                        try:
+                            return _process(_read(raw)[0])
+                        except KeyError:
+                            return _process(_read()[0])
+
+                    read_columns = None
+                    if usecols_kwarg['usecols'] is not None and CombinedClass.supports_pushdown():
+                        header_map = CombinedClass.read_header(meta_kwarg['meta'].filename, import_rename_kwarg['import_rename'])
+                        # values fetched later are matched back on uid: without one in the file, read everything
+                        if uid_kwarg['uid'] in header_map:
+                            wanted = required_columns(usecols_kwarg['usecols'], list(header_map), dvl=dvl)
+                            if uid_kwarg['uid'] not in wanted:
+                                wanted.append(uid_kwarg['uid'])
+                            if len(wanted) < len(header_map):
+                                read_columns = [header_map[name] for name in header_map if name in wanted]
+                                projection_kwarg['projection'] = ColumnProjection(
+                                    header_map, wanted, _fetch, uid=uid_kwarg['uid'])
+
+                    def _read_and_process(columns=None):
+                        raw_frame, raw_name_map = _read(columns)
+                        try:
+                            return _process(raw_frame), raw_name_map
+                        except KeyError:
+                            if columns is None:
+                                raise
+                            raise _PushdownRefused  # load needs a column that was not read
+
+                    table_cache = CombinedClass.get_table_cache()
+
+                    def _load(columns=None):
+                        if table_cache is None:
+                            return _read_and_process(columns)
+                        key_kwargs = dict(other_kwargs)
+                        if columns is not None:
+                            key_kwargs['usecols'] = columns
+                        # an edited schema file casts differently, it must not hit frames cast with the old one
+                        table_schema = CombinedClass.get_schema()
+                        if table_schema is not None:
+                            key_kwargs['schema'] = table_schema.to_dict()
+                        cache_key = table_cache_key(
+                            meta_kwarg['meta'].filename_full,
+                            cellrange=cellrange,
+                            sheet_name=sheet_name,
+                            imr=import_rename_kwarg['import_rename'],
+                            load=CombinedClass.get_process_method(),
+                            load_kwargs=key_kwargs
+                        )
+                        return table_cache.get_or_load(
+                            cache_key, lambda: _read_and_process(columns), source=meta_kwarg['meta'].filename_full)
+
+                    try:
+                        processed_frame, name_map = _load(read_columns)
+                    except _PushdownRefused:
+                        # nothing was cached under the usecols key, the full table is (cached and) loaded instead
+                        projection_kwarg['projection'] = None
+                        processed_frame, name_map = _load()
                     super(CombinedClass, self).__init__(processed_frame, uid=uid, rename_status=rename_status)  # Ensure DataFrame initialization
 
-                self.fvp = fvp_kwarg['fvp']
-                self.version = version_kwarg['version']
+                self.__dict__['_fvp'] = fvp_kwarg['fvp']
+                self.__dict__['_meta'] = meta_kwarg['meta']
+                self.__dict__['_projection'] = projection_kwarg['projection']
+                # set on the instance directly: a plain assignment would overwrite a 'version' column (load_versions)
+                self.__dict__['version'] = version_kwarg['version']
                 self.uid = uid_kwarg['uid']
                 self.rename_status = rename_status_kwarg['rename_status']
                 self.import_mapper = cpdBaseFrameMapper(import_rename_kwarg['import_rename'])
@@ -207,12 +444,6 @@ def cpdBaseFrame(
                 
                 self.export_mapper = cpdBaseFrameMapper(final_export_map)
 
-                self.get_filename = self.fvp.get_file(self.version)
-                self.get_filename_full = self.get_path() + '/' + self.get_filename
-                self.get_version = self.fvp.get_file_version_str(self.version)
-                self.get_vo = self.fvp.get_file_version_dt(self.version)
-                self.vo = self.get_vo
-                self.get_more_info = self.fvp.get_suffix(self.version)
 
                 # Report Exporting
                 self.export_file = export_path_kwarg['export_file']
@@ -240,6 +471,9 @@ def cpdBaseFrame(
                     kwargs.update(custom_kwargs)
                     return CombinedClass(
                         *args,
+                        fvp=d.get('_fvp'),
+                        meta=d.get('_meta'),
+                        projection=d.get('_projection'),
                         version=d.get('version', default_version),
                         uid=d.get('uid', uid),
                         rename_status=d.get('rename_status', rename_status),
@@ -252,12 +486,62 @@ def cpdBaseFrame(
                     )
                 return _c
 
+            @property
+            def fvp(self):
+                if self.__dict__.get('_fvp') is None:
+                    self.__dict__['_fvp'] = CombinedClass.get_file_versions_parser()
+                return self.__dict__['_fvp']
+
+            @property
+            def meta(self):
+                # Frames built from data (not loaded) resolve their version only when the metadata is first asked for
+                if self.__dict__.get('_meta') is None:
+                    self.__dict__['_meta'] = cpdBaseFrameMeta.resolve(
+                        self.fvp,
+                        self.__dict__.get('version', default_version),
+                        import_rename=getattr(self.__dict__.get('import_mapper'), 'dict', imr),
+                        export_rename=exr,
+                        custom_attrs=getattr(self.__dict__.get('custom_attrs_saver'), 'dict', None)
+                    )
+                return self.__dict__['_meta']
+
+            @property
+            def get_filename(self):
+                return self.meta.filename
+
+            @property
+            def get_filename_full(self):
+                return self.meta.filename_full
+
+            @property
+            def get_version(self):
+                return self.meta.version_str
+
+            @property
+            def get_vo(self):
+                return self.meta.vo
+
+            @property
+            def vo(self):
+                return self.meta.vo
+
+            @property
+            def get_more_info(self):
+                return self.meta.suffix
+
             def __getattr__(self, item):
                 override_list = []
 
                 if hasattr(super(self.__class__, self), item) and not item.startswith(tuple(override_list)):
                     return getattr(super(self.__class__, self), item)
 
+                # a column left out by the column pushdown: fetched (with the other deferred ones) on first access
+                projection = self.__dict__.get('_projection')
+                if (projection is not None and item in projection.deferred and item not in self.columns
+                        and projection.uid in self.columns):
+                    self.load_columns()
+                    return self[item]
+
                 # elif item.startswith('cpdpvt_'):
                 #     pivot_info = item[4:]
                 #     variables = pivot_info.split('__')
@@ -292,6 +576,16 @@ def cpdBaseFrame(
                 else:
                     return super().__getattr__(item)
 
+            def load_columns(self, columns: list = None):
+                # reads the deferred columns of a usecols load (all by default) through load into this frame, aligned on uid
+                projection = self.__dict__.get('_projection')
+                if projection is None:
+                    return self
+                for name, values in projection.fetch(self, columns).items():
+                    self[name] = values
+                    self.export_mapper.dict.setdefault(name, projection.header_map[name])
+                return self
+
             @property
             def er(self):
                 self.rename_status = 'Export'
@@ -0,0 +1,73 @@
+from types import MappingProxyType
+
+from pandaspro.date.datepro import DatePro
+
+
+class cpdBaseFrameMeta:
+    """
+    Read-only description of the dataset a cpdBaseFrame was loaded from.
+
+    Resolved once when the table is read (one version lookup) and handed by reference to every frame derived from
+    it through _constructor, so slicing, inlist, rename, merge ... do no filesystem work at all.
+
+    - path / filename / filename_full: where the data came from
+    - version: the requested version ('latest', 'latest_month', '20240131' ...)
+    - version_str / vo / suffix: the resolved version string, as DatePro, and the file name suffix
+    - import_rename / export_rename / custom_attrs: the declared mappers and custom attributes (read-only views)
+    """
+
+    __slots__ = ('path', 'version', 'filename', 'filename_full', 'version_str', 'vo', 'suffix',
+                 'import_rename', 'export_rename', 'custom_attrs')
+
+    def __init__(
+            self,
+            path: str,
+            version: str,
+            filename: str,
+            version_str: str,
+            vo,
+            suffix: str,
+            import_rename: dict = None,
+            export_rename: dict = None,
+            custom_attrs: dict = None
+    ):
+        values = {
+            'path': path,
+            'version': version,
+            'filename': filename,
+            'filename_full': path + '/' + filename,
+            'version_str': version_str,
+            'vo': vo,
+            'suffix': suffix,
+            'import_rename': MappingProxyType(dict(import_rename or {})),
+            'export_rename': MappingProxyType(dict(export_rename or {})),
+            'custom_attrs': MappingProxyType(dict(custom_attrs or {})),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def resolve(cls, fvp, version: str, **kwargs):
+        """
+        Looks the version up once through a FilesVersionParser and records the result.
+        """
+        filename = fvp.get_file(version)
+        version_str = filename.split('.')[0].split('_')[1]
+        return cls(
+            path=fvp.path,
+            version=version,
+            filename=filename,
+            version_str=version_str,
+            vo=DatePro(version_str, format=fvp.dateid_expression),
+            suffix=fvp.get_suffix(version),
+            **kwargs
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'cpdBaseFrameMeta is read-only, cannot set {name}')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'cpdBaseFrameMeta is read-only, cannot delete {name}')
+
+    def __repr__(self):
+        return f'<cpdBaseFrameMeta {self.filename_full} (version {self.version!r} -> {self.version_str})>'
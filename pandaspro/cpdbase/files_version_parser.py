@@ -1,11 +1,61 @@
+import bisect
 import os
 import re
+import threading
+import time
 from datetime import datetime
 
 from pandaspro.date.datepro import DatePro
 from pandaspro.utils.cpd_logger import cpdLogger
 
 
+class VersionIndex:
+    """
+    The parsed version files of one directory: entries sorted by date as (datetime, filename, suffix).
+
+    Built from one listdir, so the date of each file is parsed once; dates holds the datetimes alone for bisect.
+    """
+
+    def __init__(self, entries: list, mtime: int = None):
+        self.entries = sorted(entries)
+        self.dates = [entry[0] for entry in self.entries]
+        self.by_name = {entry[1]: entry for entry in self.entries}
+        self.mtime = mtime
+        self.built = time.time()
+        self._filtered = {}
+
+    def latest(self):
+        return self.entries[-1] if self.entries else None
+
+    def exact(self, date: datetime) -> list:
+        lo = bisect.bisect_left(self.dates, date)
+        hi = bisect.bisect_right(self.dates, date)
+        return self.entries[lo:hi]
+
+    def filtered(self, key, filter_func) -> list:
+        # frequency filters (latest_month ...) are applied once per index and kept sorted
+        if key not in self._filtered:
+            kept = {file for file, _ in filter_func([(entry[1], entry[0]) for entry in self.entries])}
+            self._filtered[key] = [entry for entry in self.entries if entry[1] in kept]
+        return self._filtered[key]
+
+
+# Process-wide cache: (path, prefix, dateid_expression, file_type) -> VersionIndex
+_version_indexes = {}
+_version_indexes_lock = threading.Lock()
+
+# Directory mtimes are coarse on some file systems (2s on SMB / FAT): an index built within this many seconds
+# of the last change is not trusted, a file added in the same tick would otherwise stay invisible
+_MTIME_RESOLUTION = 2
+
+
+def _directory_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
 @cpdLogger
 class FilesVersionParser:
     granularity_levels = ['second', 'minute', 'hour', 'day', 'month', 'year']
@@ -67,20 +117,61 @@ class FilesVersionParser:
         else:
             raise ValueError(f"Unknown frequency: <<{freq}>>.")
 
-    def list_all_files(self):
+    @property
+    def index_key(self):
+        return self.path, self.class_prefix, self.dateid_expression, self.file_type
+
+    def _build_index(self, mtime):
+        entries = []
         try:
             files = os.listdir(self.path)
-            # print(files, self.class_prefix, self.file_type)
-            matching_files = [
-                f for f in files if
-                f.startswith(self.class_prefix + '_') and
-                f.endswith(f'.{self.file_type}') and
-                self._can_parse_date(f.split('.')[0].split('_')[1])
-            ]
-            return matching_files
         except Exception as e:
             print(f"Error: {e}")
-            return []
+            return VersionIndex(entries, mtime)
+
+        for f in files:
+            if not (f.startswith(self.class_prefix + '_') and f.endswith(f'.{self.file_type}')):
+                continue
+            name_split = f.split('.')[0].split('_')
+            try:
+                date = datetime.strptime(name_split[1], self.dateid_expression)
+            except ValueError:
+                continue
+            # same rule as get_suffix, None marks a name with too many underscores
+            if len(name_split) == 2:
+                suffix = 'no suffix'
+            elif len(name_split) == 3:
+                suffix = name_split[2]
+            else:
+                suffix = None
+            entries.append((date, f, suffix))
+        return VersionIndex(entries, mtime)
+
+    def get_index(self) -> VersionIndex:
+        """
+        The version index of the directory, shared by every parser with the same path, prefix, dateid and file type.
+        It is rebuilt only when the directory's modification time changed (a version was added, removed or renamed).
+        """
+        mtime = _directory_mtime(self.path)
+        with _version_indexes_lock:
+            index = _version_indexes.get(self.index_key)
+        if (index is not None and mtime is not None and index.mtime == mtime
+                and index.built - mtime / 1e9 > _MTIME_RESOLUTION):
+            return index
+
+        index = self._build_index(mtime)
+        if mtime is not None:
+            with _version_indexes_lock:
+                _version_indexes[self.index_key] = index
+        return index
+
+    @staticmethod
+    def clear_index_cache():
+        with _version_indexes_lock:
+            _version_indexes.clear()
+
+    def list_all_files(self):
+        return [filename for _, filename, _ in self.get_index().entries]
 
     def get_latest_file(self, freq='none'):
         # Define granularity levels
@@ -95,17 +186,19 @@ class FilesVersionParser:
                 f"Invalid frequency: {freq}. The frequency must be higher than the current granularity: {self.granularity}")
 
         # Configure matching files
-        matching_files = self.list_all_files()
-        if len(matching_files) == 0:
+        index = self.get_index()
+        if not index.entries:
             raise ValueError('No matching files detected.')
 
-        # Configure dates list and apply use max method
-        dates = [(file, datetime.strptime(file.split('.')[0].split('_')[1], self.dateid_expression)) for file in matching_files]
+        # Entries are sorted by date, the latest one is the last
         if freq == 'none':
-            return max(dates, key=lambda x: x[1])[0] if dates else None
-        freq_filtered_dates = self._filter_by_frequency(dates, freq)
+            return index.latest()[1]
+        freq_filtered = index.filtered(
+            (freq, self.fiscal_year_end_month, self.fiscal_year_end_day),
+            lambda dates: self._filter_by_frequency(dates, freq)
+        )
 
-        return max(freq_filtered_dates, key=lambda x: x[1])[0] if freq_filtered_dates else None
+        return freq_filtered[-1][1] if freq_filtered else None
 
     @staticmethod
     def _find_duplicates(items):
@@ -120,9 +213,9 @@ class FilesVersionParser:
         return duplicates
 
     def check_for_duplicates(self):
-        files = self.list_all_files()
-        dates = [f.split('.')[0].split('_')[1] for f in files]
-        parsed_dates = [datetime.strptime(date, self.dateid_expression) for date in dates]
+        entries = self.get_index().entries
+        files = [filename for _, filename, _ in entries]
+        parsed_dates = [date for date, _, _ in entries]
         duplicates = FilesVersionParser._find_duplicates(parsed_dates)
 
         if duplicates:
@@ -134,8 +227,11 @@ class FilesVersionParser:
     def check_single_file_with_exact_version(self, version):
         filename_start = self.class_prefix + '_' + version
         self.filename_start = filename_start
-        files = os.listdir(self.path)
-        matching_files = [f for f in files if f.startswith(self.filename_start) and (f.endswith(f'.{self.file_type}'))]
+        # Files of the version share its date: bisect the index, then keep the exact name match
+        matching_files = [
+            f for _, f, _ in self.get_index().exact(datetime.strptime(version, self.dateid_expression))
+            if f.startswith(self.filename_start)
+        ]
         if len(matching_files) != 1:
             raise Exception(
                 f"Expected exactly one file starting with '{self.filename_start}' but found {len(matching_files)}.")
@@ -157,14 +253,30 @@ class FilesVersionParser:
         else:
             raise ValueError(f'Invalid version format passed as [{version}]')
 
-    def get_suffix(self, version):
-        name_split = self.get_file(version).split('.')[0].split('_')
-        if len(name_split) == 2:
-            return 'no suffix'
-        elif len(name_split) == 3:
-            return name_split[2]
+    def select_files(self, start: str = None, end: str = None, freq: str = None) -> list:
+        """
+        Files of the versions between start and end (inclusive, version strings in dateid format), oldest first.
+        freq keeps one file per period as in get_latest_file: 'month', 'quarter', 'year', 'fiscal_year' ...
+        """
+        index = self.get_index()
+        if freq is None:
+            entries = index.entries
         else:
+            if freq not in FilesVersionParser.granularity_levels + ['quarter', 'fiscal_year']:
+                raise ValueError(f"Unknown frequency: {freq}")
+            entries = index.filtered(
+                (freq, self.fiscal_year_end_month, self.fiscal_year_end_day),
+                lambda dates: self._filter_by_frequency(dates, freq)
+            )
+        lo = datetime.strptime(start, self.dateid_expression) if start is not None else None
+        hi = datetime.strptime(end, self.dateid_expression) if end is not None else None
+        return [f for date, f, _ in entries if (lo is None or date >= lo) and (hi is None or date <= hi)]
+
+    def get_suffix(self, version):
+        suffix = self.get_index().by_name[self.get_file(version)][2]
+        if suffix is None:
             raise ValueError('Invalid filename parsed from get_file, should be xxx_xxx_xxx.csv/xlsx (3 underlines at maximum)')
+        return suffix
 
     def get_file_version_str(self, version):
         return self.get_file(version).split('.')[0].split('_')[1]
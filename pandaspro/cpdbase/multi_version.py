@@ -0,0 +1,112 @@
+import os
+import time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from pandas.api.types import is_integer_dtype, union_categoricals
+
+
+def read_version_file(
+        file: str,
+        file_type: str = 'csv',
+        sheet_name=0,
+        cellrange: str = 'A1',
+        engine: str = 'auto',
+        read_kwargs: dict = None
+):
+    """
+    Reads one version file, in a worker process: returns (plain DataFrame, name_map, seconds).
+    Only the parsing runs here, load methods and renames (often defined inside a notebook or a class) stay in the parent.
+    """
+    from pandaspro.io.excel.base import pwread
+
+    start = time.perf_counter()
+    if file_type == 'parquet':
+        frame, name_map = pd.read_parquet(file), {}
+    elif file_type in ('csv', 'xlsx'):
+        kwargs = {'sheet_name': sheet_name, 'engine': engine} if file_type == 'xlsx' else {'low_memory': False}
+        try:
+            frame, name_map = pwread(file, cellrange=cellrange, **kwargs, **(read_kwargs or {}))
+        except (ValueError, TypeError, KeyError):
+            if not read_kwargs:
+                raise
+            # a pinned schema this version does not fit, read it unpinned
+            frame, name_map = pwread(file, cellrange=cellrange, **kwargs)
+    else:
+        raise ValueError('Invalid file type, can only read .csv/.xlsx/.parquet format.')
+    return pd.DataFrame(frame), name_map, time.perf_counter() - start
+
+
+def read_version_files(files: list, processes: int = None, **read_args) -> list:
+    """
+    Reads files with read_version_file, in a process pool when there is more than one file and processes != 1.
+    Results keep the order of files.
+    """
+    if processes is None:
+        processes = min(len(files), os.cpu_count() or 1)
+    if processes <= 1 or len(files) <= 1:
+        return [read_version_file(file, **read_args) for file in files]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(read_version_file, file, **read_args) for file in files]
+        return [future.result() for future in futures]
+
+
+def harmonize_frames(frames: list) -> list:
+    """
+    Aligns the dtypes of frames about to be stacked:
+    - categoricals get the union of all categories, so the concatenation stays categorical
+    - integer columns missing from some frames (or with gaps elsewhere) become nullable Int64 instead of float
+    Other mixes are left to pd.concat (int + float -> float, anything else -> object).
+    """
+    columns = {}
+    for frame in frames:
+        for column in frame.columns:
+            columns.setdefault(column, []).append(frame[column])
+
+    casts = {}
+    for column, series in columns.items():
+        dtypes = [s.dtype for s in series]
+        if all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes) and any(d != dtypes[0] for d in dtypes):
+            categories = union_categoricals([pd.Categorical(s.cat.categories) for s in series]).categories
+            casts[column] = pd.CategoricalDtype(categories)
+        elif all(is_integer_dtype(dtype) for dtype in dtypes) and (
+                len(series) < len(frames) or any(str(dtype) == 'Int64' for dtype in dtypes)):
+            casts[column] = 'Int64'
+
+    harmonized = []
+    for frame in frames:
+        frame_casts = {column: dtype for column, dtype in casts.items() if column in frame.columns}
+        harmonized.append(frame.astype(frame_casts) if frame_casts else frame)
+    return harmonized
+
+
+class VersionFrames(Mapping):
+    """
+    Lazy {version: frame} mapping over the selected versions of a dataset: a version is loaded on first access
+    (through the dataset class, so it uses its table cache) and kept. seconds records the load time per version.
+    """
+
+    def __init__(self, versions: list, loader):
+        self._versions = list(versions)
+        self._loader = loader
+        self._frames = {}
+        self.seconds = {}
+
+    def __getitem__(self, version):
+        if version not in self._versions:
+            raise KeyError(version)
+        if version not in self._frames:
+            start = time.perf_counter()
+            self._frames[version] = self._loader(version)
+            self.seconds[version] = time.perf_counter() - start
+        return self._frames[version]
+
+    def __iter__(self):
+        return iter(self._versions)
+
+    def __len__(self):
+        return len(self._versions)
+
+    def __repr__(self):
+        return f'<VersionFrames {len(self._frames)}/{len(self._versions)} loaded: {self._versions}>'
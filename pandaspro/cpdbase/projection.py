@@ -0,0 +1,52 @@
+import pandas as pd
+
+from pandaspro.core.stringfunc import parse_wild
+
+
+def required_columns(usecols, names: list, dvl=None) -> list:
+    """
+    Resolves what a caller asked for into column names: a list, a cvar-style pattern string ('grade unit*'),
+    or 'dvl' for the dataset's default view list. Names not in names (columns made by load) are dropped.
+    """
+    if isinstance(usecols, str) and usecols == 'dvl':
+        if dvl is None:
+            raise ValueError("usecols='dvl' needs the dataset to declare dvl")
+        usecols = dvl
+    if isinstance(usecols, str):
+        return parse_wild(usecols, names)
+    if isinstance(usecols, (list, tuple)):
+        return [name for name in usecols if name in names]
+    raise TypeError('usecols must be a list of columns, a pattern string or "dvl"')
+
+
+class ColumnProjection:
+    """
+    Columns a cpdBaseFrame was loaded without (column pushdown), and how to fetch them later.
+
+    - header_map: every column of the file, final name (lowered, import-renamed) -> raw header, in file order
+    - loaded: final names read at load time; deferred: the others (shared by derived frames, each fetches what it lacks)
+    - reader(raw_headers) -> frame with final names, those columns of the same file passed through the dataset's load
+    - uid: key the fetched values are matched on, pushdown is only used for datasets whose file has one
+    """
+
+    def __init__(self, header_map: dict, loaded: list, reader, uid: str):
+        self.header_map = dict(header_map)
+        self.loaded = [name for name in header_map if name in loaded]
+        self.deferred = [name for name in header_map if name not in loaded]
+        self.reader = reader
+        self.uid = uid
+
+    def fetch(self, frame: pd.DataFrame, names: list = None) -> dict:
+        """
+        Reads the deferred columns (all of them by default, one read) and returns {name: values aligned to frame}.
+        The loaded columns are read again with them, so load sees the same input as on a full load.
+        """
+        names = [name for name in (names or self.deferred) if name in self.deferred and name not in frame.columns]
+        if not names:
+            return {}
+        if self.uid not in frame.columns:
+            raise ValueError(f'Deferred columns are matched on {self.uid!r}, which this frame no longer has')
+        raw = [self.header_map[name] for name in self.header_map if name in self.loaded or name in names]
+        extra = self.reader(raw).drop_duplicates(subset=self.uid).set_index(self.uid)
+        extra = extra[[name for name in names if name in extra.columns]].reindex(frame[self.uid].to_numpy())
+        return {name: extra[name].to_numpy() for name in extra.columns}
@@ -0,0 +1,262 @@
+import hashlib
+import inspect
+import json
+import os
+import stat
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def _user_cache_dir() -> str:
+    # per user, never a shared temp directory: other local users must not be able to plant entries
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'pandaspro', 'table_cache')
+
+
+DEFAULT_CACHE_DIR = _user_cache_dir()
+
+
+def _is_private_dir(path: str) -> bool:
+    """
+    True when only the current user can write to path (POSIX owner / mode check; Windows profile folders are
+    per-user already). Pickled entries are only read back from such a directory, unpickling runs code.
+    """
+    if os.name == 'nt' or not hasattr(os, 'getuid'):
+        return True
+    info = os.stat(path)
+    return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def function_fingerprint(func) -> str:
+    """
+    A hash of the code of func: changing the body of a load method gives a new fingerprint (and new cache entries).
+    """
+    if func is None:
+        return 'none'
+    try:
+        raw = inspect.getsource(func)
+    except (OSError, TypeError):  # defined in a REPL / builtin: fall back to the compiled code
+        code = getattr(func, '__code__', None)
+        raw = repr((getattr(func, '__qualname__', repr(func)), code.co_code if code else None, code.co_consts if code else None))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def table_cache_key(file: str, cellrange=None, sheet_name=None, imr: dict = None, load=None, load_kwargs: dict = None) -> str:
+    """
+    Cache key of a loaded table: the source file (absolute path, size, modification time), how it is read
+    (cellrange, sheet_name), how it is renamed (imr) and processed (code of load and its kwargs).
+    A changed source file gets a new size / mtime and therefore a new key, stale entries are never reused.
+    """
+    file = os.path.abspath(file)
+    stat = os.stat(file)
+    parts = {
+        'file': file,
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'cellrange': cellrange,
+        'sheet_name': sheet_name,
+        'imr': sorted((str(k), str(v)) for k, v in (imr or {}).items()),
+        'load': function_fingerprint(load),
+        'load_kwargs': sorted((str(k), repr(v)) for k, v in (load_kwargs or {}).items()),
+    }
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class TableCache:
+    """
+    Two-level cache of loaded tables (frame + rename map), used by cpdBaseFrame(cache=...).
+
+    - memory: an LRU of the last max_items tables of this process, hits return a copy
+    - disk: one file per table in cache_dir, Arrow IPC (Feather, memory-mapped on read) when pyarrow is installed,
+      pickle otherwise; the least recently used files are removed once they exceed max_disk_bytes.
+      Pickles are only read from a directory no other user can write to, in a shared one they are misses
+
+    Entries are keyed by table_cache_key, so an edited source file or load method never hits an old entry.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        Where the disk level lives, None for the per-user cache directory (~/.cache/pandaspro/table_cache,
+        %LOCALAPPDATA%\\pandaspro\\table_cache on Windows), False to keep the memory level only.
+    max_items : int
+        Tables kept in memory.
+    max_disk_bytes : int
+        Size bound of the disk level.
+
+    Examples
+    --------
+    >>> cache = TableCache(r'D:/cache/sob', max_disk_bytes=5 * 2 ** 30)
+    >>> @cpdBaseFrame(path=..., cache=cache)
+    ... class SOB(pd.DataFrame): ...
+    >>> SOB()   # cold: read csv + load, then cached
+    >>> SOB()   # warm: from memory, or from disk in a new session
+    >>> cache.invalidate(SOB.get_path() + '/SOB_20240131.csv')
+    """
+
+    def __init__(self, cache_dir: str = None, max_items: int = 4, max_disk_bytes: int = 2 * 2 ** 30):
+        self.cache_dir = DEFAULT_CACHE_DIR if cache_dir is None else cache_dir
+        self.max_items = max_items
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = {'memory': 0, 'disk': 0, 'miss': 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Public
+    def get_or_load(self, key: str, loader, source: str = None):
+        """
+        Returns (frame, name_map) for key, calling loader() -> (frame, name_map) only on a miss.
+        source is the data file, recorded so invalidate(source) can find the entry.
+        """
+        entry = self._memory_get(key)
+        if entry is not None:
+            self.hits['memory'] += 1
+            return entry[0].copy(), dict(entry[1])
+
+        entry = self._disk_get(key)
+        if entry is not None:
+            self.hits['disk'] += 1
+        else:
+            self.hits['miss'] += 1
+            frame, name_map = loader()
+            # kept as a plain DataFrame: subclass attributes (uid, mappers ...) belong to the caller, not the cache
+            entry = pd.DataFrame(frame), name_map
+            self._disk_put(key, entry, source)
+        self._memory_put(key, entry, source)
+        return entry[0].copy(), dict(entry[1])
+
+    def invalidate(self, source: str = None) -> None:
+        """
+        Drops the entries of one data file from both levels, or everything without source.
+        """
+        source = None if source is None else os.path.abspath(source)
+        with self._lock:
+            for key in [k for k, v in self._memory.items() if source is None or v[2] == source]:
+                del self._memory[key]
+        for key, meta in self._disk_entries():
+            if source is None or meta.get('source') == source:
+                self._disk_remove(key)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    # Memory level
+    def _memory_get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            return entry
+
+    def _memory_put(self, key, entry, source=None):
+        if self.max_items <= 0:
+            return
+        with self._lock:
+            self._memory[key] = (entry[0], entry[1], None if source is None else os.path.abspath(source))
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    # Disk level
+    @property
+    def _disk_enabled(self) -> bool:
+        return bool(self.cache_dir) and self.max_disk_bytes > 0
+
+    def _paths(self, key):
+        extension = '.arrow' if _has_pyarrow() else '.pkl'
+        return os.path.join(self.cache_dir, key + extension), os.path.join(self.cache_dir, key + '.json')
+
+    def _disk_get(self, key):
+        if not self._disk_enabled:
+            return None
+        data_path, meta_path = self._paths(key)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if data_path.endswith('.arrow'):
+                from pyarrow import feather
+                frame = feather.read_table(data_path, memory_map=True).to_pandas()
+            elif _is_private_dir(self.cache_dir):
+                frame = pd.read_pickle(data_path)
+            else:
+                return None
+        except Exception:  # a truncated / foreign file is a miss, it gets rewritten
+            return None
+        os.utime(data_path)  # recency for the eviction
+        return frame, meta['name_map']
+
+    def _disk_put(self, key, entry, source=None):
+        if not self._disk_enabled:
+            return
+        frame, name_map = entry
+        data_path, meta_path = self._paths(key)
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        partial = data_path + f'.{os.getpid()}.tmp'
+        try:
+            if data_path.endswith('.arrow'):
+                import pyarrow as pa
+                from pyarrow import feather
+                feather.write_feather(pa.Table.from_pandas(frame), partial, compression='uncompressed')
+            else:
+                frame.to_pickle(partial)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'source': None if source is None else os.path.abspath(source),
+                           'name_map': {str(k): v for k, v in name_map.items()}}, f, default=str)
+            # write to a temporary name first so a parallel load never reads a half-written file
+            os.replace(partial, data_path)
+        except Exception:  # a frame Arrow cannot store (mixed object columns ...) stays memory-only
+            for path in (partial, meta_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            return
+        self._evict()
+
+    def _disk_entries(self):
+        if not self._disk_enabled or not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                try:
+                    with open(os.path.join(self.cache_dir, name), encoding='utf-8') as f:
+                        entries.append((name[:-5], json.load(f)))
+                except (OSError, ValueError):
+                    continue
+        return entries
+
+    def _disk_remove(self, key):
+        for extension in ('.arrow', '.pkl', '.json'):
+            path = os.path.join(self.cache_dir, key + extension)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _evict(self):
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.arrow', '.pkl')):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                files.append((stat.st_mtime, stat.st_size, name.rsplit('.', 1)[0]))
+        total = sum(size for _, size, _ in files)
+        for _, size, key in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            self._disk_remove(key)
+            total -= size
+
+
+# The cache behind cpdBaseFrame(cache=True)
+default_table_cache = TableCache()
@@ -0,0 +1,175 @@
+import json
+import os
+import warnings
+
+import pandas as pd
+from pandas.api.types import (
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+    is_object_dtype,
+    is_string_dtype,
+)
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _parses_as_dates(values: pd.Series) -> bool:
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # "could not infer format" for mixed inputs
+        parsed = pd.to_datetime(values, errors='coerce')
+    return bool(parsed.notna().all())
+
+
+def _looks_like_dates(values: pd.Series, sample: int = 200) -> bool:
+    # text columns whose values all parse as dates (and are not plain numbers such as upi / unit codes):
+    # a sample first to give up early, then every distinct value, so no text is turned into NaT later
+    text = values.dropna().astype(str)
+    sample_values = text.head(sample)
+    if sample_values.empty or sample_values.str.fullmatch(r'[\d.]+').all():
+        return False
+    return _parses_as_dates(sample_values) and _parses_as_dates(pd.Series(text.unique()))
+
+
+class TableSchema:
+    """
+    Pinned column types of one dataset, used by cpdBaseFrame(schema=...) to read every version with known dtypes.
+
+    Column names are the raw file headers (before lowervarlist), as read_csv expects them:
+    - dtypes: header -> dtype string ('category', 'Int64', 'float64', 'boolean', 'string[pyarrow]' ...)
+    - parse_dates: headers parsed as dates
+
+    Inferred from a first load by TableSchema.infer, stored as JSON, then passed to read_csv up front (read_kwargs)
+    so pandas no longer guesses types over the whole file (low_memory=False).
+
+    Examples
+    --------
+    >>> frame, name_map = pwread('SOB_20240131.csv', low_memory=False)
+    >>> schema = TableSchema.infer(frame, name_map, string_storage='pyarrow')
+    >>> schema.save('SOB.schema.json')
+    >>> pwread('SOB_20240229.csv', **TableSchema.load('SOB.schema.json').read_kwargs())
+    """
+
+    def __init__(self, dtypes: dict = None, parse_dates: list = None):
+        self.dtypes = dict(dtypes or {})
+        self.parse_dates = list(parse_dates or [])
+
+    @classmethod
+    def infer(
+            cls,
+            frame: pd.DataFrame,
+            name_map: dict = None,
+            max_categories: int = 1000,
+            max_category_ratio: float = 0.1,
+            string_storage: str = None
+    ):
+        """
+        Derives the schema from a loaded frame.
+
+        - low-cardinality text (grade, unit, region ...): at most max_categories values and
+          distinct / non-null <= max_category_ratio -> 'category'
+        - integers -> 'int64', floats holding only whole numbers with gaps -> nullable 'Int64'
+        - datetime columns and text columns that parse as dates -> parse_dates
+        - other text -> 'string[pyarrow]' when string_storage='pyarrow' and pyarrow is installed, else left to pandas
+
+        name_map (lowered -> raw header, as returned by pwread) translates the frame columns back to the file headers.
+        """
+        if string_storage not in (None, 'pyarrow', 'python'):
+            raise ValueError("string_storage must be None, 'pyarrow' or 'python'")
+        name_map = name_map or {}
+        dtypes, parse_dates = {}, []
+        for column in frame.columns:
+            header = str(name_map.get(column, column))
+            values = frame[column]
+            non_null = values.dropna()
+
+            if is_bool_dtype(values.dtype):
+                dtypes[header] = 'boolean'
+            elif is_datetime64_any_dtype(values.dtype):
+                parse_dates.append(header)
+            elif is_integer_dtype(values.dtype):
+                dtypes[header] = 'int64'
+            elif is_float_dtype(values.dtype):
+                whole = not non_null.empty and bool((non_null % 1 == 0).all()) and non_null.abs().max() < 2 ** 53
+                dtypes[header] = 'Int64' if whole and non_null.size < values.size else 'float64'
+            elif is_string_dtype(values.dtype) or is_object_dtype(values.dtype):
+                if non_null.empty:
+                    continue
+                if not non_null.map(type).eq(str).all():
+                    continue  # mixed python objects, leave them to pandas
+                if _looks_like_dates(non_null):
+                    parse_dates.append(header)
+                elif non_null.nunique() <= max_categories and non_null.nunique() / non_null.size <= max_category_ratio:
+                    dtypes[header] = 'category'
+                elif string_storage == 'pyarrow' and _has_pyarrow():
+                    dtypes[header] = 'string[pyarrow]'
+                elif string_storage == 'python':
+                    dtypes[header] = 'string[python]'
+        return cls(dtypes, parse_dates)
+
+    def read_kwargs(self, columns: list = None) -> dict:
+        """
+        The dtype / parse_dates arguments for read_csv (through pwread), limited to the headers in columns if given.
+        """
+        kwargs = {}
+        dtypes = {k: v for k, v in self.dtypes.items() if (v != 'string[pyarrow]' or _has_pyarrow())
+                  and (columns is None or k in columns)}
+        parse_dates = [k for k in self.parse_dates if columns is None or k in columns]
+        if dtypes:
+            kwargs['dtype'] = dtypes
+        if parse_dates:
+            kwargs['parse_dates'] = parse_dates
+        return kwargs
+
+    def apply(self, frame: pd.DataFrame, name_map: dict = None) -> pd.DataFrame:
+        """
+        Casts an already loaded frame (lowered columns, translated with name_map) to the schema.
+        Used for Excel files and for the first load, so a table reads the same whether its schema existed or not.
+        A date column holding values that do not parse is left as it is, like read_csv(parse_dates=) does.
+        """
+        header_to_column = {str(v): k for k, v in (name_map or {}).items()}
+        casts = {}
+        for header, dtype in self.read_kwargs().get('dtype', {}).items():
+            column = header_to_column.get(header, header)
+            if column in frame.columns and str(frame[column].dtype) != dtype:
+                casts[column] = dtype
+        dates = {}
+        for header in self.parse_dates:
+            column = header_to_column.get(header, header)
+            if column in frame.columns and not is_datetime64_any_dtype(frame[column].dtype):
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    parsed = pd.to_datetime(frame[column], errors='coerce')
+                if not (parsed.isna() & frame[column].notna()).any():
+                    dates[column] = parsed
+        frame = frame.astype(casts) if casts else frame
+        return frame.assign(**dates) if dates else frame
+
+    def to_dict(self) -> dict:
+        return {'dtypes': self.dtypes, 'parse_dates': self.parse_dates}
+
+    def save(self, file: str) -> None:
+        # written to a temporary name first, a parallel reader never sees half a file
+        partial = file + f'.{os.getpid()}.tmp'
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        os.replace(partial, file)
+
+    @classmethod
+    def load(cls, file: str):
+        with open(file, encoding='utf-8') as f:
+            content = json.load(f)
+        return cls(content.get('dtypes'), content.get('parse_dates'))
+
+    def __eq__(self, other):
+        return isinstance(other, TableSchema) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f'<TableSchema {len(self.dtypes)} dtype(s), {len(self.parse_dates)} date column(s)>'
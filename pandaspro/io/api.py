@@ -8,9 +8,11 @@ from pandaspro.io.cellpro.cellpro import (
 )
 
 from pandaspro.io.excel.putexcel import PutxlSet
+from pandaspro.io.excel.async_writer import AsyncPutxlSet
 from pandaspro.io.excel.writer import FramexlWriter as fw
 from pandaspro.io.excel.base import pwread
 from pandaspro.io.excel.wbexportsimple import WorkbookExportSimplifier
+from pandaspro.io.excel.fanout import fanout, render_xlsx
 
 __all__ = [
     'CellPro',
@@ -19,8 +21,11 @@ __all__ = [
     'resize',
     'offset',
     'PutxlSet',
+    'AsyncPutxlSet',
     'pwread',
     'WorkbookExportSimplifier',
     'getrange',
-    'fw'
+    'fw',
+    'fanout',
+    'render_xlsx'
 ]
\ No newline at end of file
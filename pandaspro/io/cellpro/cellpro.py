@@ -334,6 +334,27 @@ def cell_combine_by_column(cells: list = None):
     return merged_cells
 
 
+def combine_areas(areas: list, max_length: int = 255) -> list:
+    """
+    Joins range addresses into multi-area addresses like 'B1:B2,D1:D2', each no longer than max_length
+    (Excel refuses longer Range() addresses). One format call on a multi-area range styles every area,
+    and merging it merges every area on its own, so a list of rectangles needs len(result) calls instead of len(areas).
+
+    >>> combine_areas(['B1:B2', 'D1:D2', 'F1:G2'])
+    ['B1:B2,D1:D2,F1:G2']
+    """
+    result = []
+    current = ''
+    for area in areas:
+        if current and len(current) + 1 + len(area) > max_length:
+            result.append(current)
+            current = ''
+        current = f'{current},{area}' if current else area
+    if current:
+        result.append(current)
+    return result
+
+
 if __name__ == '__main__':
     print(cell_combine_by_row('E16,F16,E21,E22,E25,E26,E27,E50,E56'.split(',')))
     CellPro('B2')
@@ -0,0 +1,149 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+
+from pandaspro.io.excel.putexcel import PutxlSet
+
+
+def _init_com():
+    # xlwings on Windows drives Excel through COM, which must be initialised in every thread that touches it
+    try:
+        import pythoncom
+    except ImportError:  # macOS / Linux: no COM apartment to join
+        return
+    pythoncom.CoInitialize()
+
+
+def _release_com():
+    try:
+        import pythoncom
+    except ImportError:
+        return
+    pythoncom.CoUninitialize()
+
+
+class AsyncPutxlSet:
+    """
+    A PutxlSet owned by one dedicated writer thread, so pandas work and Excel writes can overlap.
+
+    The workbook is opened inside the writer thread and every later call (putxl, tab, copy_sheet ...) is queued to
+    the same thread, which runs them one by one in submission order. Each call returns a Future right away,
+    the caller keeps computing the next table while the previous one is being written.
+
+    Frames are copied when queued, so changing them afterwards does not affect what lands in Excel.
+
+    Parameters
+    ----------
+    workbook, sheet_name, alwaysreplace, noisily, template
+        Same as PutxlSet.
+    max_pending : int, optional
+        Upper bound of queued but unfinished writes, putxl blocks once it is reached. None means no bound.
+
+    Examples
+    --------
+    >>> with AsyncPutxlSet('report.xlsx') as ps:
+    ...     for region in regions:
+    ...         table = staff.inlist('region', region).tab('grade')   # computed while the last table is written
+    ...         ps.putxl(table, sheet_name=region, style='blue')
+    >>> # leaving the block waits for all writes and raises the first failure, if any
+    """
+
+    def __init__(
+            self,
+            workbook: str,
+            sheet_name: str = None,
+            alwaysreplace: str = None,
+            noisily: bool = None,
+            template: str = None,
+            max_pending: int = None,
+    ):
+        self.workbook = workbook
+        self.futures = []
+        self._slots = threading.BoundedSemaphore(max_pending) if max_pending else None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='putxl-writer', initializer=_init_com)
+        self._putxlset = None
+        self._closed = False
+
+        def _open():
+            self._putxlset = PutxlSet(
+                workbook=workbook,
+                sheet_name=sheet_name,
+                alwaysreplace=alwaysreplace,
+                noisily=noisily,
+                template=template
+            )
+            return self._putxlset
+
+        self.ready = self._executor.submit(_open)
+
+    def submit(self, method: str, *args, **kwargs) -> Future:
+        """
+        Queues any PutxlSet method by name, e.g. submit('tab', 'Summary', tab_color='blue').
+        """
+        if self._closed:
+            raise ValueError(f'Workbook {self.workbook} has been closed, no more writes can be queued')
+        if self._slots is not None:
+            self._slots.acquire()
+
+        def _call():
+            # the open step runs first in the same thread, re-raise its error for every queued call
+            return getattr(self.ready.result(), method)(*args, **kwargs)
+
+        future = self._executor.submit(_call)
+        if self._slots is not None:
+            future.add_done_callback(lambda _: self._slots.release())
+        self.futures.append(future)
+        return future
+
+    def putxl(self, content, *args, **kwargs) -> Future:
+        """
+        Queues a PutxlSet.putxl call and returns its Future, arguments are the same as PutxlSet.putxl.
+        """
+        if isinstance(content, pd.DataFrame):
+            content = content.copy()
+        return self.submit('putxl', content, *args, **kwargs)
+
+    def wait(self) -> list:
+        """
+        Blocks until every queued write is done and returns their results in submission order.
+        Raises the first failure after all writes have finished.
+        """
+        results, error = [], None
+        for future in list(self.futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(None)
+                error = error or e
+        if error is not None:
+            raise error
+        return results
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Waits for the queue (if wait), closes the workbook in the writer thread and stops the thread.
+        """
+        if self._closed:
+            return
+        try:
+            if wait:
+                self.wait()
+        finally:
+            self._closed = True
+
+            def _close():
+                if self._putxlset is not None:
+                    self._putxlset.close()
+                _release_com()
+
+            self._executor.submit(_close).result()
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # on an error in the block the queue still drains, but the original error wins
+        self.close(wait=exc_type is None)
+        return False
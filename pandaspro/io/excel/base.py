@@ -3,6 +3,8 @@ import pandas as pd
 from openpyxl.utils import column_index_from_string, get_column_letter
 from pandaspro.core.frame import FramePro
 from pandaspro.core.tools.lowervarlist import lowervarlist
+from pandaspro.io.excel.chunked import anchor_names, pwread_chunks, pwread_stream
+from pandaspro.io.excel.engines import resolve_excel_engine
 
 
 def pwread(
@@ -13,13 +15,28 @@ def pwread(
         skiprows: int = None,
         returnmap: bool = True,
         debug: bool = False,
+        chunksize: int = None,
+        engine: str = 'auto',
         **kwargs
 ):
+    # Streaming mode: a generator of FramePro chunks instead of one frame
+    if chunksize is not None:
+        return pwread_chunks(file, chunksize, sheet_name=sheet_name, cellrange=cellrange, firstrow=firstrow,
+                             skiprows=skiprows, returnmap=returnmap, **kwargs)
+
     # Decide the file type and call the right function
     if file.endswith('.xlsx') or file.endswith('.xlsm'):
-        func = pd.read_excel
+        # engine: 'auto' (by availability), 'calamine', 'openpyxl' or 'stream', see engines.py
+        excel_engine = resolve_excel_engine(engine, streamable=not kwargs)
+        if excel_engine == 'stream':
+            return pwread_stream(file, sheet_name=sheet_name, cellrange=cellrange, firstrow=firstrow,
+                                 skiprows=skiprows, returnmap=returnmap)
+        func = lambda f, **kwargs: pd.read_excel(f, engine=excel_engine, **kwargs)
         filetype = 'excel'
     elif file.endswith('.csv'):
+        # engine other than 'auto' is read_csv's own (c / python / pyarrow)
+        if engine != 'auto':
+            kwargs['engine'] = engine
         func = lambda f, **kwargs: pd.read_csv(f, **{k: v for k, v in kwargs.items() if k != 'sheet_name'})
         filetype = 'csv'
     else:
@@ -83,17 +100,18 @@ def pwread(
         elif re.match(r"^[A-Z]+\d+$", cellrange):
             match = re.match(r"^([A-Z]+)(\d+)$", cellrange)
             start_col, start_row = match.group(1), int(match.group(2))
-            end_row, end_col = func(file, sheet_name=sheet_name, header=None, **kwargs).shape[0], \
-                get_column_letter(func(file, sheet_name=sheet_name, header=None, **kwargs).shape[1])
-            usecols_arg = f"{start_col}:{end_col}" if filetype == 'excel' else [i for i in range(
-                column_index_from_string(start_col) - 1, column_index_from_string(end_col))]
+            # One parse to the end of the file, the columns left of the anchor are cut off in memory
+            start_index = column_index_from_string(start_col) - 1
             if firstrow:
-                df = func(file, sheet_name=sheet_name, usecols=usecols_arg, header=start_row - 1, nrows=end_row - start_row, **kwargs)
-                dfresult = df
+                df = func(file, sheet_name=sheet_name, header=start_row - 1, **kwargs)
+                dfresult = df.iloc[:, start_index:] if start_index else df
+                if start_index:
+                    read = lambda **kw: func(file, sheet_name=sheet_name, **kw)
+                    dfresult.columns = anchor_names(read, dfresult.columns, start_index, start_row - 1, **kwargs)
             if not firstrow:
-                df = func(file, sheet_name=sheet_name, usecols=usecols_arg, header=None, skiprows=start_row - 1,
-                          nrows=end_row - start_row + 1, **kwargs)
-                df.columns = get_columns_between(start_col, end_col)
+                df = func(file, sheet_name=sheet_name, header=None, skiprows=start_row - 1, **kwargs)
+                df = df.iloc[:, start_index:] if start_index else df
+                df.columns = get_columns_between(start_col, get_column_letter(start_index + df.shape[1]))
                 dfresult = df
 
         else:
@@ -0,0 +1,279 @@
+import itertools
+import re
+
+import numpy as np
+import pandas as pd
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+from pandaspro.core.frame import FramePro
+from pandaspro.core.tools.lowervarlist import lowervarlist
+
+
+def parse_cellrange(cellrange: str = None, skiprows: int = None) -> dict:
+    """
+    Translates a pwread cellrange into 1-based bounds:
+    first_row / last_row (None = to the end), col_start / col_end (None = to the last column) or cols (A,C,F lists).
+    lettered: headerless columns are named by their letters (any cellrange) rather than by position (no cellrange).
+    """
+    if not cellrange:
+        return {'first_row': 1, 'last_row': None, 'col_start': 1, 'col_end': None, 'cols': None, 'lettered': False}
+    return dict(_parse_cellrange(cellrange, skiprows), lettered=True)
+
+
+def _parse_cellrange(cellrange, skiprows):
+    if re.match(r"^[A-Z]+\d+:[A-Z]+\d+$", cellrange):
+        start_col, start_row, end_col, end_row = re.match(r"^([A-Z]+)(\d+):([A-Z]+)(\d+)$", cellrange).groups()
+        return {'first_row': int(start_row), 'last_row': int(end_row), 'col_start': column_index_from_string(start_col),
+                'col_end': column_index_from_string(end_col), 'cols': None}
+    if re.match(r"^[A-Z]+:[A-Z]+$", cellrange):
+        start_col, end_col = re.match(r"^([A-Z]+):([A-Z]+)$", cellrange).groups()
+        return {'first_row': 1, 'last_row': None, 'col_start': column_index_from_string(start_col),
+                'col_end': column_index_from_string(end_col), 'cols': None}
+    if re.match(r"^\d+:\d+$", cellrange):
+        start_row, end_row = re.match(r"^(\d+):(\d+)$", cellrange).groups()
+        return {'first_row': int(start_row), 'last_row': int(end_row), 'col_start': 1, 'col_end': None, 'cols': None}
+    if re.match(r"^[A-Z]+(,[A-Z]+)*$", cellrange):
+        return {'first_row': (skiprows or 0) + 1, 'last_row': None, 'col_start': None, 'col_end': None,
+                'cols': [column_index_from_string(letter.strip()) for letter in cellrange.split(',')]}
+    if re.match(r"^[A-Z]+\d+$", cellrange):
+        start_col, start_row = re.match(r"^([A-Z]+)(\d+)$", cellrange).groups()
+        return {'first_row': int(start_row), 'last_row': None, 'col_start': column_index_from_string(start_col),
+                'col_end': None, 'cols': None}
+    raise ValueError('Format of cell para. is not valid')
+
+
+def _mangle(names: list, positions) -> list:
+    # Same naming as pandas for blank and repeated header cells: 'Unnamed: 3' (0-based sheet column), 'x.1'
+    result, seen = [], {}
+    for i, name in zip(positions, names):
+        name = f'Unnamed: {i}' if name is None or (isinstance(name, str) and name.strip() == '') else name
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}.{seen[name]}'
+        else:
+            seen[name] = 0
+        result.append(name)
+    return result
+
+
+_NUMBERED = re.compile(r'\.\d+$')
+# read_csv / read_excel arguments that shape the columns, left out when the raw header row is read again
+_SHAPING_KWARGS = ('usecols', 'index_col', 'names', 'dtype', 'converters', 'parse_dates', 'skipfooter', 'na_filter')
+
+
+def anchor_names(read, names: list, cut: int, header_row: int, **kwargs) -> list:
+    """
+    Header of the columns right of an anchor cell.
+
+    pandas numbers repeated header cells across the whole row, so a name that also appears left of the anchor
+    would come back as 'name.1'. Only then the raw header row is read again and numbered within the slice.
+    """
+    names = list(names)
+    if not any(isinstance(name, str) and _NUMBERED.search(name) for name in names):
+        return names
+    kwargs = {k: v for k, v in kwargs.items() if k not in _SHAPING_KWARGS}
+    raw = read(header=None, skiprows=header_row, nrows=1, dtype=object, na_filter=False, **kwargs)
+    row = raw.iloc[0].tolist()[cut:] if len(raw) else []
+    return _mangle(row, range(cut, cut + len(row))) if len(row) == len(names) else names
+
+
+def _csv_chunks(file, bounds, firstrow, chunksize, **kwargs):
+    first_row, last_row = bounds['first_row'], bounds['last_row']
+    read_kwargs = dict(kwargs)
+    if bounds['cols'] is not None:
+        read_kwargs['usecols'] = [c - 1 for c in bounds['cols']]
+    elif bounds['col_end'] is not None:
+        read_kwargs['usecols'] = list(range(bounds['col_start'] - 1, bounds['col_end']))
+    if firstrow:
+        read_kwargs['header'] = first_row - 1
+        nrows = None if last_row is None else last_row - first_row
+    else:
+        read_kwargs['header'] = None
+        read_kwargs['skiprows'] = first_row - 1
+        nrows = None if last_row is None else last_row - first_row + 1
+
+    # columns left of an anchor cell are read, then cut off
+    cut = bounds['col_start'] - 1 if bounds['cols'] is None and bounds['col_end'] is None else 0
+
+    names = None
+
+    def _columns(frame):
+        frame = frame.iloc[:, cut:] if cut else frame
+        if names is not None:
+            frame.columns = names
+        if not firstrow and bounds['lettered']:
+            if bounds['cols'] is not None:
+                frame.columns = [get_column_letter(num + 1) for num in frame.columns]
+            else:
+                frame.columns = [get_column_letter(bounds['col_start'] + j) for j in range(frame.shape[1])]
+        return frame
+
+    head = _columns(pd.read_csv(file, nrows=0 if firstrow else 1, **read_kwargs))
+    if cut and firstrow:
+        names = anchor_names(lambda **kw: pd.read_csv(file, **kw), head.columns, cut, first_row - 1, **kwargs)
+        head.columns = names
+    reader = pd.read_csv(file, nrows=nrows, chunksize=chunksize, **read_kwargs)
+    return list(head.columns), (_columns(chunk) for chunk in reader)
+
+
+def _excel_chunks(file, bounds, firstrow, chunksize, sheet_name=0, full_width=False):
+    # -> (names, chunk generator, named: whether each column has a header cell)
+    # full_width: keep every column up to the sheet dimension (the caller trims the empty ones once all rows are read)
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file, read_only=True, data_only=True)
+    ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+    if bounds['cols'] is not None:
+        min_col, max_col = min(bounds['cols']), max(bounds['cols'])
+        picks = [c - min_col for c in bounds['cols']]
+    else:
+        min_col, max_col = bounds['col_start'], bounds['col_end'] or ws.max_column
+        picks = None
+
+    rows = ws.iter_rows(min_row=bounds['first_row'], max_row=bounds['last_row'], min_col=min_col, max_col=max_col, values_only=True)
+
+    def _pick(row):
+        row = list(row) + [None] * (max_col - min_col + 1 - len(row))
+        return [row[i] for i in picks] if picks is not None else row
+
+    def _blank(row):
+        return all(v is None for v in row)
+
+    header = _pick(next(rows, ())) if firstrow else None
+    first = []
+    for row in rows:
+        first.append(_pick(row))
+        if len(first) >= chunksize:
+            break
+
+    width = len(picks) if picks is not None else max_col - min_col + 1
+    judged = bounds['col_end'] is None and bounds['cols'] is None and not full_width
+    if judged:
+        # The sheet dimension also counts formatted empty columns: like read_excel, the table ends at the last
+        # column holding a value, judged on the header and the first chunk (a later row beyond it raises below)
+        width = max([0] + [max(i for i, v in enumerate(row) if v is not None) + 1
+                           for row in first + [header or []] if not _blank(row)])
+
+    letters = bounds['cols'] if picks is not None else range(min_col, min_col + width)
+    if firstrow:
+        names = _mangle(header[:width], [c - 1 for c in letters])
+    elif bounds['lettered']:
+        names = [get_column_letter(c) for c in letters]
+    else:
+        names = list(range(width))
+
+    def _frame(records):
+        return pd.DataFrame.from_records(records, columns=names)
+
+    def _generate():
+        try:
+            buffer, blanks = [], []
+            for number, row in enumerate(itertools.chain(first, (_pick(row) for row in rows))):
+                if judged and not _blank(row[width:]):
+                    sheet_row = bounds['first_row'] + number + (1 if firstrow else 0)
+                    raise ValueError(
+                        f'Row {sheet_row} has values right of column {get_column_letter(min_col + width - 1)}, '
+                        f'beyond the table width found in the header and the first {chunksize} rows: '
+                        f'give the last column in cellrange (e.g. "{get_column_letter(min_col)}{bounds["first_row"]}:'
+                        f'{get_column_letter(ws.max_column)}{ws.max_row}") or a larger chunksize')
+                row = row[:width]
+                # blank rows are kept only if data follows, read_excel drops the trailing ones
+                if _blank(row):
+                    blanks.append([np.nan] * width)
+                    continue
+                buffer.extend(blanks)
+                blanks = []
+                buffer.append([np.nan if v is None else v for v in row])
+                if len(buffer) >= chunksize:
+                    yield _frame(buffer[:chunksize])
+                    buffer = buffer[chunksize:]
+            if buffer:
+                yield _frame(buffer)
+        finally:
+            wb.close()
+
+    named = [v is not None and not (isinstance(v, str) and v.strip() == '') for v in header[:width]] if firstrow \
+        else [False] * width
+    return names, _generate(), named
+
+
+def pwread_chunks(
+        file: str,
+        chunksize: int,
+        sheet_name: str | int = 0,
+        cellrange: str = None,
+        firstrow: bool = True,
+        skiprows: int = None,
+        returnmap: bool = True,
+        **kwargs
+):
+    """
+    Streams a .csv / .xlsx table as FramePro chunks of chunksize rows, for files too large to load at once.
+
+    cellrange / firstrow / skiprows work as in pwread. The lowervarlist names are computed once from the header and
+    every chunk gets the same columns. CSV goes through pandas' chunked reader (kwargs are passed to read_csv),
+    Excel through an openpyxl read-only row iterator. Dtypes are inferred per chunk (pass dtype= for CSV to pin them),
+    and for an open-ended Excel range the table width is taken from the header and the first chunk: a later row with
+    values beyond it raises a ValueError rather than being cut (give the last column in cellrange then).
+
+    Returns the chunk generator, or (generator, rename map) with returnmap like pwread.
+
+    Examples
+    --------
+    >>> chunks, name_map = pwread_chunks('sob_full.csv', chunksize=200_000)
+    >>> afr = pd.concat(chunk.inlist('region', 'AFR') for chunk in chunks)   # only the filtered rows are kept
+    """
+    if chunksize is None or chunksize <= 0:
+        raise ValueError('chunksize must be a positive number of rows')
+    bounds = parse_cellrange(cellrange, skiprows)
+    if file.endswith('.xlsx') or file.endswith('.xlsm'):
+        names, chunks, _ = _excel_chunks(file, bounds, firstrow, chunksize, sheet_name=sheet_name)
+    elif file.endswith('.csv'):
+        names, chunks = _csv_chunks(file, bounds, firstrow, chunksize, **kwargs)
+    else:
+        raise TypeError('Only support .xlsx/.xlsm and .csv')
+
+    header = pd.DataFrame(columns=names)
+    new_names = lowervarlist(header, 'columns')
+    name_map = lowervarlist(header, 'revert')
+
+    def _renamed():
+        for chunk in chunks:
+            chunk.columns = new_names
+            yield FramePro(chunk)
+
+    if returnmap:
+        return _renamed(), name_map
+    return _renamed()
+
+
+def pwread_stream(
+        file: str,
+        sheet_name: str | int = 0,
+        cellrange: str = None,
+        firstrow: bool = True,
+        skiprows: int = None,
+        returnmap: bool = True,
+        chunksize: int = 50_000
+):
+    """
+    The 'stream' Excel engine of pwread: the whole table through the read-only row iterator, chunk by chunk.
+    Every column up to the sheet dimension is kept while reading, trailing columns without header or values are
+    dropped at the end, so columns whose values start late are not lost.
+    """
+    bounds = parse_cellrange(cellrange, skiprows)
+    names, chunks, named = _excel_chunks(file, bounds, firstrow, chunksize, sheet_name=sheet_name, full_width=True)
+    chunks = list(chunks)
+    frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=names)
+    width = len(names)
+    if bounds['col_end'] is None and bounds['cols'] is None:
+        while width and not named[width - 1] and frame.iloc[:, width - 1].isna().all():
+            width -= 1
+    frame = frame.iloc[:, :width]
+
+    header = pd.DataFrame(columns=frame.columns)
+    frame.columns = lowervarlist(header, 'columns')
+    name_map = lowervarlist(header, 'revert')
+    if returnmap:
+        return FramePro(frame), name_map
+    return FramePro(frame)
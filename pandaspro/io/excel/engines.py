@@ -0,0 +1,70 @@
+import os
+import time
+
+import pandas as pd
+
+EXCEL_ENGINES = ('calamine', 'openpyxl', 'stream')
+
+# From benchmarks/bench_read.py on the sample workbooks (min of 3 runs, openpyxl vs stream):
+# 36 KB 0.058s vs 0.075s, 0.6 MB 1.10s vs 1.30s, 2.9 MB 6.1s vs 5.5s.
+# Too small a gain to change the reader of existing workbooks behind the user's back: 'stream' is opt-in only
+
+
+def calamine_available() -> bool:
+    # pandas >= 2.2 reads through python-calamine (Rust) with engine='calamine', an optional install
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_excel_engines() -> list:
+    return [engine for engine in EXCEL_ENGINES if engine != 'calamine' or calamine_available()]
+
+
+def resolve_excel_engine(engine: str = 'auto', streamable: bool = True) -> str:
+    """
+    The reader pwread uses for an Excel file:
+    - 'calamine': pd.read_excel(engine='calamine'), the fastest, used by 'auto' whenever python-calamine is installed
+    - 'openpyxl': pd.read_excel default, used by 'auto' otherwise
+    - 'stream': openpyxl read-only rows assembled in chunks (pwread_chunks), only when asked for
+
+    streamable is False when read_excel arguments (dtype, usecols, converters ...) were given: the stream reader
+    does not take those, so 'stream' falls back to 'openpyxl'.
+    """
+    if engine == 'auto':
+        return 'calamine' if calamine_available() else 'openpyxl'
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f'Unknown Excel engine {engine!r}, expecting one of {("auto",) + EXCEL_ENGINES}')
+    if engine == 'calamine' and not calamine_available():
+        raise ValueError("engine='calamine' needs the python-calamine package (pip install python-calamine)")
+    if engine == 'stream' and not streamable:
+        return 'openpyxl'
+    return engine
+
+
+def benchmark_excel_engines(files: list, engines: list = None, repeat: int = 3) -> pd.DataFrame:
+    """
+    Times pwread on files with every available engine (best of repeat runs), to check the 'auto' choice on your
+    own workbooks.
+
+    Examples
+    --------
+    >>> benchmark_excel_engines(['cells_to_list.xlsx', r'D:/data/SOB_20240131.xlsx'])   # seconds per engine
+    """
+    from pandaspro.io.excel.base import pwread
+
+    engines = available_excel_engines() if engines is None else engines
+    rows = []
+    for file in files:
+        row = {'file': os.path.basename(file), 'bytes': os.path.getsize(file)}
+        for engine in engines:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                pwread(file, engine=engine)
+                timings.append(time.perf_counter() - start)
+            row[engine] = min(timings)
+        rows.append(row)
+    return pd.DataFrame(rows).set_index('file')
@@ -0,0 +1,726 @@
+"""
+In-memory stand-in for the part of xlwings used by PutxlSet, RangeOperator and FramexlWriter.
+
+Nothing is drawn and no Excel is needed, so exports can run on Linux CI. Every property set, method call,
+value read and value write is recorded in a CallLog, which makes the cost of an export something a test can assert:
+
+>>> with use_fake_excel() as fake:
+...     ps = PutxlSet('report.xlsx')
+...     ps.putxl(df, style='blue')
+>>> fake.log.total_calls, fake.log.sets['range.api.Borders().Weight'], fake.log.cells_written
+
+Paths in the log follow the objects: 'range.font.bold' (set), 'range.api.Borders()' (call),
+'Borders().Weight' is recorded as 'range.api.Borders().Weight'. Values written to cells are kept per sheet,
+so the exported content can be checked too (FakeSheet.cells, {(row, column): value}).
+"""
+import os
+import re
+from collections import Counter
+from contextlib import contextmanager
+
+import pandas as pd
+import xlwings as xw
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+# Default geometry of a new sheet, in points
+DEFAULT_COLUMN_WIDTH = 48.0
+DEFAULT_ROW_HEIGHT = 15.0
+
+
+class CallLog:
+    """
+    Counters of everything done through the fake backend.
+
+    - sets: property sets per path, e.g. sets['range.font.color']
+    - calls: method calls per path, e.g. calls['range.api.Borders()']
+    - gets: value reads per path, e.g. gets['range.value']
+    - writes: (sheet, address, cells) of every value write
+    """
+
+    def __init__(self):
+        self.sets = Counter()
+        self.calls = Counter()
+        self.gets = Counter()
+        self.writes = []
+
+    def reset(self) -> None:
+        self.__init__()
+
+    @property
+    def total_sets(self) -> int:
+        return sum(self.sets.values())
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    @property
+    def total_gets(self) -> int:
+        return sum(self.gets.values())
+
+    @property
+    def cells_written(self) -> int:
+        return sum(cells for _, _, cells in self.writes)
+
+    def summary(self) -> dict:
+        return {
+            'sets': self.total_sets,
+            'calls': self.total_calls,
+            'gets': self.total_gets,
+            'writes': len(self.writes),
+            'cells_written': self.cells_written,
+        }
+
+
+class _ComNode:
+    """
+    Any .api object: attributes spring into existence when read, sets and calls are recorded.
+    Unset properties are falsy, like the 0 / False defaults of Excel (e.g. MergeCells).
+    """
+
+    def __init__(self, log: CallLog, path: str):
+        object.__setattr__(self, '_log', log)
+        object.__setattr__(self, '_path', path)
+        object.__setattr__(self, '_store', {})
+
+    def __getattr__(self, name):
+        store = object.__getattribute__(self, '_store')
+        if name not in store:
+            store[name] = _ComNode(object.__getattribute__(self, '_log'), f"{object.__getattribute__(self, '_path')}.{name}")
+        return store[name]
+
+    def __setattr__(self, name, value):
+        object.__getattribute__(self, '_log').sets[f"{object.__getattribute__(self, '_path')}.{name}"] += 1
+        object.__getattribute__(self, '_store')[name] = value
+
+    def __call__(self, *args, **kwargs):
+        path = object.__getattribute__(self, '_path')
+        object.__getattribute__(self, '_log').calls[f'{path}()'] += 1
+        return _ComNode(object.__getattribute__(self, '_log'), f'{path}()')
+
+    def __bool__(self):
+        return False
+
+
+class _Recorder:
+    """
+    Base of the fake xlwings objects: public attribute sets are recorded under the object's path.
+    """
+    _path = 'object'
+
+    def __setattr__(self, name, value):
+        if not name.startswith('_'):
+            self._log.sets[f'{self._path}.{name}'] += 1
+        object.__setattr__(self, name, value)
+
+    def _call(self, name):
+        self._log.calls[f'{self._path}.{name}()'] += 1
+
+
+def _parse_address(address: str) -> list:
+    areas = []
+    for part in address.replace('$', '').split(','):
+        part = part.strip()
+        if '!' in part:
+            part = part.split('!')[-1]
+        bounds = []
+        for cell in part.split(':'):
+            match = re.fullmatch(r'([A-Z]+)(\d+)', cell.strip().upper())
+            if not match:
+                raise ValueError(f'Invalid range address {address}')
+            bounds.append((int(match.group(2)), column_index_from_string(match.group(1))))
+        (r1, c1), (r2, c2) = bounds[0], bounds[-1]
+        areas.append((min(r1, r2), min(c1, c2), max(r1, r2), max(c1, c2)))
+    return areas
+
+
+def _frame_to_rows(frame: pd.DataFrame) -> list:
+    # Same layout as xlwings: header rows (one per column level) with the index names, then index + values
+    index_frame = frame.index.to_frame(index=False)
+    header_rows = []
+    nlevels = frame.columns.nlevels
+    for level in range(nlevels):
+        labels = frame.columns.get_level_values(level).tolist()
+        names = [None] * index_frame.shape[1] if level < nlevels - 1 else list(frame.index.names)
+        header_rows.append(names + labels)
+    body = [list(i) + list(v) for i, v in zip(index_frame.itertuples(index=False), frame.itertuples(index=False))]
+    return header_rows + body
+
+
+def _to_rows(value) -> list:
+    if isinstance(value, pd.DataFrame):
+        return _frame_to_rows(value)
+    if isinstance(value, pd.Series):
+        return _frame_to_rows(value.to_frame())
+    if isinstance(value, (list, tuple)):
+        if len(value) and all(isinstance(row, (list, tuple)) for row in value):
+            return [list(row) for row in value]
+        return [list(value)]
+    return [[value]]
+
+
+class FakeRange(_Recorder):
+    number_format = 'General'
+    color = None
+    row_height = DEFAULT_ROW_HEIGHT
+
+    def __init__(self, sheet, areas: list):
+        self._sheet = sheet
+        self._log = sheet._log
+        self._path = 'range'
+        self._areas = areas
+        self._api = None
+        self._font = None
+
+    # Geometry
+    @property
+    def sheet(self):
+        return self._sheet
+
+    @property
+    def row(self):
+        return self._areas[0][0]
+
+    @property
+    def column(self):
+        return self._areas[0][1]
+
+    @property
+    def shape(self):
+        r1, c1, r2, c2 = self._areas[0]
+        return r2 - r1 + 1, c2 - c1 + 1
+
+    @property
+    def count(self):
+        return sum((r2 - r1 + 1) * (c2 - c1 + 1) for r1, c1, r2, c2 in self._areas)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def address(self):
+        def _area(r1, c1, r2, c2):
+            start = f'${get_column_letter(c1)}${r1}'
+            return start if (r1, c1) == (r2, c2) else f'{start}:${get_column_letter(c2)}${r2}'
+        return ','.join(_area(*area) for area in self._areas)
+
+    @property
+    def last_cell(self):
+        r1, c1, r2, c2 = self._areas[0]
+        return FakeRange(self._sheet, [(r2, c2, r2, c2)])
+
+    @property
+    def current_region(self):
+        # Grown until it is surrounded by empty rows / columns (or the sheet edge), like Excel's CurrentRegion
+        self._log.gets['range.current_region'] += 1
+        r1, c1, r2, c2 = self._areas[0]
+        filled = self._sheet.cells
+        while True:
+            ring = [(r, c) for r in range(max(r1 - 1, 1), r2 + 2) for c in range(max(c1 - 1, 1), c2 + 2)
+                    if not (r1 <= r <= r2 and c1 <= c <= c2) and (r, c) in filled]
+            if not ring:
+                return FakeRange(self._sheet, [(r1, c1, r2, c2)])
+            r1, c1 = min([r1] + [r for r, _ in ring]), min([c1] + [c for _, c in ring])
+            r2, c2 = max([r2] + [r for r, _ in ring]), max([c2] + [c for _, c in ring])
+
+    @property
+    def left(self):
+        return sum(self._sheet._column_width(c) for c in range(1, self.column))
+
+    @property
+    def top(self):
+        return sum(self._sheet._row_height(r) for r in range(1, self.row))
+
+    def __iter__(self):
+        for r1, c1, r2, c2 in self._areas:
+            for r in range(r1, r2 + 1):
+                for c in range(c1, c2 + 1):
+                    yield FakeRange(self._sheet, [(r, c, r, c)])
+
+    @property
+    def rows(self):
+        r1, c1, r2, c2 = self._areas[0]
+        return FakeRangeCollection(self, [FakeRange(self._sheet, [(r, c1, r, c2)]) for r in range(r1, r2 + 1)], 'rows')
+
+    @property
+    def columns(self):
+        r1, c1, r2, c2 = self._areas[0]
+        return FakeRangeCollection(self, [FakeRange(self._sheet, [(r1, c, r2, c)]) for c in range(c1, c2 + 1)], 'columns')
+
+    # Content
+    @property
+    def value(self):
+        self._log.gets['range.value'] += 1
+        r1, c1, r2, c2 = self._areas[0]
+        cells = self._sheet.cells
+        rows = [[cells.get((r, c)) for c in range(c1, c2 + 1)] for r in range(r1, r2 + 1)]
+        if len(rows) == 1 and len(rows[0]) == 1:
+            return rows[0][0]
+        if len(rows) == 1:
+            return rows[0]
+        if c1 == c2:
+            return [row[0] for row in rows]
+        return rows
+
+    def options(self, ndim: int = None, **kwargs):
+        # Only ndim=2 is honoured: value always comes back as a list of rows
+        return _FakeRangeOptions(self, ndim)
+
+    @value.setter
+    def value(self, value):
+        rows = _to_rows(value)
+        r1, c1 = self._areas[0][0], self._areas[0][1]
+        cells = self._sheet.cells
+        for i, row in enumerate(rows):
+            for j, v in enumerate(row):
+                if v is None or (isinstance(v, float) and v != v):
+                    cells.pop((r1 + i, c1 + j), None)
+                else:
+                    cells[(r1 + i, c1 + j)] = v
+        size = sum(len(row) for row in rows)
+        self._log.sets['range.value'] += 1
+        self._log.writes.append((self._sheet.name, self.address, size))
+
+    # Formats
+    @property
+    def api(self):
+        if self._api is None:
+            self._api = _ComNode(self._log, 'range.api')
+        return self._api
+
+    @property
+    def font(self):
+        if self._font is None:
+            self._font = FakeFont(self._log)
+        return self._font
+
+    @property
+    def column_width(self):
+        return self._sheet._column_width(self.column)
+
+    @column_width.setter
+    def column_width(self, width):
+        self._log.sets['range.column_width'] += 1
+        for c in range(self._areas[0][1], self._areas[0][3] + 1):
+            self._sheet._widths[c] = width * 6.0
+
+    # Methods
+    def clear(self):
+        self._call('clear')
+        self._clear_values()
+
+    def clear_contents(self):
+        self._call('clear_contents')
+        self._clear_values()
+
+    def _clear_values(self):
+        for r1, c1, r2, c2 in self._areas:
+            for key in [k for k in self._sheet.cells if r1 <= k[0] <= r2 and c1 <= k[1] <= c2]:
+                del self._sheet.cells[key]
+
+    def clear_formats(self):
+        self._call('clear_formats')
+
+    def merge(self, across=False):
+        self._call('merge')
+
+    def unmerge(self):
+        self._call('unmerge')
+
+    def autofit(self):
+        self._call('autofit')
+
+    def copy(self, destination=None):
+        self._call('copy')
+
+    def paste(self, paste=None, operation=None, skip_blanks=False, transpose=False):
+        self._call('paste')
+
+    def select(self):
+        self._call('select')
+
+    def delete(self, shift=None):
+        self._call('delete')
+
+    def __repr__(self):
+        return f'<FakeRange [{self._sheet.name}]{self.address}>'
+
+
+class _FakeRangeOptions:
+    def __init__(self, rng: FakeRange, ndim: int = None):
+        self._range = rng
+        self._ndim = ndim
+
+    @property
+    def value(self):
+        value = self._range.value
+        if self._ndim != 2:
+            return value
+        r1, c1, r2, c2 = self._range._areas[0]
+        if not isinstance(value, list):
+            return [[value]]
+        if r1 == r2:
+            return [value]
+        if c1 == c2:
+            return [[v] for v in value]
+        return value
+
+    @value.setter
+    def value(self, value):
+        self._range.value = value
+
+
+class FakeRangeCollection:
+    def __init__(self, parent: FakeRange, items: list, kind: str):
+        self._parent = parent
+        self._items = items
+        self._kind = kind
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, i):
+        return self._items[i]
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    def autofit(self):
+        self._parent._call(f'{self._kind}.autofit')
+
+
+class FakeFont(_Recorder):
+    def __init__(self, log: CallLog):
+        self._log = log
+        self._path = 'range.font'
+        object.__setattr__(self, 'bold', None)
+        object.__setattr__(self, 'italic', None)
+        object.__setattr__(self, 'size', None)
+        object.__setattr__(self, 'color', None)
+        object.__setattr__(self, 'name', None)
+
+
+class FakePictures:
+    def __init__(self, sheet):
+        self._sheet = sheet
+        self.items = []
+
+    def add(self, image, left=None, top=None, width=None, height=None, **kwargs):
+        self._sheet._log.calls['sheet.pictures.add()'] += 1
+        self.items.append({'image': image, 'left': left, 'top': top, 'width': width, 'height': height})
+        return self.items[-1]
+
+    def __len__(self):
+        return len(self.items)
+
+
+class FakeSheet(_Recorder):
+    def __init__(self, book, name: str):
+        self._book = book
+        self._log = book._log
+        self._path = 'sheet'
+        self._name = name
+        self._widths = {}
+        self._heights = {}
+        self._api = None
+        object.__setattr__(self, 'cells', {})
+        object.__setattr__(self, 'pictures', FakePictures(self))
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._log.sets['sheet.name'] += 1
+        self._name = value
+
+    @property
+    def book(self):
+        return self._book
+
+    @property
+    def index(self):
+        return self._book.sheets._items.index(self) + 1
+
+    @property
+    def api(self):
+        if self._api is None:
+            self._api = _ComNode(self._log, 'sheet.api')
+        return self._api
+
+    def _column_width(self, column):
+        return self._widths.get(column, DEFAULT_COLUMN_WIDTH)
+
+    def _row_height(self, row):
+        return self._heights.get(row, DEFAULT_ROW_HEIGHT)
+
+    def range(self, cell1, cell2=None):
+        self._log.calls['sheet.range()'] += 1
+        if isinstance(cell1, FakeRange):
+            cell1 = cell1.address
+        if isinstance(cell1, tuple):
+            cell1 = get_column_letter(cell1[1]) + str(cell1[0])
+        if isinstance(cell2, tuple):
+            cell2 = get_column_letter(cell2[1]) + str(cell2[0])
+        return FakeRange(self, _parse_address(cell1 if cell2 is None else f'{cell1}:{cell2}'))
+
+    @property
+    def used_range(self):
+        if not self.cells:
+            return FakeRange(self, [(1, 1, 1, 1)])
+        rows = [r for r, _ in self.cells]
+        columns = [c for _, c in self.cells]
+        return FakeRange(self, [(min(rows), min(columns), max(rows), max(columns))])
+
+    def activate(self):
+        self._call('activate')
+
+    def autofit(self, axis=None):
+        self._call('autofit')
+
+    def clear(self):
+        self._call('clear')
+        self.cells.clear()
+
+    def delete(self):
+        self._call('delete')
+        self._book.sheets._items.remove(self)
+
+    def copy(self, before=None, after=None, name=None):
+        self._call('copy')
+        target_book = (before or after).book if (before or after) is not None else self._book
+        new_sheet = target_book.sheets._insert(name or target_book.sheets._unique_name(self.name), before, after)
+        object.__setattr__(new_sheet, 'cells', dict(self.cells))
+        new_sheet._widths = dict(self._widths)
+        new_sheet._heights = dict(self._heights)
+        return new_sheet
+
+    def __repr__(self):
+        return f'<FakeSheet [{self._book.name}]{self.name}>'
+
+
+class FakeSheets:
+    def __init__(self, book):
+        self._book = book
+        self._items = []
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    @property
+    def active(self):
+        return self._items[0]
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for sheet in self._items:
+                if sheet.name.lower() == key.lower():
+                    return sheet
+            raise KeyError(key)
+        return self._items[key]
+
+    def _unique_name(self, base='Sheet'):
+        names = {sheet.name for sheet in self._items}
+        i = len(self._items) + 1
+        while f'{base}{i}' in names:
+            i += 1
+        return f'{base}{i}'
+
+    def _insert(self, name, before=None, after=None):
+        sheet = FakeSheet(self._book, name)
+        if isinstance(after, int):  # xlwings accepts a 1-based position
+            after = self._items[after - 1]
+        if isinstance(before, int):
+            before = self._items[before - 1]
+        if before is not None:
+            self._items.insert(self._items.index(before), sheet)
+        elif after is not None:
+            self._items.insert(self._items.index(after) + 1, sheet)
+        else:
+            self._items.insert(0, sheet)
+        return sheet
+
+    def add(self, name=None, before=None, after=None):
+        self._book._log.calls['book.sheets.add()'] += 1
+        return self._insert(name or self._unique_name(), before, after)
+
+
+class FakeBook(_Recorder):
+    def __init__(self, app, fullname: str = None):
+        self._app = app
+        self._log = app._log
+        self._path = 'book'
+        self._fullname = fullname
+        self._api = None
+        object.__setattr__(self, 'sheets', FakeSheets(self))
+        object.__setattr__(self, 'saved', 0)
+        self.sheets._insert('Sheet1')
+
+    @property
+    def name(self):
+        return os.path.basename(self._fullname) if self._fullname else f'Book{id(self) % 1000}'
+
+    @property
+    def fullname(self):
+        return self._fullname
+
+    @property
+    def app(self):
+        return self._app
+
+    @property
+    def api(self):
+        if self._api is None:
+            self._api = _ComNode(self._log, 'book.api')
+        return self._api
+
+    def save(self, path=None):
+        self._call('save')
+        if path is not None:
+            self._fullname = path
+        object.__setattr__(self, 'saved', self.saved + 1)
+        self._app._fake.files[os.path.abspath(self._fullname)] = self
+
+    def close(self):
+        self._call('close')
+        if self in self._app.books._items:
+            self._app.books._items.remove(self)
+
+    def __repr__(self):
+        return f'<FakeBook {self.name}>'
+
+
+class FakeBooks:
+    def __init__(self):
+        self._items = []
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for book in self._items:
+                if book.name == key:
+                    return book
+            raise KeyError(key)
+        return self._items[key]
+
+
+class FakeApp(_Recorder):
+    def __init__(self, fake):
+        self._fake = fake
+        self._log = fake.log
+        self._path = 'app'
+        self._api = _ComNode(self._log, 'app.api')
+        object.__setattr__(self, 'books', FakeBooks())
+        object.__setattr__(self, 'screen_updating', True)
+        object.__setattr__(self, 'display_alerts', True)
+        object.__setattr__(self, 'calculation', 'automatic')
+
+    @property
+    def api(self):
+        return self._api
+
+    def quit(self):
+        self._call('quit')
+        self._fake.apps._items.remove(self)
+
+
+class FakeApps:
+    def __init__(self, fake):
+        self._fake = fake
+        self._items = []
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    @property
+    def active(self):
+        if not self._items:
+            self._items.append(FakeApp(self._fake))
+        return self._items[0]
+
+
+class FakeXlwings:
+    """
+    Replaces the xlwings module: Book, apps and constants. Books saved to a path are kept in memory
+    (files) and come back when the same path is opened again.
+    """
+    constants = xw.constants
+
+    def __init__(self):
+        self.log = CallLog()
+        self.apps = FakeApps(self)
+        self.files = {}
+
+    def Book(self, fullname=None, **kwargs):
+        app = self.apps.active
+        if fullname is not None:
+            key = os.path.abspath(fullname)
+            book = self.files.get(key)
+            if book is None:
+                book = FakeBook(app, fullname)
+                self.files[key] = book
+        else:
+            book = FakeBook(app)
+        if book not in app.books._items:
+            app.books._items.append(book)
+        return book
+
+    def sheet(self, book: str, sheet: str):
+        """
+        Shortcut for assertions: the sheet of a book opened in this fake, by file name.
+        """
+        for app in self.apps:
+            for each in app.books:
+                if each.name == os.path.basename(book):
+                    return each.sheets[sheet]
+        raise KeyError(book)
+
+
+# Modules that refer to xlwings as xw and talk to Excel
+_PATCHED_MODULES = [
+    'pandaspro.io.excel.putexcel',
+    'pandaspro.io.excel.range_operator',
+]
+
+
+@contextmanager
+def use_fake_excel(fake: FakeXlwings = None):
+    """
+    Routes every xlwings call of PutxlSet / RangeOperator to a FakeXlwings for the duration of the with block.
+    """
+    import importlib
+
+    fake = FakeXlwings() if fake is None else fake
+    modules = [importlib.import_module(name) for name in _PATCHED_MODULES]
+    originals = [module.xw for module in modules]
+    for module in modules:
+        module.xw = fake
+    try:
+        yield fake
+    finally:
+        for module, original in zip(modules, originals):
+            module.xw = original
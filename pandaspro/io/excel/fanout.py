@@ -0,0 +1,167 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+
+def render_xlsx(
+        frame: pd.DataFrame,
+        file: str,
+        sheet_name: str = 'Sheet1',
+        index: bool = False,
+        header_fill: str = '4472C4',
+        header_font_color: str = 'FFFFFF',
+        max_width: int = 60,
+) -> None:
+    """
+    Default file-based renderer used by fanout: pandas + openpyxl, no Excel instance needed.
+    Writes the frame, paints the header like putxl auto_format (blue fill, white bold text) and sets column widths
+    from the longest value of each column.
+    """
+    with pd.ExcelWriter(file, engine='openpyxl') as writer:
+        frame.to_excel(writer, sheet_name=sheet_name, index=index)
+        ws = writer.sheets[sheet_name]
+
+        header_rows = frame.columns.nlevels
+        fill = PatternFill(fill_type='solid', fgColor=header_fill)
+        font = Font(bold=True, color=header_font_color)
+        for row in ws.iter_rows(min_row=1, max_row=header_rows):
+            for cell in row:
+                cell.fill = fill
+                cell.font = font
+                cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+
+        export = frame.reset_index() if index else frame
+        for i, col in enumerate(export.columns):
+            values_width = export[col].astype(str).str.len().max() if len(export) else 0
+            header_width = len(str(col))
+            width = min(max(values_width if pd.notna(values_width) else 0, header_width) + 2, max_width)
+            ws.column_dimensions[get_column_letter(i + 1)].width = width
+
+
+def _render_partition(key, frame, file, render, render_kwargs) -> dict:
+    start = time.perf_counter()
+    try:
+        folder = os.path.dirname(file)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        render(frame, file, **render_kwargs)
+        status, error = 'ok', None
+    except Exception as e:
+        status, error = 'failed', f'{type(e).__name__}: {e}'
+    return {
+        'key': key,
+        'file': file,
+        'rows': len(frame),
+        'seconds': round(time.perf_counter() - start, 4),
+        'status': status,
+        'error': error,
+    }
+
+
+def fanout(
+        data,
+        by: str | list,
+        file,
+        render=None,
+        workers: int = None,
+        noisily: bool = True,
+        **render_kwargs
+):
+    """
+    Partitions a frame by key columns in one groupby pass and renders each partition to its own workbook.
+
+    Every partition is handed to a process pool and written with a file-based writer (render_xlsx by default),
+    so no Excel instance is involved. A failing file (or a key the target cannot be resolved for) is recorded in the
+    report and never aborts the batch; targets shared by several keys are refused before anything is written.
+
+    Parameters
+    ----------
+    data : DataFrame
+        The master frame to split.
+    by : str or list
+        Key column(s) to partition on, one workbook per distinct key.
+    file : str or callable
+        Target path, either a template formatted with the key columns (e.g. 'out/{country}.xlsx')
+        or a callable taking the key dict and returning the path.
+    render : callable, optional
+        A picklable function render(frame, file, **render_kwargs), defaults to render_xlsx.
+    workers : int, optional
+        Number of worker processes, None lets the pool decide and 1 renders in the current process.
+    noisily : bool
+        Print one line per rendered file.
+    **render_kwargs
+        Passed through to render, e.g. sheet_name='Staff', index=True.
+
+    Returns
+    -------
+    FramePro
+        One row per file with the key columns, file, rows, seconds, status and error.
+
+    Examples
+    --------
+    >>> report = df.fanout('country', 'out/{country}.xlsx', sheet_name='Staff')
+    >>> report.inlist('status', 'failed')
+    """
+    from pandaspro.core.frame import FramePro
+
+    by_list = [by] if isinstance(by, str) else list(by)
+    render = render_xlsx if render is None else render
+
+    jobs, results = [], []
+    for key, part in pd.DataFrame(data).groupby(by_list, sort=False, dropna=False):
+        key_dict = dict(zip(by_list, key if isinstance(key, tuple) else (key,)))
+        # A target that cannot be resolved fails its own partition only
+        try:
+            target = file(key_dict) if callable(file) else file.format(**key_dict)
+            result = None
+        except Exception as e:
+            target = None
+            result = {'key': key_dict, 'file': None, 'rows': len(part), 'seconds': None,
+                      'status': 'failed', 'error': f'{type(e).__name__}: {e}'}
+        jobs.append((key_dict, part, target))
+        results.append(result)
+
+    # Two partitions rendered to the same file would overwrite each other (concurrently), refuse before writing
+    seen = {}
+    for key_dict, _, target in jobs:
+        if target is not None:
+            seen.setdefault(os.path.normcase(os.path.abspath(target)), []).append(key_dict)
+    duplicates = {path: keys for path, keys in seen.items() if len(keys) > 1}
+    if duplicates:
+        raise ValueError(f'Several partitions resolve to the same file, make file unique per key: {duplicates}')
+
+    pending = [i for i, result in enumerate(results) if result is None]
+    if workers == 1:
+        for i in pending:
+            key_dict, part, target = jobs[i]
+            results[i] = _render_partition(key_dict, part, target, render, render_kwargs)
+            if noisily:
+                print(f"[{results[i]['status']}] <<{target}>> rendered in {results[i]['seconds']}s")
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_render_partition, *jobs[i], render, render_kwargs): i
+                for i in pending
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                key_dict, part, target = jobs[i]
+                try:
+                    results[i] = future.result()
+                except Exception as e:  # e.g. a crashed worker or an unpicklable render function
+                    results[i] = {'key': key_dict, 'file': target, 'rows': len(part), 'seconds': None,
+                                  'status': 'failed', 'error': f'{type(e).__name__}: {e}'}
+                if noisily:
+                    print(f"[{results[i]['status']}] <<{target}>> rendered in {results[i]['seconds']}s")
+
+    report = pd.DataFrame([{**r['key'], **{k: v for k, v in r.items() if k != 'key'}} for r in results],
+                          columns=by_list + ['file', 'rows', 'seconds', 'status', 'error'])
+    if noisily:
+        failed = int((report['status'] == 'failed').sum())
+        print(f"Fan-out finished: {len(report) - failed} file(s) rendered, {failed} failed")
+
+    return FramePro(report)
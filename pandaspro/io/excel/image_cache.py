@@ -0,0 +1,57 @@
+import hashlib
+import os
+import tempfile
+
+# Excel sizes pictures in points, screens render at 96 pixels per inch = 96 / 72 pixels per point
+PIXELS_PER_POINT = 96 / 72
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'pandaspro_img_cache')
+
+
+def image_cache_key(path: str, size: tuple) -> str:
+    """
+    Cache key of a resized image: absolute path, modification time and target size.
+    A changed source file gets a new mtime and therefore a new key, stale entries are never reused.
+    """
+    path = os.path.abspath(path)
+    raw = f'{path}|{os.path.getmtime(path)}|{size}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def cached_resized_image(path: str, size: tuple = None, cache_dir: str = None) -> str:
+    """
+    Returns a copy of the image resized to size (width, height in points), cached on disk.
+
+    Thumbnails are resized once and reused by every later export, so Excel only ever receives small files.
+    Either side of size may be None to keep the aspect ratio. Without size, or without Pillow installed,
+    the original path is returned and Excel scales the picture itself.
+    """
+    if size is None or (size[0] is None and size[1] is None):
+        return path
+    try:
+        from PIL import Image
+    except ImportError:
+        return path
+
+    cache_dir = DEFAULT_CACHE_DIR if cache_dir is None else cache_dir
+    target = os.path.join(cache_dir, image_cache_key(path, size) + '.png')
+    if os.path.exists(target):
+        return target
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with Image.open(path) as img:
+        width, height = size
+        ratio = img.width / img.height
+        if width is None:
+            width = height * ratio
+        elif height is None:
+            height = width / ratio
+        pixels = (max(round(width * PIXELS_PER_POINT), 1), max(round(height * PIXELS_PER_POINT), 1))
+        resized = img.convert('RGBA').resize(pixels, Image.LANCZOS)
+
+        # write to a temporary name first so a parallel export never reads a half-written file
+        partial = target + f'.{os.getpid()}.tmp'
+        resized.save(partial, format='PNG')
+        os.replace(partial, target)
+
+    return target
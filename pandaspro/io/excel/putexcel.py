@@ -1,15 +1,21 @@
+import copy
 import re
+import shutil
 from pathlib import Path
 import os
 
+import numpy as np
 import pandas
 import pandas as pd
+from openpyxl.utils.cell import range_boundaries
 import xlwings as xw
 from pandaspro.core.stringfunc import parse_method, str2list
-from pandaspro.io.excel.writer import FramexlWriter, StringxlWriter, cpdFramexl, CellxlWriter, DictxlWriter
-from pandaspro.io.cellpro.cellpro import CellPro, cell_combine_by_column, is_cellpro_valid
+from pandaspro.io.excel.writer import FramexlWriter, StringxlWriter, cpdFramexl, CellxlWriter, DictxlWriter, split_rows_per_sheet
+from pandaspro.io.cellpro.cellpro import CellPro, cell_combine_by_column, is_cellpro_valid, index_cell, cell_index, combine_areas
+from pandaspro.io.excel.image_cache import cached_resized_image
 from pandaspro.io.excel.range_operator import RangeOperator, parse_format_rule, color_to_int, _cpdpuxl_color_map
 from pandaspro.utils.cpd_logger import cpdLogger
+from pandaspro.utils.export_report import profiled_export
 
 
 def is_range_filled(ws, range_str: str = None):
@@ -23,6 +29,44 @@ def is_range_filled(ws, range_str: str = None):
         return False
 
 
+class UsedRangeProbe:
+    """
+    Occupancy of a worksheet read from Excel once: the used range values as a 2-D boolean array.
+
+    is_range_filled reads every probed cell through its own COM call, so checking the strips around a table costs
+    one call per cell. The probe answers any number of occupancy / overlap questions from the single used range
+    read, the cost of the checks no longer grows with the size of the table.
+
+    >>> probe = UsedRangeProbe(ws)
+    >>> probe.is_filled('B10:F10')
+    >>> probe.filled_ranges(['H2:K20', 'M2:P20'])   # planned tables that would land on existing content
+    """
+
+    def __init__(self, ws):
+        used = ws.used_range
+        self.top, self.left = used.row, used.column
+        values = np.array(used.options(ndim=2).value, dtype=object)
+        # Empty cells come back as None, blank strings count as empty too (same rule as is_range_filled)
+        self.filled = ~pd.isna(values) & (np.char.strip(values.astype(str)) != '')
+
+    def is_filled(self, range_str: str = None) -> bool:
+        if range_str is None:
+            return False
+        min_col, min_row, max_col, max_row = range_boundaries(range_str)
+        # Intersect with the used range, everything outside of it is empty
+        r1, r2 = max(min_row - self.top, 0), min(max_row - self.top + 1, self.filled.shape[0])
+        c1, c2 = max(min_col - self.left, 0), min(max_col - self.left + 1, self.filled.shape[1])
+        if r1 >= r2 or c1 >= c2:
+            return False
+        return bool(self.filled[r1:r2, c1:c2].any())
+
+    def filled_ranges(self, ranges: list) -> list:
+        """
+        Returns the ranges (e.g. the areas of other planned tables) that already hold content.
+        """
+        return [range_str for range_str in ranges if self.is_filled(range_str)]
+
+
 def is_sheet_empty(sheet):
     used_range = sheet.used_range
     if used_range.shape == (1, 1) and not used_range.value:
@@ -30,6 +74,76 @@ def is_sheet_empty(sheet):
     return False
 
 
+def template_region_shape(ws, cell: str) -> tuple:
+    """
+    Returns the (rows, columns) of the pre-formatted template region anchored at cell.
+
+    The region runs from the anchor cell to the bottom-right corner of the block around it (Excel's current region,
+    bounded by empty rows and columns), so notes, logos or titles elsewhere on the template sheet are not stretched.
+    The sample rows of the template therefore need values (placeholders), formats alone do not extend the block.
+    """
+    anchor_row, anchor_col = CellPro(cell).cell_index
+    last_cell = ws.range(cell).current_region.last_cell
+    return max(last_cell.row - anchor_row + 1, 0), max(last_cell.column - anchor_col + 1, 0)
+
+
+def stretch_template_region(ws, cell: str, template_shape: tuple, target_shape: tuple, header_rows: int = 1, index_columns: int = 0) -> None:
+    """
+    Stretches or shrinks the formats of a template region to the size of the new table.
+
+    Rows below the header are grown by pasting the formats of the template body row (the one above the last row)
+    and the last template row is moved down to the new bottom, so bottom borders/total rows keep their looks.
+    Shrinking moves the last row format up and clears the surplus rows. Columns right of the index are handled the same way.
+    Everything is done with range-level copy/paste of formats, never cell by cell.
+
+    :param ws: the xlwings sheet holding the template region
+    :param cell: anchor (top-left) cell of the region
+    :param template_shape: (rows, columns) of the template region, see template_region_shape
+    :param target_shape: (rows, columns) of the table to be written, e.g. (io.tr, io.tc) from FramexlWriter
+    :param header_rows: number of header rows in the region which are never stretched
+    :param index_columns: number of index columns in the region which are never stretched
+    """
+    anchor_row, anchor_col = CellPro(cell).cell_index
+    tpl_rows, tpl_cols = template_shape
+    new_rows, new_cols = target_shape
+
+    def _block(row, col, height, width):
+        return ws.range(index_cell(row, col) + ':' + index_cell(row + height - 1, col + width - 1))
+
+    def _paste_formats(source, destination, widths=False):
+        source.copy()
+        destination.paste(paste='formats')
+        if widths:
+            destination.paste(paste='column_widths')
+
+    # Rows: only the body (below headers) is stretched
+    if tpl_rows > header_rows and new_rows != tpl_rows and tpl_cols > 0:
+        last_tpl_row = anchor_row + tpl_rows - 1
+        new_last_row = anchor_row + new_rows - 1
+        body_row = last_tpl_row - 1 if tpl_rows - header_rows >= 2 else last_tpl_row
+        if new_rows > tpl_rows:
+            _paste_formats(_block(last_tpl_row, anchor_col, 1, tpl_cols), _block(new_last_row, anchor_col, 1, tpl_cols))
+            _paste_formats(_block(body_row, anchor_col, 1, tpl_cols), _block(last_tpl_row, anchor_col, new_rows - tpl_rows, tpl_cols))
+        else:
+            if new_rows > header_rows:
+                _paste_formats(_block(last_tpl_row, anchor_col, 1, tpl_cols), _block(new_last_row, anchor_col, 1, tpl_cols))
+            _block(new_last_row + 1, anchor_col, tpl_rows - new_rows, tpl_cols).clear()
+
+    # Columns: only the data columns (right of the index) are stretched, over the new height
+    height = max(new_rows, header_rows)
+    if tpl_cols > index_columns and new_cols != tpl_cols and height > 0:
+        last_tpl_col = anchor_col + tpl_cols - 1
+        new_last_col = anchor_col + new_cols - 1
+        body_col = last_tpl_col - 1 if tpl_cols - index_columns >= 2 else last_tpl_col
+        if new_cols > tpl_cols:
+            _paste_formats(_block(anchor_row, last_tpl_col, height, 1), _block(anchor_row, new_last_col, height, 1), widths=True)
+            _paste_formats(_block(anchor_row, body_col, height, 1), _block(anchor_row, last_tpl_col, height, new_cols - tpl_cols), widths=True)
+        else:
+            if new_cols > index_columns:
+                _paste_formats(_block(anchor_row, last_tpl_col, height, 1), _block(anchor_row, new_last_col, height, 1))
+            _block(anchor_row, new_last_col + 1, height, tpl_cols - new_cols).clear()
+
+
 def parse_header_rule(header_str: str) -> dict:
     """
     Parses the header string for additional header control keywords.
@@ -140,6 +254,7 @@ class PutxlSet:
             sheet_name: str = None,
             alwaysreplace: str = None,  # a global config that sets all the following actions to replace ...
             noisily: bool = None,
+            template: str = None,  # a pre-formatted workbook copied as the starting point of a new workbook
     ):
         # App and Workbook declaration
         open_wb, app = PutxlSet._get_open_workbook_by_name(
@@ -154,7 +269,12 @@ class PutxlSet:
         elif noisily:
             print(f"Working on {workbook} now ...")
 
-        if not os.path.exists(workbook):  # Check if the file already exists
+        if not os.path.exists(workbook) and template is not None:  # Start from the template workbook (all sheets and formats)
+            if not os.path.exists(template):
+                raise ValueError(f'Template workbook {template} does not exist')
+            shutil.copyfile(template, workbook)
+            open_wb = xw.Book(workbook)
+        elif not os.path.exists(workbook):  # Check if the file already exists
             open_wb = xw.Book()  # If not, create a new Excel file
             open_wb.save(workbook)
         else:
@@ -180,9 +300,12 @@ class PutxlSet:
         self.wb = open_wb
         self.ws = sheet
         self.alwaysreplace = alwaysreplace
+        self.template = template
         self.io = None
         self.next_cell_down = None
         self.next_cell_right = None
+        self.toc_settings = None
+        self.last_report = None
 
     @property
     def colormap(self):
@@ -201,6 +324,33 @@ class PutxlSet:
                     return curr_wb, curr_app
         return None, None
 
+    def _copy_template_sheet(self, template: str, template_file: str = None) -> None:
+        """
+        Replaces the current sheet with a copy of the template sheet, keeping the current sheet name and position.
+        The template sheet is looked up in template_file if declared, otherwise in the current workbook.
+        """
+        opened_book = None
+        if template_file is None:
+            source_book = self.wb
+        else:
+            source_book, _ = PutxlSet._get_open_workbook_by_name(PutxlSet._extract_filename_from_path(template_file))
+            if source_book is None:
+                if not os.path.exists(template_file):
+                    raise ValueError(f'Template workbook {template_file} does not exist')
+                source_book = opened_book = xw.Book(template_file)
+
+        if template not in [sheet.name for sheet in source_book.sheets]:
+            raise ValueError(f'Template sheet {template} does not exist in {source_book.name}')
+
+        target_name = self.ws.name
+        new_sheet = source_book.sheets[template].copy(after=self.ws)
+        self.ws.delete()
+        new_sheet.name = target_name
+        self.ws = new_sheet
+
+        if opened_book is not None:
+            opened_book.close()
+
     # noinspection PyMethodMayBeStatic
     def helpfile(self, para='all'):
         cd_file = """
@@ -237,6 +387,7 @@ class PutxlSet:
         if para == 'cd_format':
             print(cd_file)
 
+    @profiled_export
     def putxl(
             self,
             content,
@@ -283,6 +434,7 @@ class PutxlSet:
             index_merge: dict = None,
             header_wrap: bool = None,
             auto_format: bool = True,  # 自动应用默认格式
+            auto_number_format: bool = False,  # number formats derived from column dtypes, 1 call per column
             index_auto_merge: bool = True,  # 自动合并 index 多级变量（除最后一级）
             design: str = None,
             style: str | list = None,
@@ -300,10 +452,18 @@ class PutxlSet:
             # Section. hyperlink
             goto: str = None,
 
+            # Section. template
+            template: str = None,
+            template_file: str = None,
+
             mode: str = None,
             debug: str | bool = None,
             debug_file: str | bool = None,
-    ) -> None:
+
+            # Section. profiling: returns an ExportReport (section times, format/Excel call counts, cells touched)
+            profile: bool = False,
+            profile_file: str = None,
+    ):
         if debug or debug_file:
             self.reconfigure_logger(debug=debug, debug_file=debug_file)
 
@@ -348,6 +508,7 @@ class PutxlSet:
             else:
                 self.ws = self.wb.sheets.add(after=self.wb.sheets.count)
                 self.ws.name = sheet_name
+                self._sheet_added(sheet_name)
 
         # If sheetreplace or replace is specified, then delete the old sheet and create a new one
         ################################
@@ -407,6 +568,48 @@ class PutxlSet:
         # )
         # print(f'{upi} image successfully loaded')
 
+        # Operation Type: Template Writing
+        ###########################
+        '''
+        Template mode: formats come from a pre-formatted sheet, only values are written
+        (1) template = 'tpl' copies sheet 'tpl' (from this workbook, or from template_file if declared) into the target sheet
+        (2) mode = 'template' without template fills the target sheet in place, e.g. a sheet copied over from PutxlSet(template=...)
+        The format region is stretched/shrunk to the new row and column counts before 1 single value write
+
+        >>> ps.putxl(df, sheet_name='Report', cell='A4', template='tpl_report')
+        '''
+        if mode == 'template' or template is not None:
+            if not isinstance(content, pandas.DataFrame):
+                raise ValueError('Please pass a dataframe-like object as content when using template mode')
+            self.info_section_lv1("SECTION: template")
+            if template is not None and not (template_file is None and template == self.ws.name):
+                self._copy_template_sheet(template, template_file)
+                self.logger.info(f"Template sheet **{template}** copied into sheet <{self.ws.name}>")
+
+            io = FramexlWriter(frame=content, cell=cell, index=index, header=header, debug=self.debug, debug_file=self.debug_file)
+            template_shape = template_region_shape(self.ws, io.start_cell)
+            self.logger.info(f"Template region shape is **{template_shape}**, stretching to **{(io.tr, io.tc)}**")
+            stretch_template_region(
+                self.ws,
+                io.start_cell,
+                template_shape=template_shape,
+                target_shape=(io.tr, io.tc),
+                header_rows=io.header_row_count,
+                index_columns=io.index_column_count if index else 0
+            )
+            self.ws.range(io.start_cell).value = io.content
+            self.io = io
+            self.next_cell_down = CellPro(io.bottom_left_cell).offset(1, 0)
+            self.next_cell_right = CellPro(io.top_right_cell).offset(0, 1)
+            self.wb.save()
+
+            export_notice_name = self.wb.name
+            export_notice_name = export_notice_name.replace('.xlsx', '')[0:35] + ' (...) .xlsx' if len(
+                export_notice_name) > 36 else export_notice_name
+            print(
+                f"Frame with size <<{content.shape}>> successfully exported to <<{export_notice_name}>>, worksheet <<{self.ws.name}>> at cell {cell} with template")
+            return
+
         # Declare IO Object
         ################################
         self.info_section_lv1("SECTION: content (i.e. IO object) declaration")
@@ -465,6 +668,14 @@ class PutxlSet:
             io = FramexlWriter(frame=content, cell=cell, index=index, header=header, debug=self.debug, debug_file=self.debug_file)
             self.logger.info(
                 f"Passed <Frame>: exporting to sheet <{self.ws.name}> [content] frame with size of **{str(content.shape)}** into **{io.start_cell}** plus any other format settings ... ")
+
+            # Number formats go in before the values so Excel never re-parses codes/dates on write
+            if auto_number_format:
+                self.info_section_lv1("SECTION: auto_number_format")
+                for number_range, number_format in io.range_auto_number_formats().items():
+                    self.logger.info(f"Setting number format **{number_format}** on **{number_range}**")
+                    RangeOperator(self.ws.range(number_range)).format(number_format=number_format, debug=debug)
+
             self.ws.range(io.start_cell).value = io.content
             self.io = io
             self.next_cell_down = CellPro(io.bottom_left_cell).offset(1, 0)
@@ -486,8 +697,10 @@ class PutxlSet:
                 'left': self.io.range_left_empty_checker,
                 'right': self.io.range_right_empty_checker
             }
+            # One read of the used range answers all four neighbour checks
+            probe = UsedRangeProbe(self.ws)
             for direction in list(match_dict.keys()):
-                if is_range_filled(self.ws, match_dict[direction]):
+                if probe.is_filled(match_dict[direction]):
                     RangeOperator(self.ws.range(self.io.range_all)).format(border=[direction, 'thicker', '#FF0000'], debug=debug)
 
         if tab_color:
@@ -576,9 +789,9 @@ class PutxlSet:
             data_range = io.range_data
             if data_range != 'N/A':
                 for row in self.ws.range(data_range).rows:
-                    for cell in row:
-                        if cell.value == 0:
-                            cell.value = None
+                    for data_cell in row:
+                        if data_cell.value == 0:
+                            data_cell.value = None
 
             # 0a. 自动调整 index 列宽
             self.logger.info("Auto-adjusting index column widths...")
@@ -590,22 +803,16 @@ class PutxlSet:
                     self.logger.warning(f"Failed to autofit index columns: {e}")
 
             # 1. MultiIndex columns header 自动合并
+            # Groups come from the column labels (blank labels are never merged), no cell reads needed
             if isinstance(io.columns, pd.MultiIndex):
                 self.logger.info("MultiIndex columns detected, merging header cells...")
-                merge_dict = io.range_multiindex_header_merge()
-                for level, ranges in merge_dict.items():
-                    for range_cell in ranges:
-                        try:
-                            self.logger.info(f"Merging {level}: {range_cell}")
-                            # 先填充单元格内容，确保不为空
-                            cell_range = self.ws.range(range_cell)
-                            if cell_range.value is None or (isinstance(cell_range.value, list) and all(v is None or v == '' for row in cell_range.value for v in (row if isinstance(row, list) else [row]))):
-                                # 如果单元格为空，跳过合并
-                                continue
-                            RangeOperator(cell_range).format(merge=True, wrap=True, align='center', debug=debug)
-                        except Exception as e:
-                            self.logger.warning(f"Failed to merge {level}: {range_cell}, Error: {e}")
-                            # 继续处理下一个范围
+                header_groups = io.range_header_groups()
+                self.logger.info(f"Merging **{len(header_groups)}** header groups: {header_groups}")
+                for areas in combine_areas(header_groups):
+                    try:
+                        RangeOperator(self.ws.range(areas)).format(merge=True, wrap=True, align='center', debug=debug)
+                    except Exception as e:
+                        self.logger.warning(f"Failed to merge header groups {areas}, Error: {e}")
 
             # 1a. MultiIndex index 自动合并（除最后一级）
             if index_auto_merge and isinstance(io.rawdata.index, pd.MultiIndex) and len(io.rawdata.index.names) > 1:
@@ -719,9 +926,12 @@ class PutxlSet:
             self.info_section_lv1("SECTION: index_merge")
             self.logger.info(f"[index_merge] is taking the value of **{index_merge}**")
             self.logger.info(f"Parsing into ...")
-            for key, local_range in io.range_index_merge_inputs(**index_merge).items():
-                self.logger.info(f"key: {key}, local_range: {local_range}")
-                RangeOperator(self.ws.range(local_range)).format(merge=True, wrap=True, debug=debug)
+            # All merge rectangles planned at once (single-row runs skipped), merged in 255-char multi-area batches
+            merge_plan = io.range_index_merge_plan(**index_merge)
+            self.logger.info(f"**{len(merge_plan)}** merge regions planned")
+            for areas in combine_areas(merge_plan):
+                self.logger.info(f"Merging: {areas}")
+                RangeOperator(self.ws.range(areas)).format(merge=True, wrap=True, debug=debug)
 
         if header_wrap:
             RangeOperator(self.ws.range(io.range_header)).format(wrap=True, debug=debug)
@@ -811,22 +1021,24 @@ class PutxlSet:
                             self.logger.info(f"\t\t[range_cells] is dict type, looping through items to apply [format_kwargs] **{format_kwargs}**")
                             for range_key, range_content in range_cells.items():
                                 RangeOperator(self.ws.range(range_content)).format(**format_kwargs, debug=debug)
+                        elif isinstance(range_cells, list):
+                            self.logger.info(f"\t\t[range_cells] is list type, **{len(range_cells)}** regions formatted in multi-area batches")
+                            for areas in combine_areas(range_cells):
+                                RangeOperator(self.ws.range(areas)).format(**format_kwargs, debug=debug)
                         elif isinstance(range_cells, str) and range_cells != '' and range_cells != 'N/A':
                             self.logger.info(f"\t\t[range_cells] is str type, apply [format_kwargs] **{format_kwargs}**")
                             if additional_header_rule is not None:
                                 if additional_header_rule == 'merge_up':
-                                    range_cell_list = [item.strip() for item in range_cells.split(',')]
-                                    for each_cell in range_cell_list:
-                                        updated_range_cell = CellPro(each_cell).offset(-1, 0).resize_h(2).cell
-                                        self.logger.info(f"\t\t[merge_up] is detected, this is for header style, starting_cell is **{each_cell}** and the updated range is **{updated_range_cell}**")
-                                        RangeOperator(self.ws.range(updated_range_cell)).format(**format_kwargs, debug=debug)
-                                        RangeOperator(self.ws.range(updated_range_cell)).format(**format_kwargs)
+                                    # Each header cell stacked with the cell above, all regions in 1 call per 255-char multi-area address
+                                    stacked_regions = io.range_header_stack(range_cells)
+                                    self.logger.info(f"\t\t[merge_up] is detected, this is for header style, **{len(stacked_regions)}** stacked regions from **{range_cells}**")
+                                    for areas in combine_areas(stacked_regions):
+                                        RangeOperator(self.ws.range(areas)).format(**format_kwargs, debug=debug)
                                 elif additional_header_rule == 'merge_add_top':
                                     updated_range_cells = CellPro(range_cells).offset(-1, 0).cell
                                     self.logger.info(f"\t\t[merge_add_top] is detected, this is for header style, the updated range is **{updated_range_cells}**")
                                     self.ws.range(updated_range_cells).value = merge_add_top_title
                                     RangeOperator(self.ws.range(updated_range_cells)).format(**format_kwargs, debug=debug)
-                                    RangeOperator(self.ws.range(updated_range_cells)).format(**format_kwargs)
                             else:
                                 RangeOperator(self.ws.range(range_cells)).format(**format_kwargs, debug=debug)
                         elif range_cells == '' or range_cells == 'N/A':
@@ -893,11 +1105,12 @@ class PutxlSet:
                 if match:
                     index_name = match.group(1)
                     columns = match.group(2) if match.group(2) != '' else 'None'
-                    content_border = style_sheets['index_merge']['border=outer_thick']
+                    # Fill the placeholders in a copy, the shared template stays intact for the next export
+                    apply_style = copy.deepcopy(style_sheets['index_merge'])
+                    content_border = apply_style['border=outer_thick']
                     content_border[1] = content_border[1].replace('__index__', index_name)
-                    style_sheets['index_merge']['merge'] = style_sheets['index_merge']['merge'].replace(
+                    apply_style['merge'] = apply_style['merge'].replace(
                         '__index__', index_name).replace('__columns__', columns)
-                    apply_style = style_sheets['index_merge']
                     self.logger.info("[apply_style] is the var passed to apply_df_format method")
                     self.logger.info(f"As index_merge <is> detected, [apply_style] is taking value **{apply_style}**")
                 else:
@@ -1244,6 +1457,275 @@ class PutxlSet:
             print(f"Frame with size <<{content.shape}>> successfully exported to <<{export_notice_name}>>, worksheet <<{self.ws.name}>> at cell {cell}")
         # for else, an error should already been thrown in the previous content/io declaration stage
 
+    def putxl_split(
+            self,
+            content,
+            sheet_name: str = None,
+            cell: str = 'A1',
+            index: bool = True,
+            header: bool = True,
+            max_rows: int = None,
+            **kwargs
+    ) -> list:
+        """
+        Exports a frame that may exceed the Excel row limit over consecutive sheets.
+
+        The row limit is checked up front and the frame is cut into row slices which are written one at a time
+        with putxl (so memory stays bounded by one sheet), each sheet repeating the header and getting the same
+        format arguments. Column widths of the first sheet are copied to the following sheets.
+        A plain export never builds the per-cell address map of a part (FramexlWriter.dfmap), only format rules that
+        select cells by value (cd_format, cd_style) do, once per sheet.
+
+        Parameters
+        ----------
+        content : DataFrame
+            The frame to export.
+        sheet_name : str, optional
+            Name of the first sheet, following sheets are named 'name (2)', 'name (3)', ... Defaults to the current sheet.
+        cell : str, default 'A1'
+            Anchor cell used on every sheet.
+        index, header : bool
+            Same as putxl.
+        max_rows : int, optional
+            Last usable row per sheet, defaults to (and is capped at) the Excel limit of 1,048,576.
+        **kwargs
+            Any other putxl argument (design, style, df_format, auto_format ...), applied to every sheet.
+
+        Returns
+        -------
+        list
+            The names of the sheets written.
+
+        Examples
+        --------
+        >>> ps = PutxlSet('big.xlsx')
+        >>> ps.putxl_split(big_df, sheet_name='Data', index=False, auto_format=False)
+        """
+        if hasattr(content, 'df'):
+            content = content.df
+        if not isinstance(content, pandas.DataFrame):
+            raise ValueError('putxl_split only takes dataframe-like objects as content')
+
+        header_rows = content.columns.nlevels if header else 0
+        rows_per_sheet = split_rows_per_sheet(cell, header_rows=header_rows, max_rows=max_rows)
+        parts = max(-(-len(content) // rows_per_sheet), 1)
+        base_name = sheet_name if sheet_name else self.ws.name
+
+        sheet_names = []
+        first_widths = None
+        for part in range(parts):
+            suffix = '' if part == 0 else f' ({part + 1})'
+            part_name = base_name[:31 - len(suffix)] + suffix
+            chunk = content.iloc[part * rows_per_sheet:(part + 1) * rows_per_sheet]
+            self.putxl(chunk, sheet_name=part_name, cell=cell, index=index, header=header, **kwargs)
+
+            # Keep column widths consistent with the first sheet
+            width_range = self.ws.range(CellPro(cell).resize(1, self.io.tc).cell)
+            if first_widths is None:
+                first_widths = [column.column_width for column in width_range.columns]
+            else:
+                for column, width in zip(width_range.columns, first_widths):
+                    column.column_width = width
+
+            sheet_names.append(part_name)
+            del chunk
+
+        print(f"Frame with size <<{content.shape}>> split over {parts} sheet(s): {sheet_names}")
+        return sheet_names
+
+    def putimg(
+            self,
+            images: list,
+            sheet_name: str = None,
+            img_left: float = 0,
+            img_top: float = 0,
+            cache_dir: str = None,
+            save: bool = True,
+    ) -> int:
+        """
+        Places a batch of pictures in one go, the batch version of putxl(path, mode='img').
+
+        Each picture is pre-resized into a disk cache keyed by (path, mtime, size), see cached_resized_image,
+        the anchor offsets are read once per distinct row/column instead of twice per picture,
+        and the workbook is saved once at the end with screen updating paused in between.
+
+        Parameters
+        ----------
+        images : list
+            Tuples of (path, cell) or (path, cell, size), size is (width, height) in points, either side may be None.
+        sheet_name : str, optional
+            Sheet to place the pictures on, created if missing. Defaults to the current sheet.
+        img_left, img_top : float
+            Offset of every picture from the top-left corner of its anchor cell, in points.
+        cache_dir : str, optional
+            Folder of resized copies, defaults to a pandaspro folder in the temp directory.
+        save : bool
+            Save the workbook after placing the pictures.
+
+        Returns
+        -------
+        int
+            The number of pictures placed.
+
+        Examples
+        --------
+        >>> ps.putimg([(f'photos/{upi}.jpg', f'B{i + 2}', (60, 80)) for i, upi in enumerate(staff['upi'])], sheet_name='Staff')
+        """
+        parsed = []
+        for item in images:
+            path, cell, size = item if len(item) == 3 else (*item, None)
+            parsed.append((path, cell, size))
+        missing = [path for path, _, _ in parsed if not os.path.exists(path)]
+        if missing:
+            raise ValueError(f'Image file(s) not found: {missing}')
+
+        if sheet_name is not None and sheet_name != self.ws.name:
+            self.tab(sheet_name)
+
+        lefts, tops = {}, {}
+        app = self.wb.app
+        screen_updating = app.screen_updating
+        app.screen_updating = False
+        try:
+            for path, cell, size in parsed:
+                row, col = cell_index(cell.split(':')[0])
+                if col not in lefts:
+                    lefts[col] = self.ws.range(index_cell(1, col)).left
+                if row not in tops:
+                    tops[row] = self.ws.range(index_cell(row, 1)).top
+                width, height = size if size is not None else (None, None)
+                self.ws.pictures.add(
+                    cached_resized_image(path, size, cache_dir),
+                    left=lefts[col] + img_left,
+                    top=tops[row] + img_top,
+                    width=width,
+                    height=height
+                )
+        finally:
+            app.screen_updating = screen_updating
+
+        if save:
+            self.wb.save()
+        print(f"{len(parsed)} image(s) successfully exported to worksheet <<{self.ws.name}>>")
+        return len(parsed)
+
+    def toc(
+            self,
+            sheet_name: str = 'Contents',
+            cell: str = 'A1',
+            targets: list | dict = None,
+            title: str = 'Contents',
+            goto_cell: str = 'A1',
+            font_color: str = 'blue',
+            underline: bool = True,
+            auto_update: bool = False,
+            save: bool = True,
+    ) -> dict:
+        """
+        Writes a table of contents: one HYPERLINK formula per target sheet, all in a single block.
+
+        The sheet list is read once and every target is validated against it before anything is written,
+        the links go in with one 2-D value write and the block is formatted with one call.
+
+        Parameters
+        ----------
+        sheet_name : str
+            Sheet holding the contents, created if missing. It never links to itself.
+        cell : str
+            Top-left cell of the block, the title goes here and the links below it.
+        targets : list or dict, optional
+            Sheets to link to, a dict maps sheet name -> display text. Defaults to every other sheet in workbook order.
+        title : str, optional
+            Text above the links, None for no title row.
+        goto_cell : str
+            Cell the links jump to in each target sheet.
+        font_color, underline
+            Format of the link cells.
+        auto_update : bool
+            Rebuild the contents whenever putxl or tab adds a sheet to this workbook (only when targets is None).
+        save : bool
+            Save the workbook after writing.
+
+        Returns
+        -------
+        dict
+            {sheet name: display text} of the written links.
+
+        Examples
+        --------
+        >>> ps.toc()
+        >>> ps.toc('Index', cell='B2', targets={'Staff': 'Staff list', 'Grades': 'Grade distribution'})
+        """
+        self._clear_toc(moving_to=sheet_name)
+        sheet_names = [sheet.name for sheet in self.wb.sheets]
+        if targets is None:
+            links = {name: name for name in sheet_names if name != sheet_name}
+        elif isinstance(targets, dict):
+            links = dict(targets)
+        else:
+            links = {name: name for name in targets}
+
+        missing = [name for name in links if name not in sheet_names]
+        if missing:
+            raise ValueError(f'Go-to sheet(s) {missing} do not exist. Please create first.')
+
+        created = sheet_name not in sheet_names
+        if created:
+            toc_sheet = self.wb.sheets.add(before=self.wb.sheets[0])
+            toc_sheet.name = sheet_name
+        else:
+            toc_sheet = self.wb.sheets[sheet_name]
+        if not created and self.toc_settings and self.toc_settings['sheet_name'] == sheet_name:
+            created = self.toc_settings['created']
+
+        # Sheet names double their single quotes inside the '...'! reference, texts double their double quotes
+        rows = [[title]] if title is not None else []
+        for name, text in links.items():
+            reference = "#'" + name.replace("'", "''") + "'!" + goto_cell
+            rows.append([f'=HYPERLINK("{reference}", "{str(text).replace(chr(34), chr(34) * 2)}")'])
+
+        block = CellPro(cell).resize(len(rows), 1).cell if rows else None
+        if rows:
+            toc_sheet.range(cell).value = rows
+            link_start = CellPro(cell).offset(1, 0) if title is not None else CellPro(cell)
+            if links:
+                link_range = link_start.resize(len(links), 1).cell
+                RangeOperator(toc_sheet.range(link_range)).format(font_color=font_color, underline=underline)
+            if title is not None:
+                RangeOperator(toc_sheet.range(cell)).format(bold=True)
+
+        self.toc_settings = {
+            'sheet_name': sheet_name, 'cell': cell, 'targets': targets, 'title': title, 'goto_cell': goto_cell,
+            'font_color': font_color, 'underline': underline, 'auto_update': auto_update, 'range': block,
+            'created': created,
+        }
+
+        if save:
+            self.wb.save()
+        print(f"Contents with {len(links)} link(s) written to worksheet <<{sheet_name}>> at cell {cell}")
+        return links
+
+    def _clear_toc(self, moving_to: str = None) -> None:
+        # Removes the previous contents block (values and link / title formats) before a new one is written;
+        # a contents sheet toc created itself is deleted when the contents move to another sheet
+        settings = self.toc_settings
+        if not settings or not settings['range']:
+            return
+        if settings['sheet_name'] not in [sheet.name for sheet in self.wb.sheets]:
+            return
+        old_sheet = self.wb.sheets[settings['sheet_name']]
+        if (moving_to != settings['sheet_name'] and settings['created'] and self.wb.sheets.count > 1
+                and self.ws.name != old_sheet.name):
+            old_sheet.delete()
+        else:
+            old_sheet.range(settings['range']).clear()
+
+    def _sheet_added(self, sheet_name: str) -> None:
+        # Rebuilds an auto-updating contents sheet, the workbook is saved by the calling putxl
+        settings = self.toc_settings
+        if settings and settings['auto_update'] and settings['targets'] is None and sheet_name != settings['sheet_name']:
+            self.toc(**{k: v for k, v in settings.items() if k not in ('range', 'created')}, save=False)
+
     def tab(self, sheet_name: str, sheetreplace: bool = False, tab_color: str = None) -> None:
         """
         Switches to a specified sheet in the workbook.
@@ -1264,6 +1746,7 @@ class PutxlSet:
         else:
             sheet = self.wb.sheets.add(after=self.wb.sheets.count)
             sheet.name = sheet_name
+            self._sheet_added(sheet_name)
         self.ws = sheet
 
         # If sheetreplace is specified, then delete the old sheet and create a new one
@@ -2,6 +2,8 @@ import xlwings as xw
 import re
 import platform
 
+from pandaspro.utils.export_report import InstrumentedProxy, current_report, record_format
+
 # noinspection PyUnresolvedReferences
 _alignment_map = {
     'hcenter': ['h', xw.constants.HAlign.xlHAlignCenter],
@@ -219,6 +221,10 @@ class RangeOperator:
             split: str = None,
             split_picks: str | list = None,
     ):
+        # Profiled exports (putxl(profile=True)) count every Excel call made through this range
+        report = current_report()
+        if report is not None and not isinstance(xwrange, InstrumentedProxy):
+            xwrange = InstrumentedProxy(xwrange, report, 'range')
         self.xwrange = xwrange
         self.get_characters = get_characters
         self.split_picks = split_picks
@@ -284,6 +290,7 @@ class RangeOperator:
             ungroup: bool = None,
             debug: bool = None
     ) -> None:
+        record_format(self.xwrange)
 
         if appendix:
             print(
@@ -1,29 +1,211 @@
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from pandaspro.io.excel.putexcel import PutxlSet
+from pandaspro.io.excel.async_writer import AsyncPutxlSet
 from datetime import datetime
 
+# The workbook excel_e writes to: local to the current thread / asyncio task, so parallel report jobs don't collide
+_declared_wb = ContextVar('pandaspro_declared_wb', default=None)
+
+# Who declares: the whole process outside any workbook_scope, one token per scope inside
+_PROCESS_OWNER = object()
+_owner = ContextVar('pandaspro_workbook_owner', default=_PROCESS_OWNER)
+
+# Open export targets of this process: absolute path -> (owner, PutxlSet / AsyncPutxlSet)
+_open_targets = {}
+_open_targets_lock = threading.Lock()
+_RESERVED = object()  # placeholder while a workbook is being opened
+
+
+def _target_key(file: str) -> str:
+    return os.path.normcase(os.path.abspath(file))
+
 
 class WorkbookExportSimplifier:
+    # Process-wide fallback for code that never entered a workbook_scope (plain scripts, notebooks)
     last_declared_wb = None
 
+    @classmethod
+    def _open_target(
+            cls,
+            file: str,
+            sheet_name: str = 'Sheet1',
+            alwaysreplace: str = None,
+            noisily: bool = None,
+            template: str = None,
+            asynchronous: bool = False
+    ):
+        key = _target_key(file)
+        owner = _owner.get()
+        with _open_targets_lock:
+            current_owner, _ = _open_targets.get(key, (None, None))
+            # Re-declaring a file of the own context is fine, taking over another job's open workbook is not:
+            # PutxlSet saves and closes an already open workbook before reopening it
+            if current_owner is not None and current_owner is not owner:
+                raise ValueError(f"Workbook {file} is already open as the export target of another job")
+            _open_targets[key] = (owner, _RESERVED)
+
+        try:
+            workbook_class = AsyncPutxlSet if asynchronous else PutxlSet
+            setworkbook = workbook_class(
+                workbook=file,
+                sheet_name=sheet_name,
+                alwaysreplace=alwaysreplace,
+                noisily=noisily,
+                template=template
+            )
+        except Exception:
+            with _open_targets_lock:
+                if _open_targets.get(key) == (owner, _RESERVED):
+                    _open_targets.pop(key, None)
+            raise
+
+        with _open_targets_lock:
+            _open_targets[key] = (owner, setworkbook)
+        return setworkbook
+
+    @staticmethod
+    def _release_replaced(previous, setworkbook) -> None:
+        # The target a declare replaces is no longer this context's to guard (the workbook itself stays open)
+        if previous is None or previous is setworkbook:
+            return
+        key = _target_key(previous.workbook)
+        with _open_targets_lock:
+            if _open_targets.get(key) == (_owner.get(), previous):
+                _open_targets.pop(key)
+
     @classmethod
     def declare_workbook(
             cls,
             file: str = f'sw_Export_Default_Template_{datetime.now().strftime("%b %d, %Y")}.xlsx',
             sheet_name: str = 'Sheet1',
             alwaysreplace: str = None,
-            noisily: bool = None
+            noisily: bool = None,
+            template: str = None,
+            asynchronous: bool = False
     ):
-        setworkbook = PutxlSet(
-            workbook=file,
+        # asynchronous: excel_e only queues the write to a writer thread, see AsyncPutxlSet
+        # call get_last_declared_workbook().wait() / .close() to flush
+        previous = _declared_wb.get() or cls.last_declared_wb
+        setworkbook = cls._open_target(
+            file,
             sheet_name=sheet_name,
             alwaysreplace=alwaysreplace,
-            noisily=noisily
+            noisily=noisily,
+            template=template,
+            asynchronous=asynchronous
         )
+        cls._release_replaced(previous, setworkbook)
+        _declared_wb.set(setworkbook)
         cls.last_declared_wb = setworkbook
         print(f"Declared workbook: {setworkbook.workbook}")
 
+    @classmethod
+    @contextmanager
+    def workbook_scope(
+            cls,
+            file,
+            sheet_name: str = 'Sheet1',
+            alwaysreplace: str = None,
+            noisily: bool = None,
+            template: str = None,
+            asynchronous: bool = False,
+            close: bool = False
+    ):
+        """
+        Declares a workbook for the current thread / asyncio task only, for the duration of the with block.
+
+        Inside the block excel_e writes to this workbook, other jobs running at the same time keep their own target.
+        The process-wide declared workbook is left untouched.
+
+        Parameters
+        ----------
+        file : str or PutxlSet
+            Path of the workbook, or an already opened PutxlSet / AsyncPutxlSet to scope.
+        close : bool
+            Close the workbook when leaving the block (waits for queued writes of an AsyncPutxlSet).
+
+        Examples
+        --------
+        >>> def build(region):
+        ...     with WorkbookExportSimplifier.workbook_scope(f'{region}.xlsx', close=True):
+        ...         staff.inlist('region', region).tab('grade').excel_e(sheet_name='Grades')
+        >>> ThreadPoolExecutor(4).map(build, regions)
+        """
+        outer_owner = _owner.get()
+        owner_token = _owner.set(object())
+        previous_entry = None
+        try:
+            if isinstance(file, (PutxlSet, AsyncPutxlSet)):
+                setworkbook = file
+                key = _target_key(setworkbook.workbook)
+                with _open_targets_lock:
+                    previous_entry = _open_targets.get(key)
+                    # the context entering the scope may lend its own workbook, another job's stays untouched
+                    if previous_entry is not None and previous_entry[0] is not outer_owner:
+                        raise ValueError(f"Workbook {setworkbook.workbook} is already open as the export target of another job")
+                    _open_targets[key] = (_owner.get(), setworkbook)
+            else:
+                setworkbook = cls._open_target(
+                    file,
+                    sheet_name=sheet_name,
+                    alwaysreplace=alwaysreplace,
+                    noisily=noisily,
+                    template=template,
+                    asynchronous=asynchronous
+                )
+        except Exception:
+            _owner.reset(owner_token)
+            raise
+
+        scope_entry = (_owner.get(), setworkbook)
+        token = _declared_wb.set(setworkbook)
+        try:
+            yield setworkbook
+        finally:
+            _declared_wb.reset(token)
+            _owner.reset(owner_token)
+            try:
+                if close:
+                    setworkbook.close()
+            finally:
+                # Give the target back whether closed or not: nobody holds the scope's owner token any more
+                key = _target_key(setworkbook.workbook)
+                with _open_targets_lock:
+                    if _open_targets.get(key) == scope_entry:
+                        if previous_entry is not None and not close:
+                            _open_targets[key] = previous_entry
+                        else:
+                            _open_targets.pop(key)
+                if close and cls.last_declared_wb is setworkbook:
+                    cls.last_declared_wb = None
+
     @classmethod
     def get_last_declared_workbook(cls):
-        if cls.last_declared_wb is None:
+        setworkbook = _declared_wb.get()
+        if setworkbook is None:
+            setworkbook = cls.last_declared_wb
+        if setworkbook is None:
             raise ValueError("No workbook has been declared.")
-        return cls.last_declared_wb
\ No newline at end of file
+        return setworkbook
+
+    @staticmethod
+    def open_targets() -> dict:
+        """
+        Returns a snapshot of the open export targets of this process: {absolute path: PutxlSet}.
+        """
+        with _open_targets_lock:
+            return {k: wb for k, (_, wb) in _open_targets.items() if wb is not _RESERVED}
+
+    @classmethod
+    def release(cls, file: str) -> None:
+        """
+        Removes a workbook from the open targets (does not close it), so another job may declare it again.
+        """
+        with _open_targets_lock:
+            _, setworkbook = _open_targets.pop(_target_key(file), (None, None))
+        if setworkbook is not None and cls.last_declared_wb is setworkbook:
+            cls.last_declared_wb = None
@@ -1,11 +1,86 @@
 from pandaspro.core.stringfunc import parse_wild
 from pandaspro.io.excel.cdformat import CdFormat
 from pandaspro.core.tools.utils import df_with_index_for_mask
+from pandaspro.core.tools.subtotals import get_subtotal_marks
 from pandaspro.io.cellpro.cellpro import CellPro, index_cell, is_cellpro_valid
+import numpy as np
 import pandas as pd
+from openpyxl.utils import get_column_letter
 
 from pandaspro.utils.cpd_logger import cpdLogger
 
+# Hard sheet limits of the xlsx format
+EXCEL_MAX_ROWS = 1048576
+EXCEL_MAX_COLUMNS = 16384
+
+
+def check_sheet_limits(cell: str, rows: int, columns: int) -> None:
+    """
+    Raises a ValueError if a block of rows x columns anchored at cell would not fit in one worksheet.
+    Meant to be called before any data is written, so oversized frames fail fast instead of deep inside the COM write.
+    """
+    start_row, start_col = CellPro(cell).cell_index
+    last_row, last_col = start_row + rows - 1, start_col + columns - 1
+    if last_row > EXCEL_MAX_ROWS:
+        raise ValueError(
+            f'Export from {cell} would end at row {last_row}, beyond the Excel limit of {EXCEL_MAX_ROWS} rows. '
+            f'Use PutxlSet.putxl_split to spread the frame over several sheets.')
+    if last_col > EXCEL_MAX_COLUMNS:
+        raise ValueError(f'Export from {cell} would end at column {last_col}, beyond the Excel limit of {EXCEL_MAX_COLUMNS} columns.')
+
+
+def split_rows_per_sheet(cell: str, header_rows: int = 1, max_rows: int = None) -> int:
+    """
+    Returns how many data rows fit in one sheet when the table starts at cell and repeats header_rows on each sheet.
+    """
+    max_rows = EXCEL_MAX_ROWS if max_rows is None else min(max_rows, EXCEL_MAX_ROWS)
+    capacity = max_rows - CellPro(cell).cell_index[0] + 1 - header_rows
+    if capacity <= 0:
+        raise ValueError(f'No data row fits below the header when starting at {cell} with a limit of {max_rows} rows')
+    return capacity
+
+
+def infer_number_format(series: pd.Series, name=None) -> str | None:
+    """
+    Derives an Excel number format from the dtype and value range of a column.
+
+    - datetimes: yyyy-mm-dd (plus hh:mm if any value carries a time)
+    - integers (incl. nullable Int) and whole-number floats: #,##0
+    - floats named like a percentage (percent/pct/share/%) within [0, 1], e.g. tab(..., d='export'): 0.0%
+    - other floats: #,##0.00
+    - categoricals: derived from the categories, text categories get @ so codes like 001 stay text
+    - text, booleans and mixed objects: None (left as General)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        if pd.api.types.is_string_dtype(categories) or pd.api.types.is_object_dtype(categories):
+            return '@'
+        return infer_number_format(pd.Series(categories), name)
+
+    if pd.api.types.is_bool_dtype(series):
+        return None
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.dropna()
+        if len(values) and (values.dt.normalize() != values).any():
+            return 'yyyy-mm-dd hh:mm'
+        return 'yyyy-mm-dd'
+
+    if pd.api.types.is_integer_dtype(series):
+        return '#,##0'
+
+    if pd.api.types.is_float_dtype(series):
+        values = series.dropna()
+        label = '__'.join(str(x) for x in name).lower() if isinstance(name, tuple) else str(name).lower()
+        is_percent_name = any(token in label for token in ['percent', 'pct', 'share', '%'])
+        if is_percent_name and len(values) and values.min() >= 0 and values.max() <= 1:
+            return '0.0%'
+        if len(values) and (values == values.round()).all():
+            return '#,##0'
+        return '#,##0.00'
+
+    return None
+
 
 class CellxlWriter:
     def __init__(
@@ -102,14 +177,14 @@ class FramexlWriter:
             range_indexnames = 'N/A'
             range_header = cellobj.resize(header_row_count, tc)
 
-        # Calculate the Map
-        dfmapstart = cellobj.offset(xl_header_count, 0)
-        dfmap = df_with_index_for_mask(self.rawdata, force=index).copy()
-        dfmap = dfmap.astype(str)
+        # Check the sheet limits before any heavy work
+        check_sheet_limits(cell, tr, tc)
 
-        for dfmap_index in range(len(dfmap)):
-            for j, col in enumerate(dfmap.columns):
-                dfmap.iloc[dfmap_index, j] = dfmapstart.offset(dfmap_index, j).cell
+        # The Map (cell address of every value) is only built when a format rule asks for it, see dfmap
+        mask_frame = df_with_index_for_mask(self.rawdata, force=index)
+        self._dfmap_layout = (cellobj.offset(xl_header_count, 0).cell_index, mask_frame.index, mask_frame.columns)
+        self._dfmap = None
+        del mask_frame
 
         self.iotype = 'df'
         self.columns_with_indexnames = self.rawdata.reset_index().columns
@@ -127,6 +202,8 @@ class FramexlWriter:
 
         # data corners - cellpros
         self.inner_start_cellobj = cellobj.offset(xl_header_count, xl_index_count)
+        # Subtotal / total lines recorded by the generator of the frame, None for plain frames
+        self.subtotal_marks = get_subtotal_marks(self.rawdata)
         self.inner_start_cell = self.inner_start_cellobj.cell
         self.top_right_cell = cellobj.offset(0, self.tc - 1).cell
         self.bottom_left_cell = cellobj.offset(self.tr - 1, 0).cell
@@ -142,7 +219,6 @@ class FramexlWriter:
         self.range_indexnames = range_indexnames.cell if range_indexnames != 'N/A' else 'N/A'
 
         # format relevant
-        self.dfmap = dfmap
         self.cols_index_merge = None
 
         # Conditional Formatting
@@ -165,6 +241,95 @@ class FramexlWriter:
         self.logger = None
         self.debug_section_spec_start = None
 
+    @property
+    def dfmap(self):
+        """
+        Frame shaped like the exported data (index included when exported) holding the cell address of every value.
+        Built on first use, with whole-array string operations: a plain value export never pays for it.
+        """
+        if self._dfmap is None:
+            (start_row, start_col), map_index, map_columns = self._dfmap_layout
+            letters = np.array([get_column_letter(start_col + j) for j in range(len(map_columns))], dtype=object)
+            rows = np.arange(start_row, start_row + len(map_index)).astype(str).astype(object)
+            self._dfmap = pd.DataFrame(letters[None, :] + rows[:, None], index=map_index, columns=map_columns)
+        return self._dfmap
+
+    def range_auto_number_formats(self) -> dict:
+        """
+        Derives one number format per exported column (index levels included) with infer_number_format.
+        Neighbouring columns sharing the same format are combined, so the result holds 1 range per run of columns:
+        {'B2:C20': '#,##0', 'D2:D20': '0.0%'}. Columns left as General are not listed.
+        """
+        if self.data_height <= 0:
+            return {}
+
+        formats = []
+        if self.index_bool:
+            index_frame = self.rawdata.index.to_frame(index=False)
+            for i in range(index_frame.shape[1]):
+                formats.append(infer_number_format(index_frame.iloc[:, i], index_frame.columns[i]))
+        for j in range(self.rawdata.shape[1]):
+            formats.append(infer_number_format(self.rawdata.iloc[:, j], self.rawdata.columns[j]))
+
+        result = {}
+        first_data_cell = CellPro(self.start_cell).offset(self.header_row_count, 0)
+        run_start = 0
+        for position in range(1, len(formats) + 1):
+            if position == len(formats) or formats[position] != formats[run_start]:
+                if formats[run_start] is not None:
+                    run_range = first_data_cell.offset(0, run_start).resize(self.data_height, position - run_start).cell
+                    result[run_range] = formats[run_start]
+                run_start = position
+
+        return result
+
+    def range_header_groups(self) -> list:
+        """
+        All merged header regions, computed in one pass over the columns.
+
+        For each header level, consecutive columns sharing the same labels up to that level form one group
+        (so 'x' under 'A' and 'x' under 'B' stay apart). A group whose labels below are all blank is stacked down
+        over those rows. Only regions spanning more than one cell are returned, e.g. for columns
+        [('Staff', 'GA'), ('Staff', 'GB'), ('Total', '')] at A1: ['A1:B1', 'C1:C2'].
+        """
+        if self.header_row_count == 0 or len(self.columns) == 0:
+            return []
+
+        def _blank(label):
+            return label is None or (isinstance(label, float) and label != label) or str(label).strip() == ''
+
+        columns = list(self.columns) if isinstance(self.columns, pd.MultiIndex) else [(c,) for c in self.columns]
+        levels = self.header_row_count
+        origin = CellPro(self.start_cell).offset(0, self.index_column_count if self.index_bool else 0)
+
+        regions = []
+        for level in range(levels):
+            start = 0
+            for i in range(1, len(columns) + 1):
+                if i < len(columns) and columns[i][:level + 1] == columns[start][:level + 1]:
+                    continue
+                if not _blank(columns[start][level]):
+                    height = 1
+                    while level + height < levels and all(_blank(columns[k][level + height]) for k in range(start, i)):
+                        height += 1
+                    if i - start > 1 or height > 1:
+                        regions.append(origin.offset(level, start).resize(height, i - start).cell)
+                start = i
+
+        return regions
+
+    def range_header_stack(self, cells: str, rows_above: int = 1) -> list:
+        """
+        Header regions for merge_up / merge_add_top: every item of a comma separated cells string
+        (a cell or a row range) grown upwards by rows_above rows. 'C3, E3:F3' -> ['C2:C3', 'E2:F3'].
+        """
+        regions = []
+        for item in cells.split(','):
+            item = item.strip()
+            if item:
+                regions.append(CellPro(item).offset(-rows_above, 0).resize_h(rows_above + 1).cell)
+        return regions
+
     def range_multiindex_header_merge(self) -> dict:
         """
         Calculate merge ranges for MultiIndex columns header.
@@ -283,16 +448,25 @@ class FramexlWriter:
         
         return result_ranges
     
-    def range_subtotal_rows(self) -> list:
+    def range_subtotal_rows(self, kind: str = 'subtotal') -> list:
         """
         Find all Subtotal rows in the dataframe.
         Returns a list of cell ranges for each Subtotal row.
+
+        Frames built by the subtotal generators carry SubtotalMarks, whose row mask is used directly
+        (kind: 'subtotal', 'grand_total' or 'total' for both). Other frames fall back to searching the
+        index labels for 'Subtotal', which only finds kind='subtotal'.
         """
-        if not isinstance(self.rawdata.index, pd.MultiIndex):
+        if self.subtotal_marks is not None:
+            return [
+                CellPro(self.start_cell).offset(self.header_row_count + int(pos), 0).resize(1, self.tc).cell
+                for pos in self.subtotal_marks.row_positions(kind)
+            ]
+
+        if kind != 'subtotal' or not isinstance(self.rawdata.index, pd.MultiIndex):
             return []
         
         # Check all index levels for Subtotal
-        import re
         result_ranges = []
         temp = self.rawdata.reset_index()
         
@@ -314,13 +488,21 @@ class FramexlWriter:
         
         return result_ranges
     
-    def range_subtotal_columns(self) -> list:
+    def range_subtotal_columns(self, kind: str = 'subtotal') -> list:
         """
         Find all Subtotal columns in the dataframe.
         Returns a list of cell ranges for each Subtotal column.
         Only returns data area, excluding headers.
+
+        Uses the column mask of SubtotalMarks when the frame has one, see range_subtotal_rows.
         """
-        if not isinstance(self.rawdata.columns, pd.MultiIndex):
+        if self.subtotal_marks is not None:
+            return [
+                self.inner_start_cellobj.offset(0, int(pos)).resize(self.rawdata.shape[0], 1).cell
+                for pos in self.subtotal_marks.column_positions(kind)
+            ]
+
+        if kind != 'subtotal' or not isinstance(self.rawdata.columns, pd.MultiIndex):
             return []
         
         result_ranges = []
@@ -398,42 +580,69 @@ class FramexlWriter:
 
         return _count_consecutive_values(temp[level])
 
+    def _index_merge_columns(self, columns: str | list = None) -> list:
+        if not columns:
+            return []
+        # Handle MultiIndex columns
+        if isinstance(self.columns, pd.MultiIndex):
+            if isinstance(columns, list):
+                return columns
+            # Create string representation for wildcard matching
+            columns_str_list = ['__'.join(str(x) for x in col) for col in self.columns]
+            return parse_wild(columns, columns_str_list)
+        return columns if isinstance(columns, list) else parse_wild(columns, self.columns)
+
     def range_index_merge_inputs(
             self,
             level: str = None,
             columns: str | list = None
     ) -> dict:
         result_dict = {}
+        # The runs of the level are the same for the index column and every selected column
+        breaks = self._index_break(level=level)
 
         # Index Column
         merge_start_index = self.get_column_letter_by_indexname(level)
-        for localid, rowspan in enumerate(self._index_break(level=level)):
+        for localid, rowspan in enumerate(breaks):
             result_dict[f'indexlevel_{localid}_{rowspan}'] = merge_start_index.resize(rowspan, 1).cell
             merge_start_index = merge_start_index.offset(rowspan, 0)
 
         # Selected Columns
         if columns:
-            # Handle MultiIndex columns
-            if isinstance(self.columns, pd.MultiIndex):
-                if isinstance(columns, list):
-                    self.cols_index_merge = columns
-                else:
-                    # Create string representation for wildcard matching
-                    columns_str_list = ['__'.join(str(x) for x in col) for col in self.columns]
-                    matched = parse_wild(columns, columns_str_list)
-                    self.cols_index_merge = matched
-            else:
-                self.cols_index_merge = columns if isinstance(columns, list) else parse_wild(columns, self.columns)
-            # print("framewriter cols_index_merge:", self.cols_index_merge)
-            # print("columns:", columns, self.columns)
+            self.cols_index_merge = self._index_merge_columns(columns)
             for index, col in enumerate(self.cols_index_merge):
                 merge_start_each = self.get_column_letter_by_name(col)
-                for localid, rowspan in enumerate(self._index_break(level=level)):
+                for localid, rowspan in enumerate(breaks):
                     result_dict[f'col{index}_{localid}_{rowspan}'] = merge_start_each.resize(rowspan, 1).cell
                     merge_start_each = merge_start_each.offset(rowspan, 0)
 
         return result_dict
 
+    def range_index_merge_plan(
+            self,
+            level: str = None,
+            columns: str | list = None
+    ) -> list:
+        """
+        Every merge rectangle of index_merge at once: the runs of equal values in the index level, applied to the
+        level's own column and to each of columns. Runs of a single row are left out, merging one cell does nothing.
+        Pass the list through combine_areas to merge it in a handful of calls.
+        """
+        breaks = self._index_break(level=level)
+        starts = [self.get_column_letter_by_indexname(level)]
+        if columns:
+            self.cols_index_merge = self._index_merge_columns(columns)
+            starts += [self.get_column_letter_by_name(col) for col in self.cols_index_merge]
+
+        plan = []
+        for start in starts:
+            row = 0
+            for rowspan in breaks:
+                if rowspan > 1:
+                    plan.append(start.offset(row, 0).resize(rowspan, 1).cell)
+                row += rowspan
+        return plan
+
     def range_index_hsections(self, level: str = None) -> dict:
         if self.range_index is None:
             raise ValueError('index_sections method requires the input dataframe to have an index')
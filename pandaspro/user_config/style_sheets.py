@@ -48,7 +48,7 @@ style_sheets = {
         'green80; font_color=black; wrap': 'header_outer'
     },
     'index_merge': {
-        'merge': 'index_merge_inputs(level=__index__, columns=__columns__)',
+        'merge': 'index_merge_plan(level=__index__, columns=__columns__)',
         'border=outer_thick': [
             'index_levels',
             'index_hsections(level=__index__)'
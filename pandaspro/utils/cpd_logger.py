@@ -3,6 +3,8 @@ from datetime import datetime
 from functools import wraps
 import re
 
+from pandaspro.utils.export_report import mark_section
+
 
 def cpdLogger(cls):
     class CustomFormatter(logging.Formatter):
@@ -102,6 +104,7 @@ def cpdLogger(cls):
         self.logger.debug(f"{section_name}")
 
     def _info_section_lv1(self, section_name):
+        mark_section(section_name)
         self.logger.info("")
         self.logger.debug("")
         self.logger.info("=" * 60)
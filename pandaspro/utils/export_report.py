@@ -0,0 +1,235 @@
+import datetime
+import inspect
+import json
+import numbers
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+
+from tabulate import tabulate
+
+# The report of the export running in this thread / asyncio task, None when not profiling
+_active_report = ContextVar('pandaspro_export_report', default=None)
+
+# Results of these types are plain values, everything else coming back from Excel gets wrapped again
+_PLAIN_TYPES = (str, bytes, numbers.Number, type(None), list, tuple, dict, set,
+                datetime.date, datetime.time, datetime.timedelta)
+
+
+class ExportReport:
+    """
+    Structured measurements of one export call.
+
+    - sections: wall time in seconds per putxl section (the info_section_lv1 markers), in running order
+    - format_calls: number of RangeOperator.format invocations
+    - api_counts: number of Excel property sets / method calls per attribute type, e.g. 'range.api.Interior.Color'
+    - cells_touched: total cells covered by the formatted ranges
+    - cells_written: total cells covered by value writes
+    """
+
+    def __init__(self, name: str = 'putxl'):
+        self.name = name
+        self.started = datetime.datetime.now()
+        self.sections = {}
+        self.format_calls = 0
+        self.api_counts = Counter()
+        self.cells_touched = 0
+        self.cells_written = 0
+        self.seconds = None
+        self._section = None
+        self._section_start = None
+        self._start = time.perf_counter()
+        self.mark_section('setup')
+
+    def mark_section(self, name: str) -> None:
+        now = time.perf_counter()
+        if self._section is not None:
+            self.sections[self._section] = self.sections.get(self._section, 0) + now - self._section_start
+        self._section, self._section_start = name, now
+
+    def finish(self) -> None:
+        self.mark_section(None)
+        self.seconds = time.perf_counter() - self._start
+
+    @property
+    def api_calls(self) -> int:
+        return sum(self.api_counts.values())
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'started': self.started.isoformat(timespec='seconds'),
+            'seconds': round(self.seconds, 6) if self.seconds is not None else None,
+            'sections': {k: round(v, 6) for k, v in self.sections.items()},
+            'format_calls': self.format_calls,
+            'api_calls': self.api_calls,
+            'api_counts': dict(self.api_counts.most_common()),
+            'cells_touched': self.cells_touched,
+            'cells_written': self.cells_written,
+        }
+
+    def to_json(self, file: str) -> None:
+        """
+        Appends the report as one JSON line, so a log file collects every profiled export.
+        """
+        with open(file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.to_dict(), default=str) + '\n')
+
+    def __repr__(self):
+        sections = tabulate([(k, f'{v:.4f}') for k, v in self.sections.items()], headers=['section', 'seconds'])
+        calls = tabulate(self.api_counts.most_common(10), headers=['attribute', 'count'])
+        seconds = f'{self.seconds:.4f}s' if self.seconds is not None else 'running'
+        return (f'<ExportReport {self.name}: {seconds}, {self.format_calls} format call(s), {self.api_calls} Excel call(s), '
+                f'{self.cells_touched} cell(s) formatted, {self.cells_written} cell(s) written>\n\n{sections}\n\n{calls}')
+
+
+def current_report():
+    return _active_report.get()
+
+
+def mark_section(name: str) -> None:
+    report = _active_report.get()
+    if report is not None:
+        report.mark_section(name)
+
+
+def unwrap(obj):
+    return object.__getattribute__(obj, '_target') if isinstance(obj, InstrumentedProxy) else obj
+
+
+def _payload_size(value) -> int:
+    if hasattr(value, 'shape') and len(value.shape) == 2:
+        return int(value.shape[0] * value.shape[1])
+    if isinstance(value, (list, tuple)):
+        return sum(len(row) if isinstance(row, (list, tuple)) else 1 for row in value)
+    return 1
+
+
+class InstrumentedProxy:
+    """
+    Transparent wrapper around an xlwings object (Book, Sheet, Range, .api ...) counting what is done with it.
+
+    Property sets are counted as '<path>.<attribute>', method calls as '<path>.<method>()'. Objects returned by
+    a method start a new path named after their xlwings class (or the method for COM objects), so counts group by
+    attribute type rather than by cell:
+    ws.range('A1').api.Borders(9).Weight = 2 counts 'sheet.range()', 'range.api.Borders()' and 'Borders.Weight'.
+    Arguments are unwrapped before reaching xlwings / COM.
+    """
+
+    def __init__(self, target, report: ExportReport, path: str):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_report', report)
+        object.__setattr__(self, '_path', path)
+
+    def _wrap(self, value, path):
+        if isinstance(value, _PLAIN_TYPES + (InstrumentedProxy, type)):
+            return value
+        # xlwings objects are named by their class (sheets.add() gives a 'sheet'), COM objects by how they were reached
+        kind = type(value)
+        if kind.__module__.startswith('xlwings') or kind.__name__.startswith('Fake'):
+            path = kind.__name__.lower().replace('fake', '')
+        return InstrumentedProxy(value, object.__getattribute__(self, '_report'), path)
+
+    def __getattr__(self, name):
+        target = object.__getattribute__(self, '_target')
+        report = object.__getattribute__(self, '_report')
+        path = object.__getattribute__(self, '_path')
+        value = getattr(target, name)
+        # Methods are counted when called, callable objects (Range, COM dispatch) stay proxies with __call__
+        if inspect.ismethod(value) or inspect.isfunction(value) or inspect.isbuiltin(value):
+            @wraps(value)
+            def _call(*args, **kwargs):
+                report.api_counts[f'{path}.{name}()'] += 1
+                args = tuple(unwrap(a) for a in args)
+                kwargs = {k: unwrap(v) for k, v in kwargs.items()}
+                return self._wrap(value(*args, **kwargs), name)
+            return _call
+        return self._wrap(value, f'{path}.{name}')
+
+    def __setattr__(self, name, value):
+        report = object.__getattribute__(self, '_report')
+        path = object.__getattribute__(self, '_path')
+        report.api_counts[f'{path}.{name}'] += 1
+        if name == 'value':
+            report.cells_written += _payload_size(value)
+        setattr(object.__getattribute__(self, '_target'), name, unwrap(value))
+
+    def __call__(self, *args, **kwargs):
+        report = object.__getattribute__(self, '_report')
+        path = object.__getattribute__(self, '_path')
+        report.api_counts[f'{path}()'] += 1
+        target = object.__getattribute__(self, '_target')
+        result = target(*(unwrap(a) for a in args), **{k: unwrap(v) for k, v in kwargs.items()})
+        return self._wrap(result, path.split('.')[-1])
+
+    def __getitem__(self, key):
+        target = object.__getattribute__(self, '_target')
+        return self._wrap(target[unwrap(key)], object.__getattribute__(self, '_path').split('.')[-1])
+
+    def __iter__(self):
+        path = object.__getattribute__(self, '_path').split('.')[-1]
+        for item in object.__getattribute__(self, '_target'):
+            yield self._wrap(item, path)
+
+    def __len__(self):
+        return len(object.__getattribute__(self, '_target'))
+
+    def __bool__(self):
+        return bool(object.__getattribute__(self, '_target'))
+
+    def __eq__(self, other):
+        return object.__getattribute__(self, '_target') == unwrap(other)
+
+    def __hash__(self):
+        return hash(object.__getattribute__(self, '_target'))
+
+    def __repr__(self):
+        return f'<instrumented {object.__getattribute__(self, "_target")!r}>'
+
+
+def record_format(xwrange) -> None:
+    """
+    Called by RangeOperator.format: counts the invocation and the cells of the formatted range.
+    """
+    report = _active_report.get()
+    if report is None:
+        return
+    report.format_calls += 1
+    try:
+        report.cells_touched += int(unwrap(xwrange).count)
+    except Exception:  # a backend without .count, never fail an export for the measurement
+        pass
+
+
+def profiled_export(method):
+    """
+    Decorator for PutxlSet export methods taking profile / profile_file keyword arguments.
+
+    Without them the method runs untouched. With them the workbook and sheet are wrapped in InstrumentedProxy
+    for the duration of the call, sections are timed through info_section_lv1, and the ExportReport is returned
+    (also kept as self.last_report, and appended to profile_file as a JSON line if given).
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profile_file = kwargs.get('profile_file')
+        if not (kwargs.get('profile') or profile_file):
+            return method(self, *args, **kwargs)
+
+        report = ExportReport(method.__name__)
+        token = _active_report.set(report)
+        self.wb = InstrumentedProxy(self.wb, report, 'book')
+        self.ws = InstrumentedProxy(self.ws, report, 'sheet')
+        try:
+            method(self, *args, **kwargs)
+        finally:
+            report.finish()
+            _active_report.reset(token)
+            self.wb = unwrap(self.wb)
+            self.ws = unwrap(self.ws)
+            self.last_report = report
+            if profile_file:
+                report.to_json(profile_file)
+        return report
+
+    return wrapper
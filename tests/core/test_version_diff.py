@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandaspro.core.frame import FramePro
+from pandaspro.core.tools.version_diff import version_diff
+
+
+@pytest.fixture
+def versions():
+    old = pd.DataFrame({
+        'upi': [1, 2, 3, 4],
+        'grade': pd.Categorical(['GA', 'GB', 'GC', 'GD']),
+        'salary': [1.0, np.nan, 3.0, 4.0],
+    })
+    new = pd.DataFrame({
+        'upi': [2, 3, 4, 5],
+        'grade': pd.Categorical(['GB', 'GE', 'GD', 'GA']),
+        'salary': [np.nan, 3.0, 4.5, 1.0],
+    })
+    return old, new
+
+
+def test_change_log_separates_added_removed_and_changed(versions):
+    log = version_diff(*versions, uid='upi')
+    assert log[['upi', 'change']].values.tolist() == [[5, 'added'], [1, 'removed'], [3, 'changed'], [4, 'changed']]
+    assert log.loc[log['upi'] == 3, ['field', 'old', 'new']].values.tolist() == [['grade', 'GC', 'GE']]
+    assert log.loc[log['upi'] == 4, ['field', 'old', 'new']].values.tolist() == [['salary', 4.0, 4.5]]
+    # upi 2 only has missing salaries on both sides
+    assert log.attrs['diff_summary'] == {'added': 1, 'removed': 1, 'changed': 2, 'unchanged': 1}
+
+
+def test_chunks_and_equal_values_with_other_dtypes(versions):
+    old, new = versions
+    new = new.assign(salary=new['salary'].astype(object))
+    assert version_diff(old, new, uid='upi', chunksize=1).equals(version_diff(*versions, uid='upi'))
+
+
+def test_framepro_method_uses_uid(versions):
+    old, new = versions
+    log = FramePro(old, uid='upi').version_diff(new, columns=['grade'])
+    assert isinstance(log, FramePro)
+    assert log.attrs['diff_summary']['changed'] == 1
+    with pytest.raises(ValueError):
+        FramePro(old).version_diff(new)
+    with pytest.raises(ValueError):
+        version_diff(pd.concat([old, old]), new, uid='upi')
+
+
+def test_nothing_to_compare_logs_added_and_removed_only(versions):
+    old, new = versions
+    log = version_diff(old, new, uid='upi', columns=[])
+    assert log['change'].tolist() == ['added', 'removed']
+    assert version_diff(old[['upi']], new[['upi']], uid='upi').attrs['diff_summary'] == log.attrs['diff_summary']
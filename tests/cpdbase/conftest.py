@@ -0,0 +1,27 @@
+import os
+import time
+
+import pytest
+
+from pandaspro.cpdbase.files_version_parser import FilesVersionParser
+
+
+@pytest.fixture
+def dataset_dir(tmp_path):
+    """
+    Writes {filename: DataFrame} as csv files into a fresh dataset directory and returns its path.
+    The version index cache is cleared around the test.
+    """
+    FilesVersionParser.clear_index_cache()
+
+    def make(frames: dict, folder: str = None):
+        path = tmp_path / folder if folder else tmp_path
+        path.mkdir(exist_ok=True)
+        for name, frame in frames.items():
+            frame.to_csv(path / name, index=False)
+        stamp = time.time() - 100  # an old directory mtime, trusted by the version index
+        os.utime(path, (stamp, stamp))
+        return path
+
+    yield make
+    FilesVersionParser.clear_index_cache()
@@ -0,0 +1,58 @@
+import os
+
+import pandas as pd
+import pytest
+
+from pandaspro.cpdbase import cpd_base_frame, files_version_parser
+from pandaspro.cpdbase.cpd_base_frame import cpdBaseFrame
+from pandaspro.cpdbase.dataset_meta import cpdBaseFrameMeta
+
+
+@pytest.fixture
+def staff_class(dataset_dir):
+    path = dataset_dir({
+        'Staff_20240131.csv': pd.DataFrame({'upi': [1, 2, 3], 'grade': ['GA', 'GB', 'GA']}),
+        'Staff_20231231_final.csv': pd.DataFrame({'upi': [1, 2], 'grade': ['GA', 'GB']}),
+    })
+
+    @cpdBaseFrame(path=str(path), uid='upi', team='hr')
+    class Staff(pd.DataFrame):
+        pass
+
+    return Staff
+
+
+def test_metadata_is_resolved_once_at_load(staff_class):
+    staff = staff_class()
+    assert isinstance(staff.meta, cpdBaseFrameMeta)
+    assert (staff.get_filename, staff.get_version, staff.get_more_info) == ('Staff_20240131.csv', '20240131', 'no suffix')
+    assert staff.meta.custom_attrs['team'] == 'hr'
+    with pytest.raises(AttributeError):
+        staff.meta.version = '20231231'
+
+
+def test_derived_frames_share_the_metadata_without_io(staff_class, monkeypatch):
+    staff = staff_class()
+
+    def no_io(*args, **kwargs):
+        raise AssertionError('derived frames must not touch the file system')
+
+    monkeypatch.setattr(files_version_parser.os, 'listdir', no_io)
+    monkeypatch.setattr(files_version_parser.os, 'stat', no_io)
+    monkeypatch.setattr(cpd_base_frame.FilesVersionParser, '__init__', no_io)
+
+    derived = staff[staff['grade'] == 'GA'].rename(columns={'grade': 'level'}).head(1)
+    assert type(derived) is staff_class
+    assert derived.meta is staff.meta
+    assert derived.get_filename == 'Staff_20240131.csv'
+
+
+def test_frames_built_from_data_resolve_lazily(staff_class, monkeypatch):
+    listings = []
+    listdir = os.listdir
+    monkeypatch.setattr(files_version_parser.os, 'listdir', lambda path: listings.append(path) or listdir(path))
+
+    frame = staff_class({'upi': [9]}, version='20231231')
+    assert listings == []
+    assert frame.get_more_info == 'final'
+    assert len(listings) == 1
@@ -0,0 +1,62 @@
+import os
+import time
+
+import pytest
+
+from pandaspro.cpdbase import files_version_parser
+from pandaspro.cpdbase.files_version_parser import FilesVersionParser
+
+
+def _age(path, seconds=100):
+    # pretend the directory changed a while ago, so its mtime is trusted
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+@pytest.fixture
+def versions(tmp_path):
+    FilesVersionParser.clear_index_cache()
+    for name in ['sob_20240131.csv', 'sob_20240215_draft.csv', 'sob_20240229.csv', 'sob_20230630.csv',
+                 'sob_notadate.csv', 'other_20240301.csv', 'sob_20240301.xlsx']:
+        (tmp_path / name).write_text('a\n1\n')
+    _age(tmp_path)
+    yield tmp_path
+    FilesVersionParser.clear_index_cache()
+
+
+def test_lookups_use_the_sorted_index(versions):
+    fvp = FilesVersionParser(str(versions), 'sob')
+    assert fvp.list_all_files() == ['sob_20230630.csv', 'sob_20240131.csv', 'sob_20240215_draft.csv', 'sob_20240229.csv']
+    assert fvp.get_file('latest') == 'sob_20240229.csv'
+    assert fvp.get_file('latest_month') == 'sob_20240131.csv'
+    assert fvp.get_file('20240215') == 'sob_20240215_draft.csv'
+    assert fvp.get_suffix('20240215') == 'draft'
+    assert fvp.get_suffix('latest') == 'no suffix'
+    with pytest.raises(Exception, match='exactly one file'):
+        fvp.get_file('20240101')
+
+
+def test_index_is_shared_and_invalidated_by_the_directory_mtime(versions, monkeypatch):
+    listings = []
+    listdir = os.listdir
+    monkeypatch.setattr(files_version_parser.os, 'listdir', lambda path: listings.append(path) or listdir(path))
+
+    first = FilesVersionParser(str(versions), 'sob')
+    second = FilesVersionParser(str(versions), 'sob')
+    for version in ['latest', 'latest_month', '20240131']:
+        first.get_file(version)
+        second.get_file(version)
+    assert len(listings) == 1
+    assert first.get_index() is second.get_index()
+
+    (versions / 'sob_20240331.csv').write_text('a\n1\n')
+    _age(versions, seconds=50)
+    assert second.get_file('latest') == 'sob_20240331.csv'
+    assert len(listings) == 2
+
+
+def test_duplicate_dates_are_still_rejected(versions):
+    (versions / 'sob_20240131_copy.csv').write_text('a\n1\n')
+    _age(versions)
+    with pytest.raises(ValueError, match='duplicates'):
+        FilesVersionParser(str(versions), 'sob')
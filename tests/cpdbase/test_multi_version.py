@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+from pandaspro.cpdbase.cpd_base_frame import cpdBaseFrame
+from pandaspro.cpdbase.files_version_parser import FilesVersionParser
+from pandaspro.cpdbase.multi_version import VersionFrames, harmonize_frames
+
+
+@pytest.fixture
+def staff_class(dataset_dir):
+    path = dataset_dir({
+        f'Staff_{month}.csv': pd.DataFrame({'UPI': range(rows), 'Grade': ['GA', 'GB', 'GC', 'GD'][:rows]})
+        for month, rows in (('20240131', 3), ('20240430', 2), ('20240531', 4), ('20240615', 1))
+    })
+
+    @cpdBaseFrame(path=str(path), uid='upi', imr={'grade': 'level'})
+    class Staff(pd.DataFrame):
+        @staticmethod
+        def load(data, scale=1):
+            data['upi'] = data['upi'] * scale
+            return data
+
+    return Staff
+
+
+def test_select_files_by_range_and_frequency(staff_class):
+    fvp = staff_class.get_file_versions_parser()
+    assert fvp.select_files(start='20240201', end='20240531') == ['Staff_20240430.csv', 'Staff_20240531.csv']
+    assert fvp.select_files(freq='month') == ['Staff_20240131.csv', 'Staff_20240430.csv', 'Staff_20240531.csv']
+
+
+def test_select_files_by_quarter(staff_class, dataset_dir):
+    dataset_dir({'Staff_20240331.csv': pd.DataFrame({'UPI': [0], 'Grade': ['GA']})})
+    FilesVersionParser.clear_index_cache()
+    fvp = staff_class.get_file_versions_parser()
+    assert fvp.select_files(freq='quarter') == ['Staff_20240331.csv']
+    assert fvp.select_files(end='20240331', freq='month') == ['Staff_20240131.csv', 'Staff_20240331.csv']
+    with pytest.raises(ValueError):
+        fvp.select_files(freq='week')
+
+
+def test_load_versions_stacks_processed_versions(staff_class):
+    trend = staff_class.load_versions(freq='month', processes=2, scale=10)
+    assert type(trend) is staff_class
+    assert trend.groupby('version').size().to_dict() == {'20240131': 3, '20240430': 2, '20240531': 4}
+    assert list(trend.columns) == ['version', 'upi', 'level'] and trend['upi'].max() == 30
+    assert set(trend.attrs['load_seconds']) == {'20240131', '20240430', '20240531'}
+    assert trend.export_mapper.dict['level'] == 'Grade'
+
+
+def test_load_versions_lazy_and_argument_check(staff_class):
+    frames = staff_class.load_versions(versions=['20240131', '20240615'], lazy=True)
+    assert isinstance(frames, VersionFrames) and list(frames) == ['20240131', '20240615']
+    assert frames.seconds == {}
+    assert len(frames['20240615']) == 1 and list(frames.seconds) == ['20240615']
+    with pytest.raises(ValueError):
+        staff_class.load_versions(freq='month', unknown=1)
+
+
+def test_harmonize_frames_unions_categories_and_keeps_integers():
+    first = pd.DataFrame({'grade': pd.Categorical(['GA']), 'upi': [1], 'unit': [5]})
+    second = pd.DataFrame({'grade': pd.Categorical(['GB']), 'upi': [2]})
+    combined = pd.concat(harmonize_frames([first, second]), ignore_index=True)
+    assert isinstance(combined['grade'].dtype, pd.CategoricalDtype)
+    assert str(combined['unit'].dtype) == 'Int64' and str(combined['upi'].dtype) == 'int64'
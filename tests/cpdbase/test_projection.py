@@ -0,0 +1,96 @@
+import pandas as pd
+import pytest
+
+from pandaspro.cpdbase.cpd_base_frame import cpdBaseFrame
+
+
+@pytest.fixture
+def staff_dir(dataset_dir):
+    return dataset_dir({'Staff_20240131.csv': pd.DataFrame({
+        'UPI': [1, 2, 3],
+        'Grade': ['GA', 'GB', 'GC'],
+        'Unit': ['u1', 'u2', 'u3'],
+        'Salary': [1.0, 2.0, 3.0],
+    })})
+
+
+def test_only_required_columns_are_read(staff_dir, monkeypatch):
+    @cpdBaseFrame(path=str(staff_dir), uid='upi', dvl=['grade'], imr={'unit': 'org'})
+    class Staff(pd.DataFrame):
+        pass
+
+    calls = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: calls.append(kwargs) or read_csv(*args, **kwargs))
+
+    staff = Staff(usecols='dvl')
+    assert list(staff.columns) == ['upi', 'grade']
+    assert calls[-1]['usecols'] == ['UPI', 'Grade']
+    assert list(Staff(usecols=['org']).columns) == ['upi', 'org']
+
+
+def test_other_columns_are_fetched_on_access(staff_dir):
+    @cpdBaseFrame(path=str(staff_dir), uid='upi', imr={'unit': 'org'})
+    class Staff(pd.DataFrame):
+        pass
+
+    staff = Staff(usecols=['grade'])
+    subset = staff[staff['grade'] != 'GA'].sort_values('upi', ascending=False)
+    assert subset.org.tolist() == ['u3', 'u2']
+    assert list(subset.columns) == ['upi', 'grade', 'org', 'salary']
+    assert subset.export_mapper.dict['org'] == 'Unit'
+    assert list(staff.columns) == ['upi', 'grade']
+    assert staff.salary.tolist() == [1.0, 2.0, 3.0]
+
+
+def test_load_needing_other_columns_reads_everything(staff_dir):
+    @cpdBaseFrame(path=str(staff_dir), uid='upi')
+    class Staff(pd.DataFrame):
+        @staticmethod
+        def load(data):
+            data['pay'] = data['salary'] * 2
+            return data
+
+    staff = Staff(usecols=['grade'])
+    assert list(staff.columns) == ['upi', 'grade', 'unit', 'salary', 'pay']
+
+
+def test_fetched_columns_go_through_load(staff_dir):
+    @cpdBaseFrame(path=str(staff_dir), uid='upi')
+    class Staff(pd.DataFrame):
+        @staticmethod
+        def load(data):
+            if 'unit' in data:
+                data['unit'] = data['unit'].str.upper()
+            return data[data['grade'] != 'GA'].reset_index(drop=True)
+
+    full = Staff()
+    staff = Staff(usecols=['grade'])
+    assert list(staff.columns) == ['upi', 'grade']
+    assert staff.unit.tolist() == full.unit.tolist() == ['U2', 'U3']
+
+
+def test_pushdown_needs_a_uid(staff_dir):
+    @cpdBaseFrame(path=str(staff_dir))
+    class Staff(pd.DataFrame):
+        pass
+
+    staff = Staff(usecols=['grade'])
+    assert list(staff.columns) == ['upi', 'grade', 'unit', 'salary']
+    assert staff.__dict__['_projection'] is None
+
+
+def test_refused_pushdown_is_not_cached_under_usecols(staff_dir):
+    from pandaspro.cpdbase.table_cache import TableCache
+
+    @cpdBaseFrame(path=str(staff_dir), uid='upi', cache=TableCache(cache_dir=False))
+    class Staff(pd.DataFrame):
+        @staticmethod
+        def load(data):
+            data['pay'] = data['salary'] * 2
+            return data
+
+    for _ in range(2):
+        staff = Staff(usecols=['grade'])
+        assert staff.__dict__['_projection'] is None
+        assert list(staff.columns) == ['upi', 'grade', 'unit', 'salary', 'pay']
@@ -0,0 +1,86 @@
+import os
+
+import pandas as pd
+import pytest
+
+from pandaspro.cpdbase.cpd_base_frame import cpdBaseFrame
+from pandaspro.cpdbase.table_cache import TableCache, table_cache_key
+
+
+@pytest.fixture
+def source(dataset_dir):
+    return dataset_dir({'Staff_20240131.csv': pd.DataFrame({'UPI': [1, 2, 3], 'Grade': ['GA', 'GB', 'GA']})}, folder='data')
+
+
+def _staff_class(path, cache, calls):
+    @cpdBaseFrame(path=str(path), cache=cache)
+    class Staff(pd.DataFrame):
+        @staticmethod
+        def load(data, grade=None):
+            calls.append(grade)
+            return data if grade is None else data[data['grade'] == grade]
+
+    return Staff
+
+
+def test_warm_loads_skip_read_and_load(source, tmp_path):
+    calls = []
+    cache = TableCache(str(tmp_path / 'cache'))
+    staff_class = _staff_class(source, cache, calls)
+
+    first = staff_class()
+    second = staff_class()
+    assert calls == [None]
+    assert cache.hits == {'memory': 1, 'disk': 0, 'miss': 1}
+    pd.testing.assert_frame_equal(pd.DataFrame(first), pd.DataFrame(second))
+    assert second.export_mapper.dict == {'upi': 'UPI', 'grade': 'Grade'}
+
+    # other load kwargs are another table
+    assert len(staff_class(grade='GA')) == 2
+    assert calls == [None, 'GA']
+
+    # a new process only has the disk level
+    fresh = TableCache(str(tmp_path / 'cache'))
+    assert len(_staff_class(source, fresh, calls)()) == 3
+    assert fresh.hits['disk'] == 1 and calls == [None, 'GA']
+
+
+def test_changed_source_and_invalidate_miss(source, tmp_path):
+    calls = []
+    cache = TableCache(str(tmp_path / 'cache'))
+    staff_class = _staff_class(source, cache, calls)
+    staff_class()
+
+    file = source / 'Staff_20240131.csv'
+    key = table_cache_key(str(file))
+    pd.DataFrame({'UPI': [1, 2, 3, 4], 'Grade': ['GA'] * 4}).to_csv(file, index=False)
+    assert table_cache_key(str(file)) != key
+    assert len(staff_class()) == 4
+
+    cache.invalidate(str(file))
+    assert os.listdir(tmp_path / 'cache') == []
+    staff_class()
+    assert len(calls) == 3
+
+
+def test_disk_level_is_size_bounded(source, tmp_path):
+    cache = TableCache(str(tmp_path / 'cache'), max_items=0, max_disk_bytes=1)
+    _staff_class(source, cache, [])()
+    assert [name for name in os.listdir(tmp_path / 'cache') if not name.endswith('.json')] == []
+
+
+def test_default_dir_is_per_user_and_shared_dirs_are_not_unpickled(source, tmp_path, monkeypatch):
+    import tempfile
+    from pandaspro.cpdbase import table_cache
+
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'home_cache'))
+    assert table_cache._user_cache_dir() == str(tmp_path / 'home_cache' / 'pandaspro' / 'table_cache')
+    assert not table_cache.DEFAULT_CACHE_DIR.startswith(tempfile.gettempdir() + os.sep + 'pandaspro')
+
+    calls = []
+    _staff_class(source, TableCache(str(tmp_path / 'cache')), calls)()
+    if os.name != 'nt' and not table_cache._has_pyarrow():
+        os.chmod(tmp_path / 'cache', 0o777)  # anyone could have planted the pickle
+        fresh = TableCache(str(tmp_path / 'cache'))
+        _staff_class(source, fresh, calls)()
+        assert fresh.hits == {'memory': 0, 'disk': 0, 'miss': 1} and len(calls) == 2
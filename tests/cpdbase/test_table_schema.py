@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandaspro.cpdbase.cpd_base_frame import cpdBaseFrame
+from pandaspro.cpdbase.table_schema import TableSchema
+from pandaspro.io.excel.base import pwread
+
+
+def _staff(rows=60):
+    return pd.DataFrame({
+        'UPI': range(rows),
+        'Grade': np.tile(['GA', 'GB', 'GC'], rows // 3),
+        'Unit Code': np.r_[np.arange(rows - 1), np.nan],
+        'Salary': np.linspace(1, 2, rows),
+        'Start Date': pd.date_range('2020-01-01', periods=rows).strftime('%Y-%m-%d'),
+        'Name': [f'staff {i}' for i in range(rows)],
+    })
+
+
+@pytest.fixture
+def staff_dir(dataset_dir):
+    return dataset_dir({'Staff_20240131.csv': _staff(), 'Staff_20240229.csv': _staff()})
+
+
+def test_infer_pins_codes_nullable_ints_and_dates(staff_dir):
+    frame, name_map = pwread(str(staff_dir / 'Staff_20240131.csv'), low_memory=False)
+    schema = TableSchema.infer(frame, name_map)
+    assert schema.dtypes == {'UPI': 'int64', 'Grade': 'category', 'Unit Code': 'Int64', 'Salary': 'float64'}
+    assert schema.parse_dates == ['Start Date']
+
+    pinned, _ = pwread(str(staff_dir / 'Staff_20240131.csv'), **schema.read_kwargs())
+    assert isinstance(pinned['grade'].dtype, pd.CategoricalDtype)
+    assert str(pinned['unit_code'].dtype) == 'Int64' and pinned['unit_code'].isna().sum() == 1
+    assert pd.api.types.is_datetime64_any_dtype(pinned['start_date'])
+
+
+def test_schema_is_inferred_once_and_reused(staff_dir, monkeypatch):
+    @cpdBaseFrame(path=str(staff_dir), schema=True)
+    class Staff(pd.DataFrame):
+        pass
+
+    first = Staff(version='20240131')
+    schema_file = staff_dir / 'Staff.schema.json'
+    assert schema_file.exists()
+
+    calls = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: calls.append(kwargs) or read_csv(*args, **kwargs))
+    second = Staff(version='20240229')
+    assert calls[0]['dtype']['Grade'] == 'category' and calls[0]['parse_dates'] == ['Start Date']
+    assert 'low_memory' not in calls[0]
+    assert first.dtypes.to_dict() == second.dtypes.to_dict()
+
+
+def test_schema_that_no_longer_fits_is_inferred_again(staff_dir):
+    TableSchema({'Grade': 'category'}, parse_dates=['Retired Column']).save(str(staff_dir / 'Staff.schema.json'))
+
+    @cpdBaseFrame(path=str(staff_dir), schema=True)
+    class Staff(pd.DataFrame):
+        pass
+
+    staff = Staff()
+    assert len(staff) == 60
+    assert 'Retired Column' not in TableSchema.load(str(staff_dir / 'Staff.schema.json')).parse_dates
+
+
+def test_text_beyond_the_sample_keeps_a_column_from_being_dates():
+    values = list(pd.date_range('2020-01-01', periods=250).strftime('%Y-%m-%d')) + ['Open-ended'] * 50
+    frame = pd.DataFrame({'end_date': values})
+    assert TableSchema.infer(frame).parse_dates == []
+
+    applied = TableSchema(parse_dates=['end_date']).apply(frame)
+    assert applied['end_date'].tolist() == values  # left as text, not coerced to NaT
+
+
+def test_schema_is_part_of_the_cache_key(staff_dir):
+    from pandaspro.cpdbase.table_cache import TableCache
+
+    @cpdBaseFrame(path=str(staff_dir), schema=True, cache=TableCache(cache_dir=False))
+    class Staff(pd.DataFrame):
+        pass
+
+    Staff()
+    TableSchema({'Grade': 'category'}).save(str(staff_dir / 'Staff.schema.json'))
+    assert str(Staff()['start_date'].dtype) in ('object', 'str')
@@ -0,0 +1,52 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from pandaspro.io.excel import async_writer
+from pandaspro.io.excel.async_writer import AsyncPutxlSet
+
+
+class _RecordingPutxlSet:
+    def __init__(self, workbook, **kwargs):
+        self.workbook = workbook
+        self.thread = threading.current_thread()
+        self.calls = []
+
+    def putxl(self, content, sheet_name=None, **kwargs):
+        assert threading.current_thread() is self.thread
+        if sheet_name == 'bad':
+            raise ValueError('bad sheet')
+        self.calls.append((sheet_name, content.shape))
+        return sheet_name
+
+    def close(self):
+        self.calls.append('close')
+
+
+@pytest.fixture
+def fake_putxlset(monkeypatch):
+    monkeypatch.setattr(async_writer, 'PutxlSet', _RecordingPutxlSet)
+
+
+def test_writes_run_in_order_on_one_writer_thread(fake_putxlset):
+    frame = pd.DataFrame({'a': [1, 2]})
+    with AsyncPutxlSet('report.xlsx', max_pending=2) as ps:
+        futures = [ps.putxl(frame, sheet_name=f's{i}') for i in range(5)]
+        frame['b'] = 0  # queued frames are snapshots
+    recorder = ps.ready.result()
+    assert recorder.thread is not threading.main_thread()
+    assert [f.result() for f in futures] == ['s0', 's1', 's2', 's3', 's4']
+    assert recorder.calls == [(f's{i}', (2, 1)) for i in range(5)] + ['close']
+
+
+def test_wait_raises_first_failure_after_draining(fake_putxlset):
+    ps = AsyncPutxlSet('report.xlsx')
+    ps.putxl(pd.DataFrame({'a': [1]}), sheet_name='bad')
+    ps.putxl(pd.DataFrame({'a': [1]}), sheet_name='good')
+    with pytest.raises(ValueError, match='bad sheet'):
+        ps.wait()
+    assert ps.futures[1].result() == 'good'
+    ps.close(wait=False)
+    with pytest.raises(ValueError, match='closed'):
+        ps.putxl(pd.DataFrame(), sheet_name='late')
@@ -0,0 +1,47 @@
+import pandas as pd
+from openpyxl import load_workbook
+
+from pandaspro.core.frame import FramePro
+
+
+def _render_or_fail(frame, file, **kwargs):
+    if (frame['country'] == 'Chad').any():
+        raise RuntimeError('broken partition')
+    frame.to_excel(file, index=False)
+
+
+def test_fanout_one_workbook_per_key(tmp_path):
+    df = FramePro({'country': ['Kenya', 'Chad', 'Kenya'], 'staff': [1, 2, 3]})
+    report = df.fanout('country', str(tmp_path / '{country}.xlsx'), workers=2, noisily=False, sheet_name='Staff')
+    assert list(report['country']) == ['Kenya', 'Chad']
+    assert list(report['rows']) == [2, 1]
+    assert (report['status'] == 'ok').all()
+    ws = load_workbook(tmp_path / 'Kenya.xlsx')['Staff']
+    assert [c.value for c in ws[1]] == ['country', 'staff']
+    assert ws.max_row == 3
+
+
+def test_fanout_failures_do_not_abort(tmp_path):
+    df = FramePro({'country': ['Kenya', 'Chad', 'Mali'], 'staff': [1, 2, 3]})
+    report = df.fanout('country', str(tmp_path / '{country}.xlsx'), render=_render_or_fail, workers=1, noisily=False)
+    assert list(report['status']) == ['ok', 'failed', 'ok']
+    assert 'broken partition' in report.loc[1, 'error']
+    assert (tmp_path / 'Mali.xlsx').exists()
+
+
+def test_fanout_unresolvable_targets_fail_alone_and_duplicates_are_refused(tmp_path):
+    import pytest
+
+    def target(key):
+        if key['country'] == 'Chad':
+            raise KeyError('region')
+        return str(tmp_path / f"{key['country']}.xlsx")
+
+    df = FramePro({'country': ['Kenya', 'Chad', 'Mali'], 'staff': [1, 2, 3]})
+    report = df.fanout('country', target, workers=1, noisily=False)
+    assert list(report['status']) == ['ok', 'failed', 'ok']
+    assert 'KeyError' in report.loc[1, 'error'] and pd.isna(report.loc[1, 'file'])
+
+    with pytest.raises(ValueError, match='same file'):
+        df.fanout('country', str(tmp_path / 'all.xlsx'), workers=1, noisily=False)
+    assert not (tmp_path / 'all.xlsx').exists()
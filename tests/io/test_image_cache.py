@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from pandaspro.io.excel.image_cache import cached_resized_image, image_cache_key
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def test_resized_copy_is_cached_until_source_changes(tmp_path):
+    source = tmp_path / 'photo.png'
+    Image.new('RGB', (300, 400), 'red').save(source)
+    cache_dir = tmp_path / 'cache'
+
+    first = cached_resized_image(str(source), (60, None), cache_dir=str(cache_dir))
+    with Image.open(first) as img:
+        assert img.size == (80, 107)  # 60pt wide at 96 dpi, aspect ratio kept
+    assert cached_resized_image(str(source), (60, None), cache_dir=str(cache_dir)) == first
+
+    key = image_cache_key(str(source), (60, None))
+    os.utime(source, (0, 0))
+    assert image_cache_key(str(source), (60, None)) != key
+
+
+def test_without_size_the_original_is_used(tmp_path):
+    source = tmp_path / 'photo.png'
+    Image.new('RGB', (10, 10)).save(source)
+    assert cached_resized_image(str(source)) == str(source)
@@ -0,0 +1,235 @@
+import os
+
+import pandas as pd
+import pytest
+
+from pandaspro.io.excel.fake_backend import use_fake_excel
+from pandaspro.io.excel.putexcel import PutxlSet
+
+
+@pytest.fixture
+def staff():
+    return pd.DataFrame({'Grade': ['GA', 'GB', 'GE', 'GF'] * 5, 'x': range(20), 'y': [0.5] * 20})
+
+
+@pytest.fixture
+def fake_excel(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with use_fake_excel() as fake:
+        yield fake
+
+
+def _export(fake, frame, **kwargs):
+    ps = PutxlSet('report.xlsx')
+    fake.log.reset()
+    report = ps.putxl(frame, sheet_name='Staff', profile=True, **kwargs)
+    return ps, report
+
+
+# Upper bounds of the Excel traffic of representative exports: lower numbers are improvements,
+# update the bounds when an optimisation lands, never raise them without a reason
+def test_auto_format_call_counts(fake_excel, staff):
+    ps, report = _export(fake_excel, staff, index=False)
+    log = fake_excel.log
+    assert log.cells_written == 64  # 1 frame write of 21 x 3 cells + blanking the single zero
+    assert log.total_sets <= 38
+    assert log.total_calls <= 33
+    assert log.total_gets <= 61
+    assert report.format_calls <= 4
+    assert fake_excel.sheet('report.xlsx', 'Staff').cells[(2, 1)] == 'GA'
+
+
+def test_blue_style_call_counts(fake_excel, staff):
+    _, report = _export(fake_excel, staff, index=False, style='blue', auto_format=False)
+    log = fake_excel.log
+    assert log.writes == [('Staff', '$A$1', 63)]
+    assert log.total_sets <= 29
+    assert log.total_calls <= 25
+    assert report.format_calls <= 3
+
+
+def test_grade_cd_style_call_counts(fake_excel, staff):
+    _, report = _export(fake_excel, staff, index=False, cd_style='grade', auto_format=False)
+    log = fake_excel.log
+    assert log.sets['range.api.Interior.Color'] == 60  # every Grade row painted across all 3 columns
+    assert log.total_sets <= 124
+    assert log.total_calls <= 64
+    assert report.format_calls <= 60
+
+
+def test_multiindex_auto_format_call_counts(fake_excel):
+    frame = pd.DataFrame({'region': ['AFR'] * 6 + ['EAP'] * 6, 'unit': list('aabbcc') * 2, 'n': range(12)})
+    _, report = _export(fake_excel, frame.set_index(['region', 'unit']), index=True)
+    log = fake_excel.log
+    assert log.cells_written == 40
+    assert log.total_sets <= 90
+    assert log.total_calls <= 76
+    assert report.format_calls <= 9
+
+
+def test_merge_up_header_is_one_format_call(fake_excel):
+    frame = pd.DataFrame({'a': [1], 'b': [2], 'c': [3]})
+    _, report = _export(fake_excel, frame, cell='A2', index=False, auto_format=False,
+                        df_format={'bold; merge_up': "columns(c=['a','b','c'], header=only)"})
+    assert report.format_calls == 1  # 3 stacked header cells as one multi-area range
+    assert fake_excel.log.sets['range.api.MergeCells'] == 1
+
+
+def test_index_merge_style_batches_merges_and_keeps_the_template(fake_excel):
+    from pandaspro.user_config.style_sheets import style_sheets
+    template = dict(style_sheets['index_merge'], **{'border=outer_thick': list(style_sheets['index_merge']['border=outer_thick'])})
+    frame = pd.DataFrame({'region': ['AFR'] * 3 + ['EAP'] * 2 + ['ECA'], 'unit': list('abcdef'), 'n': range(6)})
+    frame = frame.set_index(['region', 'unit'])
+    for _ in range(2):
+        _export(fake_excel, frame, index=True, auto_format=False, style='index_merge(region, n)')
+        # 2 runs x (index level + n), the single-row ECA run is not merged, all in one multi-area call
+        assert fake_excel.log.sets['range.api.MergeCells'] == 1
+    assert style_sheets['index_merge'] == template
+
+
+def test_index_merge_parameter_plans_all_regions(fake_excel):
+    frame = pd.DataFrame({'region': ['AFR'] * 3 + ['EAP'] * 2 + ['ECA'], 'unit': list('abcdef'), 'n': range(6)})
+    _export(fake_excel, frame.set_index(['region', 'unit']), index=True, auto_format=False,
+            index_merge={'level': 'region', 'columns': ['n']})
+    assert fake_excel.log.sets['range.api.MergeCells'] == 1
+
+
+def test_replace_warning_reads_the_sheet_once(fake_excel, staff):
+    def second_export(replace_warning):
+        ps = PutxlSet('report.xlsx')
+        ps.putxl(staff, sheet_name='Staff', cell='B2', index=False, auto_format=False)
+        fake_excel.log.reset()
+        report = ps.putxl(staff.head(3), sheet_name='Staff', cell='B23', index=False,
+                          auto_format=False, replace_warning=replace_warning, profile=True)
+        return fake_excel.log.gets['range.value'], report.format_calls
+
+    gets_plain, calls_plain = second_export(False)
+    gets_probe, calls_probe = second_export(True)
+    assert gets_probe - gets_plain == 1  # the used range, whatever the size of the table
+    assert calls_probe - calls_plain == 1  # only the top strip (B22:D22) touches existing content
+
+
+def test_used_range_probe_answers_overlaps(fake_excel, staff):
+    from pandaspro.io.excel.putexcel import UsedRangeProbe
+    ps = PutxlSet('report.xlsx')
+    ps.putxl(staff, sheet_name='Staff', cell='C3', index=False, auto_format=False)
+    probe = UsedRangeProbe(fake_excel.sheet('report.xlsx', 'Staff'))
+    assert probe.is_filled('E23') and not probe.is_filled('F3:F23') and not probe.is_filled('A1:B40')
+    assert probe.filled_ranges(['A1:C3', 'F1:H9', 'E24:E30']) == ['A1:C3']
+
+
+def _template_book(fake):
+    # 'tpl' holds a title, a header + 3 sample rows at A3, and a note far right that is not part of the table
+    ps = PutxlSet('report.xlsx', sheet_name='tpl')
+    sheet = fake.sheet('report.xlsx', 'tpl')
+    sheet.range('A1').value = 'Staff report'
+    sheet.range('A3').value = [['Grade', 'x', 'y'], ['G?', 0, 0.0], ['G?', 0, 0.0], ['Total', 0, 0.0]]
+    sheet.range('H1').value = 'prepared by HR'
+    return ps
+
+
+def test_template_region_is_the_block_at_the_anchor(fake_excel):
+    from pandaspro.io.excel.putexcel import template_region_shape
+    _template_book(fake_excel)
+    sheet = fake_excel.sheet('report.xlsx', 'tpl')
+    assert template_region_shape(sheet, 'A3') == (4, 3)
+    assert template_region_shape(sheet, 'B4') == (3, 2)
+
+
+def test_template_mode_copies_stretches_and_writes_values(fake_excel, staff, monkeypatch):
+    from pandaspro.io.excel.fake_backend import FakeRange
+    ps = _template_book(fake_excel)
+    pasted = []
+    monkeypatch.setattr(FakeRange, 'paste', lambda self, paste=None, **kwargs: pasted.append((self.address, paste)))
+
+    ps.putxl(staff.head(6), sheet_name='Staff', cell='A3', index=False, template='tpl')
+    book = fake_excel.sheet('report.xlsx', 'tpl').book
+    assert [sheet.name for sheet in book.sheets] == ['tpl', 'Staff']
+    target = fake_excel.sheet('report.xlsx', 'Staff')
+    assert target.cells[(1, 1)] == 'Staff report' and target.cells[(1, 8)] == 'prepared by HR'
+    assert target.cells[(3, 1)] == 'Grade' and target.cells[(9, 2)] == 5
+    # 7 rows from a 4-row template: the total row format moves to row 9, the body row fills rows 6-8
+    assert pasted == [('$A$9:$C$9', 'formats'), ('$A$6:$C$8', 'formats')]
+    assert fake_excel.sheet('report.xlsx', 'tpl').cells[(4, 1)] == 'G?'  # the template sheet is left intact
+
+    pasted.clear()
+    ps.putxl(staff.head(1), sheet_name='Staff', cell='A3', index=False, mode='template')
+    assert pasted == [('$A$4:$C$4', 'formats')]  # shrunk: the last row format moves up to the only body row
+
+
+def test_template_sheet_must_exist(fake_excel, staff):
+    ps = _template_book(fake_excel)
+    with pytest.raises(ValueError, match='does not exist'):
+        ps.putxl(staff, sheet_name='Staff', cell='A3', template='missing')
+
+
+def test_toc_links_every_sheet_and_clears_the_previous_block(fake_excel, staff, monkeypatch):
+    from pandaspro.io.excel.fake_backend import FakeRange
+    cleared = []
+    clear = FakeRange.clear
+    monkeypatch.setattr(FakeRange, 'clear', lambda self: cleared.append((self.sheet.name, self.address)) or clear(self))
+
+    ps = PutxlSet('report.xlsx', sheet_name='Staff')
+    ps.tab('Grades')
+    ps.tab('Units')
+    assert ps.toc() == {'Staff': 'Staff', 'Grades': 'Grades', 'Units': 'Units'}
+    contents = fake_excel.sheet('report.xlsx', 'Contents')
+    assert contents.index == 1 and contents.cells[(1, 1)] == 'Contents'
+    assert contents.cells[(2, 1)] == '=HYPERLINK("#\'Staff\'!A1", "Staff")'
+
+    ps.toc(targets={'Units': 'Unit list'})
+    assert cleared == [('Contents', '$A$1:$A$4')]  # values and formats of the old, longer block
+    assert contents.cells == {(1, 1): 'Contents', (2, 1): '=HYPERLINK("#\'Units\'!A1", "Unit list")'}
+
+    ps.toc('Index', cell='B2')
+    book = contents.book
+    assert 'Contents' not in [sheet.name for sheet in book.sheets]  # moved, the old contents sheet is gone
+    assert fake_excel.sheet('report.xlsx', 'Index').cells[(3, 2)] == '=HYPERLINK("#\'Staff\'!A1", "Staff")'
+
+
+def test_toc_auto_update_follows_new_sheets(fake_excel, staff):
+    ps = PutxlSet('report.xlsx', sheet_name='Staff')
+    ps.toc(auto_update=True, title=None)
+    ps.tab('Grades')
+    ps.putxl(staff, sheet_name='Units', index=False, auto_format=False)
+    contents = fake_excel.sheet('report.xlsx', 'Contents')
+    assert [contents.cells[(row, 1)].split('"')[-2] for row in (1, 2, 3)] == ['Staff', 'Grades', 'Units']
+    assert (4, 1) not in contents.cells
+
+
+def test_putxl_split_spreads_rows_over_named_sheets(fake_excel):
+    frame = pd.DataFrame({'upi': range(7), 'grade': list('ABCDEFG')})
+    ps = PutxlSet('report.xlsx')
+    names = ps.putxl_split(frame, sheet_name='A' * 31, index=False, auto_format=False, max_rows=4)
+    assert names == ['A' * 31, 'A' * 27 + ' (2)', 'A' * 27 + ' (3)']
+    parts = [fake_excel.sheet('report.xlsx', name).cells for name in names]
+    assert [part[(1, 1)] for part in parts] == ['upi'] * 3  # the header is repeated on every sheet
+    assert [part[(4, 2)] for part in parts[:2]] == ['C', 'F'] and parts[2][(2, 2)] == 'G'
+    assert (3, 1) not in parts[2]
+    assert ps.io._dfmap is None  # no per-cell address map for a plain export
+
+
+def test_putimg_anchors_sizes_and_reuses_resized_copies(fake_excel, tmp_path):
+    Image = pytest.importorskip('PIL.Image')
+    Image.new('RGB', (300, 400), 'red').save(tmp_path / 'photo.png')
+    Image.new('RGB', (10, 10), 'blue').save(tmp_path / 'logo.png')
+    cache_dir = tmp_path / 'thumbs'
+    ps = PutxlSet('report.xlsx', sheet_name='Photos')
+    ps.ws.range('A1').column_width = 10  # column A is 60pt wide, column B starts there
+    ps.tab('Sheet1')
+
+    images = [('photo.png', 'B2', (60, None)), ('photo.png', 'B4:C5', (60, None)), ('logo.png', 'C2')]
+    assert ps.putimg(images, sheet_name='Photos', img_left=2, img_top=1, cache_dir=str(cache_dir)) == 3
+    pictures = fake_excel.sheet('report.xlsx', 'Photos').pictures.items
+    assert [(p['left'], p['top']) for p in pictures] == [(62.0, 16.0), (62.0, 46.0), (110.0, 16.0)]
+    assert [(p['width'], p['height']) for p in pictures] == [(60, None), (60, None), (None, None)]
+
+    # one resized copy per (file, size), the unsized picture goes to Excel as it is
+    thumbs = os.listdir(cache_dir)
+    assert len(thumbs) == 1 and pictures[0]['image'] == pictures[1]['image'] == str(cache_dir / thumbs[0])
+    assert pictures[2]['image'] == 'logo.png'
+    assert ps.wb.app.screen_updating
+
+    cached = os.path.getmtime(cache_dir / thumbs[0])
+    ps.putimg([('photo.png', 'D2', (60, None))], cache_dir=str(cache_dir))
+    assert os.listdir(cache_dir) == thumbs and os.path.getmtime(cache_dir / thumbs[0]) == cached
@@ -0,0 +1,115 @@
+import pandas as pd
+import pytest
+
+from pandaspro.io.excel.base import pwread
+
+
+@pytest.fixture
+def staff_csv(tmp_path):
+    file = tmp_path / 'staff.csv'
+    file.write_text('Staff list,,\n' 'UPI,Grade,Salary\n' '1,GA,10.5\n' '2,GB,20\n' '3,GC,\n')
+    return str(file)
+
+
+def test_anchor_cell_is_parsed_once(staff_csv, monkeypatch):
+    calls = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: calls.append(kwargs) or read_csv(*args, **kwargs))
+
+    frame, name_map = pwread(staff_csv, cellrange='A2')
+    assert len(calls) == 1
+    assert list(frame.columns) == ['upi', 'grade', 'salary'] and name_map['upi'] == 'UPI'
+    assert frame['salary'].dtype == float and len(frame) == 3
+
+
+def test_anchor_cell_cuts_left_columns_in_memory(staff_csv):
+    frame, _ = pwread(staff_csv, cellrange='B2')
+    assert list(frame.columns) == ['grade', 'salary']
+    raw, _ = pwread(staff_csv, cellrange='B3', firstrow=False)
+    assert list(raw.columns) == ['b', 'c'] and raw.iloc[0].tolist() == ['GA', 10.5]
+
+
+def test_chunked_csv_matches_full_read(staff_csv):
+    full, full_map = pwread(staff_csv, cellrange='A2')
+    chunks, name_map = pwread(staff_csv, cellrange='A2', chunksize=2)
+    chunks = list(chunks)
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert all(list(chunk.columns) == ['upi', 'grade', 'salary'] for chunk in chunks)
+    assert name_map == full_map
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), pd.DataFrame(full), check_dtype=False)
+
+
+def test_chunked_xlsx_streams_rows_and_keeps_cellrange(tmp_path):
+    file = str(tmp_path / 'staff.xlsx')
+    pd.DataFrame({'UPI': range(1, 8), 'Grade': list('ABCDEFG'), 'Salary': [1.5] * 7}).to_excel(file, index=False, startrow=1)
+
+    chunks = pwread(file, cellrange='B2', chunksize=3, returnmap=False)
+    chunks = list(chunks)
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert list(chunks[0].columns) == ['grade', 'salary']
+    full, _ = pwread(file, cellrange='B2')
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), pd.DataFrame(full))
+
+    rows = pd.concat(pwread(file, cellrange='A3:B5', firstrow=False, chunksize=2, returnmap=False), ignore_index=True)
+    assert list(rows.columns) == ['a', 'b'] and rows['b'].tolist() == ['A', 'B', 'C']
+
+
+def test_chunked_read_rejects_bad_chunksize(staff_csv):
+    with pytest.raises(ValueError):
+        pwread(staff_csv, chunksize=0)
+
+
+def test_excel_engines_read_the_same_table(tmp_path, monkeypatch):
+    from pandaspro.io.excel import engines
+
+    file = str(tmp_path / 'staff.xlsx')
+    pd.DataFrame({'UPI': [1, 2, 3], 'Grade': ['GA', 'GB', None], 'Salary': [1.5, 2.0, 3.0]}).to_excel(file, index=False)
+    full, full_map = pwread(file, engine='openpyxl')
+    streamed, streamed_map = pwread(file, engine='stream')
+    pd.testing.assert_frame_equal(pd.DataFrame(streamed), pd.DataFrame(full))
+    assert streamed_map == full_map
+
+    monkeypatch.setattr(engines, 'calamine_available', lambda: False)
+    assert engines.resolve_excel_engine() == 'openpyxl'  # never 'stream' unless asked for
+    assert engines.resolve_excel_engine('stream', streamable=False) == 'openpyxl'
+    with pytest.raises(ValueError):
+        engines.resolve_excel_engine('calamine')
+    typed, _ = pwread(file, engine='stream', dtype={'UPI': str}, usecols=['UPI', 'Grade'])
+    assert list(typed.columns) == ['upi', 'grade'] and typed['upi'].tolist() == ['1', '2', '3']
+
+
+def test_late_columns_are_not_cut(tmp_path):
+    from openpyxl import Workbook
+
+    file = str(tmp_path / 'late.xlsx')
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['id', 'name', None])
+    for i in range(1, 8):
+        ws.append([i, f'n{i}', 'late' if i == 6 else None])
+    wb.save(file)
+
+    full, full_map = pwread(file, engine='openpyxl')
+    streamed, streamed_map = pwread(file, engine='stream')
+    assert list(full.columns) == ['id', 'name', 'unnamed_2']
+    pd.testing.assert_frame_equal(pd.DataFrame(streamed), pd.DataFrame(full))
+    assert streamed_map == full_map
+
+    with pytest.raises(ValueError, match='Row 7 has values right of column B'):
+        list(pwread(file, chunksize=3, returnmap=False))
+    chunks = pwread(file, cellrange='A1:C8', chunksize=3, returnmap=False)
+    assert pd.concat(chunks, ignore_index=True).iloc[5].tolist()[2] == 'late'
+
+
+def test_anchor_cell_numbers_repeated_headers_within_the_table(tmp_path):
+    file = tmp_path / 'staff.csv'
+    file.write_text('Note,UPI,Grade,UPI\n' 'x,1,GA,9\n' 'y,2,GB,8\n')
+    frame, name_map = pwread(str(file), cellrange='B1')
+    assert list(name_map.values()) == ['UPI', 'Grade', 'UPI.1']
+    chunks, chunk_map = pwread(str(file), cellrange='B1', chunksize=1)
+    assert [list(chunk.columns) for chunk in chunks] == [list(frame.columns)] * 2 and chunk_map == name_map
+
+    sheet = tmp_path / 'staff.xlsx'
+    pd.DataFrame([['Grade', 'Grade', 'UPI'], ['x', 'GA', 1]]).to_excel(sheet, header=False, index=False)
+    frame, name_map = pwread(str(sheet), cellrange='B1', engine='openpyxl')
+    assert list(name_map.values()) == ['Grade', 'UPI'] and frame.iloc[0].tolist() == ['GA', 1]
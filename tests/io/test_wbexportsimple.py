@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from pandaspro.io.excel import wbexportsimple
+from pandaspro.io.excel.wbexportsimple import WorkbookExportSimplifier
+
+
+class _FakePutxlSet:
+    def __init__(self, workbook, **kwargs):
+        self.workbook = workbook
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_putxlset(monkeypatch):
+    monkeypatch.setattr(wbexportsimple, 'PutxlSet', _FakePutxlSet)
+    monkeypatch.setattr(WorkbookExportSimplifier, 'last_declared_wb', None)
+    monkeypatch.setattr(wbexportsimple, '_open_targets', {})
+
+
+def test_scopes_are_local_to_each_thread(fake_putxlset):
+    seen = {}
+    barrier = threading.Barrier(2)
+
+    def job(name):
+        with WorkbookExportSimplifier.workbook_scope(f'{name}.xlsx', close=True):
+            barrier.wait()  # both scopes are open at the same time
+            seen[name] = WorkbookExportSimplifier.get_last_declared_workbook().workbook
+            barrier.wait()
+
+    threads = [threading.Thread(target=job, args=(name,)) for name in ['east', 'west']]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert seen == {'east': 'east.xlsx', 'west': 'west.xlsx'}
+    assert WorkbookExportSimplifier.open_targets() == {}
+    with pytest.raises(ValueError, match='No workbook'):
+        WorkbookExportSimplifier.get_last_declared_workbook()
+
+
+def test_scope_restores_declared_workbook_and_guards_open_targets(fake_putxlset):
+    WorkbookExportSimplifier.declare_workbook('main.xlsx')
+    WorkbookExportSimplifier.declare_workbook('main.xlsx')  # re-declaring the own target is allowed
+    with WorkbookExportSimplifier.workbook_scope('side.xlsx') as side:
+        assert WorkbookExportSimplifier.get_last_declared_workbook() is side
+        result = []
+        other = threading.Thread(target=lambda: result.append(
+            pytest.raises(ValueError, WorkbookExportSimplifier.declare_workbook, 'side.xlsx')))
+        other.start()
+        other.join()
+        assert 'another job' in str(result[0].value)
+    assert WorkbookExportSimplifier.get_last_declared_workbook().workbook == 'main.xlsx'
+    assert [wb.workbook for wb in WorkbookExportSimplifier.open_targets().values()] == ['main.xlsx']
+
+
+def test_redeclaring_a_replaced_workbook(fake_putxlset):
+    WorkbookExportSimplifier.declare_workbook('a.xlsx')
+    WorkbookExportSimplifier.declare_workbook('b.xlsx')
+    WorkbookExportSimplifier.declare_workbook('a.xlsx')  # b replaced a, a is free again
+    assert WorkbookExportSimplifier.get_last_declared_workbook().workbook == 'a.xlsx'
+    assert [wb.workbook for wb in WorkbookExportSimplifier.open_targets().values()] == ['a.xlsx']
+
+    with WorkbookExportSimplifier.workbook_scope('c.xlsx'):
+        with pytest.raises(ValueError, match='another job'):
+            WorkbookExportSimplifier.declare_workbook('a.xlsx')  # owned by the script, not this scope
+
+
+def test_non_closing_scope_gives_its_target_back(fake_putxlset):
+    with WorkbookExportSimplifier.workbook_scope('side.xlsx') as side:
+        assert not side.closed
+    with WorkbookExportSimplifier.workbook_scope('side.xlsx'):
+        pass
+    WorkbookExportSimplifier.declare_workbook('side.xlsx')
+    assert WorkbookExportSimplifier.get_last_declared_workbook().workbook == 'side.xlsx'
+
+
+def test_scoping_an_open_workbook_respects_its_owner(fake_putxlset):
+    WorkbookExportSimplifier.declare_workbook('main.xlsx')
+    main = WorkbookExportSimplifier.get_last_declared_workbook()
+    with WorkbookExportSimplifier.workbook_scope(main):  # lent by the script itself
+        assert WorkbookExportSimplifier.get_last_declared_workbook() is main
+    assert WorkbookExportSimplifier.open_targets() == {wbexportsimple._target_key('main.xlsx'): main}
+
+    with WorkbookExportSimplifier.workbook_scope('side.xlsx') as side:
+        result = []
+        other = threading.Thread(target=lambda: result.append(
+            pytest.raises(ValueError, lambda: WorkbookExportSimplifier.workbook_scope(side).__enter__())))
+        other.start()
+        other.join()
+        assert 'another job' in str(result[0].value)
+        assert WorkbookExportSimplifier.open_targets()[wbexportsimple._target_key('side.xlsx')] is side
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from pandaspro.core.frame import FramePro
+from pandaspro.io.excel.writer import FramexlWriter, split_rows_per_sheet
+
+
+def test_row_limit_is_checked_up_front():
+    frame = pd.DataFrame({'a': range(10)})
+    with pytest.raises(ValueError, match='row limit|rows'):
+        FramexlWriter(frame, cell='A1048570', index=False, header=True)
+
+
+def test_split_rows_per_sheet_repeats_headers():
+    assert split_rows_per_sheet('A1', header_rows=1) == 1048575
+    assert split_rows_per_sheet('B4', header_rows=2, max_rows=100) == 95
+
+
+def test_auto_number_formats_follow_dtypes():
+    frame = pd.DataFrame({
+        'grade': pd.Categorical(['GA', 'GB', 'GA']),
+        'count': [1, 2, 3],
+        'salary': [1.5, 2.25, 3.0],
+        'Percent': [0.2, 0.3, 0.5],
+        'date': pd.to_datetime(['2024-01-31', '2024-02-29', '2024-03-31']),
+    })
+    io = FramexlWriter(frame, cell='A1', index=False, header=True)
+    assert io.range_auto_number_formats() == {
+        'A2:A4': '@',
+        'B2:B4': '#,##0',
+        'C2:C4': '#,##0.00',
+        'D2:D4': '0.0%',
+        'E2:E4': 'yyyy-mm-dd',
+    }
+
+
+def test_auto_number_formats_combine_neighbouring_columns():
+    frame = pd.DataFrame({'a': [1, 2], 'b': [3, 4], 'name': ['x', 'y']}).set_index('name')
+    io = FramexlWriter(frame, cell='B2', index=True, header=True)
+    assert io.range_auto_number_formats() == {'C3:D4': '#,##0'}
+
+
+def test_header_groups_follow_the_column_hierarchy():
+    columns = pd.MultiIndex.from_tuples([('Staff', 'GA'), ('Staff', 'GB'), ('Total', ''), ('Other', 'GA')])
+    frame = pd.DataFrame([[1, 2, 3, 4]], columns=columns)
+    assert FramexlWriter(frame, cell='A1', index=False).range_header_groups() == ['A1:B1', 'C1:C2']
+    indexed = frame.set_index(pd.Index(['r'], name='k'))
+    assert FramexlWriter(indexed, cell='B2', index=True).range_header_groups() == ['C2:D2', 'E2:E3']
+
+
+def test_header_stack_grows_each_item_upwards():
+    io = FramexlWriter(pd.DataFrame({'a': [1]}), cell='A2')
+    assert io.range_header_stack('C3, E3:F3') == ['C2:C3', 'E2:F3']
+
+
+def _subtotal_pivot():
+    staff = FramePro({
+        'staff_id': [1, 2, 3, 4, 5],
+        'region': ['E', 'E', 'W', 'W', 'W'],
+        'unit': ['a', 'b', 'a', 'c', 'c'],
+        'quarter': ['Q1', 'Q2', 'Q1', 'Q2', 'Q1'],
+        'kind': ['x', 'y', 'x', 'x', 'y'],
+    })
+    return staff.cpdtab2s_region__unit___quarter__kind
+
+
+def test_subtotal_ranges_come_from_the_generator_marks():
+    pivot = _subtotal_pivot()
+    io = FramexlWriter(pivot, cell='B2', index=True, header=True)
+    assert io.subtotal_marks is not None
+    # two header rows, subtotal rows are the 3rd and 6th data rows
+    assert io.range_subtotal_rows() == ['B6:J6', 'B9:J9']
+    assert io.range_subtotal_rows(kind='grand_total') == ['B10:J10']
+    assert io.range_subtotal_columns() == ['F4:F10', 'I4:I10']
+    assert io.range_subtotal_columns(kind='total') == ['F4:F10', 'I4:I10', 'J4:J10']
+
+
+def test_subtotal_ranges_fall_back_to_labels_when_marks_are_stale():
+    pivot = _subtotal_pivot()
+    reshaped = pivot.iloc[1:]
+    io = FramexlWriter(reshaped, cell='B2', index=True, header=True)
+    assert io.subtotal_marks is None
+    assert io.range_subtotal_rows() == ['B5:J5', 'B8:J8']
+    assert io.range_subtotal_columns() == ['F4:F9', 'I4:I9']
+
+
+def test_index_merge_plan_skips_single_row_runs():
+    frame = pd.DataFrame({'region': ['AFR'] * 3 + ['EAP'] * 2 + ['ECA'], 'unit': list('abcdef'), 'n': range(6)})
+    io = FramexlWriter(frame.set_index(['region', 'unit']), cell='A1', index=True, header=True)
+    assert io.range_index_merge_plan(level='region', columns=['n']) == ['A2:A4', 'A5:A6', 'C2:C4', 'C5:C6']
+    assert len(io.range_index_merge_inputs(level='region', columns=['n'])) == 6
@@ -0,0 +1,49 @@
+import json
+
+from pandaspro.utils.export_report import ExportReport, InstrumentedProxy, profiled_export, mark_section, unwrap
+
+
+class _Node:
+    def __init__(self):
+        self.color = None
+        self.value = None
+
+    def child(self, i):
+        return _Node()
+
+
+class _Exporter:
+    def __init__(self):
+        self.wb, self.ws = _Node(), _Node()
+
+    @profiled_export
+    def export(self, profile=False, profile_file=None):
+        mark_section('SECTION: style')
+        for i in range(3):
+            self.ws.child(i).color = 'blue'
+        self.ws.value = [[1, 2], [3, 4]]
+        return 'written'
+
+
+def test_proxy_counts_sets_and_calls_by_attribute_type():
+    report = ExportReport()
+    node = InstrumentedProxy(_Node(), report, 'range')
+    node.child(1).color = 1
+    node.child(2).color = 2
+    assert report.api_counts == {'range.child()': 2, 'child.color': 2}
+    assert isinstance(unwrap(node), _Node)
+
+
+def test_profiled_export_returns_report_and_appends_json(tmp_path):
+    exporter = _Exporter()
+    assert exporter.export() == 'written'
+
+    log = tmp_path / 'putxl.jsonl'
+    report = exporter.export(profile_file=str(log))
+    assert report is exporter.last_report
+    assert isinstance(exporter.ws, _Node)  # proxies are removed after the call
+    assert report.api_counts['sheet.child()'] == 3
+    assert report.api_counts['child.color'] == 3
+    assert report.cells_written == 4
+    assert list(report.sections) == ['setup', 'SECTION: style']
+    assert json.loads(log.read_text())['api_calls'] == 7